@@ -0,0 +1,183 @@
+"""
+Benchmark do pipeline de captura (download → fallback → extração).
+
+Sobe o servidor de origem local (`origin_server.py`) e chama
+`NoticiaService.fetch_and_extract_text` em vários níveis de concorrência,
+reportando vazão, latência p50/p95/p99, taxa de erro e pico de RSS (processo +
+filhos: pool de extração e Chromium).
+
+Uso (na raiz do repositório):
+
+    python -m benchmarks.capture_bench
+    python -m benchmarks.capture_bench --perfil grande --concorrencia 1,16,64 --n 400
+    python -m benchmarks.capture_bench --perfil misto --json bench_output.json
+
+O cache de HTML e a memória de estratégia por domínio ficam desligados para
+que cada rodada pague o download real.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import statistics
+import sys
+import threading
+import time
+from typing import Dict, List
+
+# o serviço lê as settings no import: desliga o que mascararia as medições
+os.environ.setdefault("HTML_CACHE_ENABLED", "false")
+os.environ.setdefault("FETCH_STRATEGY_ENABLED", "false")
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+from benchmarks.origin_server import OriginServer  # noqa: E402
+from src.dtecflex_extract_api.resources.noticias.noticias_service import NoticiaService  # noqa: E402
+from src.dtecflex_extract_api.services.browser_pool import _process_tree_rss_mb, shutdown_browser_pool  # noqa: E402
+from src.dtecflex_extract_api.services.extraction_pool import shutdown_extraction_pool  # noqa: E402
+from src.dtecflex_extract_api.services.http_fetcher import close_http_fetcher  # noqa: E402
+
+PERFIS: Dict[str, List[Dict[str, object]]] = {
+    "rapido":   [{"latencia_ms": 20, "jitter_ms": 10}],
+    "lento":    [{"latencia_ms": 800, "jitter_ms": 400}, {"modo": "lento", "tamanho": 5}],
+    "grande":   [{"latencia_ms": 50, "tamanho": 40}],
+    "instavel": [{"latencia_ms": 100, "jitter_ms": 200, "erro": 0.3}],
+    "js":       [{"latencia_ms": 50, "modo": "js"}],
+    "misto": [
+        {"latencia_ms": 20, "jitter_ms": 10},
+        {"latencia_ms": 600, "jitter_ms": 300},
+        {"latencia_ms": 50, "tamanho": 30},
+        {"latencia_ms": 100, "erro": 0.3},
+        {"latencia_ms": 50, "modo": "js"},
+        {"modo": "pdf"},
+    ],
+}
+
+
+class RssSampler:
+    """Amostra o RSS da árvore de processos para achar o pico durante a rodada."""
+
+    def __init__(self, intervalo: float = 0.1):
+        self.intervalo = intervalo
+        self.pico_mb = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.pico_mb = max(self.pico_mb, _process_tree_rss_mb(os.getpid()))
+            self._stop.wait(self.intervalo)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        # fora do Linux o sampler não enxerga /proc: usa o maxrss do próprio processo
+        if not self.pico_mb:
+            escala = 1024 * 1024 if sys.platform == "darwin" else 1024
+            self.pico_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / escala
+
+
+def _urls(server: OriginServer, perfil: str, n: int, seed: int) -> List[str]:
+    rnd = random.Random(seed)
+    variantes = PERFIS[perfil]
+    urls = []
+    for i in range(n):
+        params = dict(rnd.choice(variantes))
+        params["r"] = i  # URL única por requisição
+        qs = "&".join(f"{k}={v}" for k, v in params.items())
+        urls.append(f"{server.base_url}/noticia/{rnd.choice(server.pages)}?{qs}")
+    return urls
+
+
+def _percentil(valores: List[float], p: int) -> float:
+    if not valores:
+        return 0.0
+    if len(valores) == 1:
+        return valores[0]
+    return statistics.quantiles(valores, n=100, method="inclusive")[p - 1]
+
+
+async def _rodada(service: NoticiaService, urls: List[str], concorrencia: int) -> Dict[str, object]:
+    sem = asyncio.Semaphore(concorrencia)
+    latencias: List[float] = []
+    erros = vazios = 0
+
+    async def uma(url: str):
+        nonlocal erros, vazios
+        async with sem:
+            inicio = time.perf_counter()
+            try:
+                texto = await service.fetch_and_extract_text(url, usar_cache=False)
+                if not texto:
+                    vazios += 1
+            except Exception:
+                erros += 1
+            latencias.append(time.perf_counter() - inicio)
+
+    with RssSampler() as rss:
+        inicio = time.perf_counter()
+        await asyncio.gather(*(uma(u) for u in urls))
+        duracao = time.perf_counter() - inicio
+    await close_http_fetcher()
+
+    return {
+        "concorrencia": concorrencia,
+        "n": len(urls),
+        "duracao_s": round(duracao, 3),
+        "vazao_rps": round(len(urls) / duracao, 2) if duracao else 0.0,
+        "p50_ms": round(_percentil(latencias, 50) * 1000, 1),
+        "p95_ms": round(_percentil(latencias, 95) * 1000, 1),
+        "p99_ms": round(_percentil(latencias, 99) * 1000, 1),
+        "erros": erros,
+        "sem_texto": vazios,
+        "pico_rss_mb": round(rss.pico_mb, 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--perfil", choices=sorted(PERFIS), default="misto")
+    parser.add_argument("--concorrencia", default="1,8,32", help="lista separada por vírgula")
+    parser.add_argument("--n", type=int, default=200, help="requisições por rodada")
+    parser.add_argument("--timeout", type=int, default=10, help="timeout por download (s)")
+    parser.add_argument("--corpus", default=None, help="diretório com páginas gravadas (.html)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", default=None, help="grava os resultados neste arquivo")
+    args = parser.parse_args(argv)
+
+    niveis = [int(c) for c in args.concorrencia.split(",") if c.strip()]
+    service = NoticiaService(session=None, timeout=args.timeout)
+    resultados = []
+
+    try:
+        with OriginServer(args.corpus) as server:
+            # aquecimento: sobe pool de extração/conexões antes de medir
+            asyncio.run(_rodada(service, _urls(server, "rapido", 4, args.seed), 2))
+            for c in niveis:
+                urls = _urls(server, args.perfil, args.n, args.seed + c)
+                res = asyncio.run(_rodada(service, urls, c))
+                res["perfil"] = args.perfil
+                resultados.append(res)
+                print(
+                    f"[{args.perfil}] conc={c:<4} n={res['n']:<5} {res['vazao_rps']:>8} req/s  "
+                    f"p50={res['p50_ms']:>8}ms p95={res['p95_ms']:>8}ms p99={res['p99_ms']:>8}ms  "
+                    f"erros={res['erros']:<4} sem_texto={res['sem_texto']:<4} pico_rss={res['pico_rss_mb']}MB",
+                    flush=True,
+                )
+    finally:
+        shutdown_browser_pool()
+        shutdown_extraction_pool()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, ensure_ascii=False, indent=2)
+    return resultados
+
+
+if __name__ == "__main__":
+    main()
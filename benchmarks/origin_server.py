@@ -0,0 +1,133 @@
+"""
+Servidor HTTP local que imita os portais de notícia durante o benchmark.
+
+Serve as páginas de `benchmarks/corpus/` (ou de outro diretório) e aplica, por
+URL, o perfil pedido na query string:
+
+    /noticia/<arquivo>?latencia_ms=300&jitter_ms=100&tamanho=4&erro=0.1&modo=html
+
+- latencia_ms / jitter_ms: atraso antes do primeiro byte
+- tamanho: multiplica o corpo do artigo (páginas grandes)
+- erro: probabilidade de responder 500
+- modo: html | js (texto só aparece via JavaScript) | pdf | lento (corpo em gotas) | trava (não responde)
+"""
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), "corpus")
+
+_ARTICLE_RE = re.compile(r"(<article[^>]*>)(.*?)(</article>)", re.DOTALL | re.IGNORECASE)
+
+
+def load_corpus(directory: str = CORPUS_DIR) -> Dict[str, str]:
+    pages = {}
+    for name in sorted(os.listdir(directory)):
+        if name.endswith((".html", ".htm")):
+            with open(os.path.join(directory, name), encoding="utf-8", errors="replace") as f:
+                pages[name] = f.read()
+    if not pages:
+        raise RuntimeError(f"Nenhuma página .html encontrada em {directory}")
+    return pages
+
+
+def _inflate(html: str, fator: int) -> str:
+    if fator <= 1:
+        return html
+    return _ARTICLE_RE.sub(lambda m: m.group(1) + m.group(2) * fator + m.group(3), html, count=1)
+
+
+def _as_js_page(html: str) -> str:
+    # o corpo do artigo só existe depois que o script roda (força o fallback para o Playwright)
+    m = _ARTICLE_RE.search(html)
+    if not m:
+        return html
+    conteudo = m.group(2).replace("\\", "\\\\").replace("`", "\\`").replace("</script", "<\\/script")
+    script = f"<script>document.querySelector('article').innerHTML = `{conteudo}`;</script>"
+    return html[:m.start()] + m.group(1) + m.group(3) + script + html[m.end():]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, como os portais reais
+    corpus: Dict[str, str] = {}
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        qs = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        name = parts.path.rsplit("/", 1)[-1]
+        html = self.corpus.get(name)
+        if html is None:
+            return self._send(404, b"not found", "text/plain")
+
+        latencia = float(qs.get("latencia_ms", 0)) + random.uniform(0, float(qs.get("jitter_ms", 0)))
+        if latencia:
+            time.sleep(latencia / 1000)
+
+        if random.random() < float(qs.get("erro", 0)):
+            return self._send(500, b"erro simulado", "text/plain")
+
+        modo = qs.get("modo", "html")
+        if modo == "trava":
+            time.sleep(3600)
+            return
+        if modo == "pdf":
+            return self._send(200, b"%PDF-1.4\n" + os.urandom(256 * 1024), "application/pdf")
+
+        html = _inflate(html, int(qs.get("tamanho", 1)))
+        if modo == "js":
+            html = _as_js_page(html)
+        body = html.encode("utf-8")
+
+        if modo == "lento":
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            for i in range(0, len(body), 4096):
+                self.wfile.write(body[i:i + 4096])
+                self.wfile.flush()
+                time.sleep(0.02)
+            return
+        self._send(200, body, "text/html; charset=utf-8")
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class OriginServer:
+    """Sobe o servidor numa thread própria; use como context manager."""
+
+    def __init__(self, corpus_dir: Optional[str] = None, host: str = "127.0.0.1", port: int = 0):
+        handler = type("Handler", (_Handler,), {"corpus": load_corpus(corpus_dir or CORPUS_DIR)})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="origin-server", daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def pages(self):
+        return list(self.httpd.RequestHandlerClass.corpus)
+
+    def __enter__(self) -> "OriginServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -8,3 +8,11 @@ accesslog = "-"
 errorlog = "-"
 forwarded_allow_ips = "*"
 proxy_allow_headers = "X-Forwarded-Proto"
+
+
+def worker_exit(server, worker):
+    # fecha os navegadores do Playwright e o pool de extração antes do worker morrer
+    from src.dtecflex_extract_api.services.browser_pool import shutdown_browser_pool
+    from src.dtecflex_extract_api.services.extraction_pool import shutdown_extraction_pool
+    shutdown_browser_pool()
+    shutdown_extraction_pool()
@@ -1,3 +1,5 @@
+from typing import Dict, List
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from celery import Celery
 from kombu import Exchange, Queue
@@ -24,6 +26,115 @@ class Settings(BaseSettings):
     DB_PORT: int | None = None
     DB_NAME: str | None = None
 
+    # Playwright (pool de navegadores para captura de notícias)
+    PLAYWRIGHT_POOL_SIZE: int = 2                  # navegadores simultâneos por processo
+    PLAYWRIGHT_QUEUE_SIZE: int = 100               # páginas aguardando navegador livre
+    PLAYWRIGHT_ACQUIRE_TIMEOUT: int = 60           # segundos esperando um navegador livre
+    PLAYWRIGHT_MAX_PAGES_PER_BROWSER: int = 50     # recicla o navegador após N páginas
+    PLAYWRIGHT_MAX_RSS_MB: int = 600               # recicla o navegador acima desse consumo
+    PLAYWRIGHT_IDLE_TIMEOUT: int = 300             # fecha navegador ocioso após N segundos
+    PLAYWRIGHT_RENDER_MODE: str = "texto"          # texto | completo
+    PLAYWRIGHT_BLOCKED_RESOURCE_TYPES: list[str] = [
+        "image", "media", "font", "stylesheet", "texttrack", "manifest", "eventsource", "websocket",
+    ]
+    PLAYWRIGHT_BLOCKED_DOMAINS: list[str] = [
+        "doubleclick.net", "googlesyndication.com", "googleadservices.com", "google-analytics.com",
+        "googletagmanager.com", "googletagservices.com", "adservice.google.com", "facebook.net",
+        "connect.facebook.net", "amazon-adsystem.com", "scorecardresearch.com", "taboola.com",
+        "outbrain.com", "criteo.com", "criteo.net", "hotjar.com", "chartbeat.com", "newrelic.com",
+        "nr-data.net", "adsrvr.org", "rubiconproject.com", "pubmatic.com", "onesignal.com",
+    ]
+    PLAYWRIGHT_ARTICLE_SELECTOR: str = (
+        "article, [itemprop='articleBody'], .article-body, .content-text, .materia-conteudo, main p"
+    )
+    PLAYWRIGHT_ARTICLE_WAIT_MS: int = 8000         # espera máxima pelo contêiner do artigo
+
+    # HTTP (captura assíncrona de notícias)
+    HTTP_FETCH_MAX_CONNECTIONS: int = 100          # requisições simultâneas por processo
+    HTTP_FETCH_MAX_PER_HOST: int = 6               # requisições simultâneas por portal
+    HTTP_FETCH_HTTP2: bool = True
+    HTTP_FETCH_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_FETCH_MAX_BYTES: int = 5 * 1024 * 1024    # download abortado acima disso
+    HTTP_FETCH_ALLOWED_CONTENT_TYPES: list[str] = ["text/html", "application/xhtml+xml"]
+
+    # Cache local de HTML capturado
+    HTML_CACHE_ENABLED: bool = True
+    HTML_CACHE_DIR: str = "/tmp/dtecflex-html-cache"
+    HTML_CACHE_TTL: int = 6 * 60 * 60              # segundos antes de revalidar na origem
+    HTML_CACHE_MAX_MB: int = 1024                  # acima disso remove as entradas menos usadas (LRU)
+
+    # Memória de estratégia de captura por domínio (Redis)
+    FETCH_STRATEGY_ENABLED: bool = True
+    FETCH_STRATEGY_MIN_SAMPLES: int = 5            # tentativas antes de confiar nas estatísticas
+    FETCH_STRATEGY_MIN_SUCCESS: float = 0.5        # abaixo disso o GET HTTP deixa de ser o primeiro
+    FETCH_STRATEGY_PROBE_EVERY: int = 20           # a cada N capturas re-sonda a ordem padrão
+    FETCH_STRATEGY_TTL_DAYS: int = 30
+
+    # Extração de texto (trafilatura) em pool de processos
+    EXTRACTION_POOL_ENABLED: bool = True
+    EXTRACTION_WORKERS: int = 0                    # 0 = um processo por CPU
+    EXTRACTION_MP_CONTEXT: str = "forkserver"      # forkserver | spawn | fork
+    EXTRACTION_TIMEOUT: int = 20                   # segundos por extração
+    EXTRACTION_MAX_HTML_CHARS: int = 5_000_000     # HTML maior que isso é truncado
+    EXTRACTION_MAX_TASKS_PER_CHILD: int = 500      # jobs por processo antes de reciclá-lo (0 = nunca)
+
+    # Captura em lote (fila "capture")
+    CAPTURE_BATCH_CONCURRENCY: int = 16            # capturas simultâneas por job
+    CAPTURE_BATCH_MAX_ITEMS: int = 2000            # teto de notícias por job
+
+    # Contagem total das listagens de notícias
+    NOTICIAS_COUNT_CACHE_ENABLED: bool = True
+    NOTICIAS_COUNT_CACHE_TTL: int = 60             # segundos; escritas em colunas filtradas invalidam antes
+    NOTICIAS_COUNT_ESTIMATE_MIN: int = 10000       # no modo estimado, abaixo disso conta exato
+
+    # Extração de nomes (LLM) em lote (fila "llm")
+    LLM_BATCH_CONCURRENCY: int = 4                 # chamadas simultâneas ao modelo por job
+    LLM_BATCH_MAX_ITEMS: int = 1000                # teto de notícias por job
+
+    # Cache da extração de nomes por hash(modelo, prompt, texto)
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_TTL_DAYS: int = 30                   # 0 = sem expiração
+    LLM_CACHE_DB_FALLBACK: bool = True             # cópia durável em TB_LLM_EXTRACAO_CACHE
+
+    # Divisão de artigos longos em blocos para a extração de nomes
+    LLM_CHUNK_MAX_TOKENS: int = 6000               # tokens de artigo por chamada
+    LLM_CHUNK_OVERLAP_TOKENS: int = 300            # parágrafos repetidos entre blocos vizinhos
+    LLM_CHUNK_CONCURRENCY: int = 4                 # blocos do mesmo artigo enviados em paralelo
+
+    # Cliente OpenAI compartilhado + cota por modelo no cluster (Redis)
+    LLM_REQUEST_TIMEOUT: float = 120.0             # segundos por chamada
+    LLM_MAX_RETRIES: int = 5                       # após 429/erro transitório
+    LLM_RATE_LIMIT_ENABLED: bool = True
+    LLM_DEFAULT_RPM: int = 500                     # requisições/min por modelo (todos os processos)
+    LLM_DEFAULT_TPM: int = 30000                   # tokens/min por modelo (todos os processos)
+    LLM_RATE_LIMITS: Dict[str, Dict[str, int]] = {}  # por modelo, ex.: {"gpt-4o": {"rpm": 5000, "tpm": 800000}}
+    LLM_EXPECTED_OUTPUT_TOKENS: int = 800          # reserva de saída na estimativa de tokens
+
+    # Pré-filtro local: pula a chamada ao modelo em textos sem indício de pessoas
+    LLM_PRESCREEN_ENABLED: bool = True
+    LLM_PRESCREEN_THRESHOLD: float = 0.2           # escore 0..1 abaixo do qual o texto não vai ao modelo
+    LLM_PRESCREEN_ACTION: str = "skip"             # skip (devolve []) | defer (lote guarda para depois)
+
+    # Condensação do texto antes da extração (menos tokens de entrada)
+    LLM_CONDENSE_ENABLED: bool = True
+    LLM_CONDENSE_FOCO_NOMES: bool = False          # mantém só frases com nomes (+ contexto)
+    LLM_CONDENSE_CONTEXTO: int = 1                 # frases vizinhas mantidas em volta de cada nome
+    LLM_CONDENSE_PADROES_FONTE: Dict[str, List[str]] = {}  # regex extras por FONTE, ex.: {"g1": ["^veja também"]}
+
+    # Empacotamento de artigos curtos numa única chamada (lote de extração)
+    LLM_PACK_ENABLED: bool = True
+    LLM_PACK_MAX_CHARS: int = 1500                 # artigos abaixo disso podem ir juntos
+    LLM_PACK_MAX_ARTICLES: int = 8                 # artigos por requisição empacotada
+
+    # Roteamento de modelo (textos curtos no modelo econômico, escalando se a resposta não servir)
+    LLM_ROUTING_ENABLED: bool = True
+    LLM_MODEL_ECONOMICO: str = "gpt-4o-mini"       # vazio = sempre o modelo principal
+    LLM_ROUTING_MAX_TOKENS: int = 1500             # textos até esse tamanho tentam o econômico primeiro
+    LLM_MODEL_PRICES: Dict[str, Dict[str, float]] = {  # USD por 1M tokens, para o custo por rota
+        "gpt-4o": {"input": 2.5, "output": 10.0},
+        "gpt-4o-mini": {"input": 0.15, "output": 0.6},
+    }
+
 settings = Settings()
 
 celery_app = Celery(
@@ -43,11 +154,17 @@ celery_app.conf.update(
     task_queues=(
         Queue("celery", Exchange("celery"), routing_key="celery"),
         Queue("transfer", Exchange("transfer"), routing_key="transfer"),
+        Queue("capture", Exchange("capture"), routing_key="capture"),
+        Queue("llm", Exchange("llm"), routing_key="llm"),
     ),
     task_default_exchange="celery",
     task_default_routing_key="celery",
 
-    include=["src.dtecflex_extract_api.tasks.transfer"],  # garante import
+    include=[
+        "src.dtecflex_extract_api.tasks.transfer",
+        "src.dtecflex_extract_api.tasks.capture",
+        "src.dtecflex_extract_api.tasks.extraction",
+    ],  # garante import
 )
 
 celery_app.autodiscover_tasks(["dtecflex_extract_api"], related_name="tasks")
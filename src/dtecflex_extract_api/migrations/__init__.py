@@ -0,0 +1,7 @@
+"""
+Migrações versionadas do schema (índices e tabelas auxiliares).
+
+    python -m src.dtecflex_extract_api.migrations status
+    python -m src.dtecflex_extract_api.migrations upgrade
+    python -m src.dtecflex_extract_api.migrations check
+"""
@@ -0,0 +1,44 @@
+import argparse
+import logging
+import sys
+
+from src.dtecflex_extract_api.migrations import check, runner
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.dtecflex_extract_api.migrations",
+                                     description="Migrações de schema e verificação de índices")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    sub.add_parser("status", help="Lista as migrações aplicadas e pendentes")
+    up = sub.add_parser("upgrade", help="Aplica as migrações pendentes")
+    up.add_argument("--ate", help="Para na versão informada (inclusive)")
+    sub.add_parser("check", help="EXPLAIN das consultas da listagem; sai com 1 se houver full scan")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    # import tardio: config.database lê o .env e cria o engine
+    from src.dtecflex_extract_api.config.database import SessionLocal, engine
+
+    if args.comando == "status":
+        feitas = runner.aplicadas(engine)
+        for m in runner.descobrir():
+            quando = feitas.get(m.versao)
+            print(f"{m.versao}  {'aplicada em ' + str(quando) if quando else 'PENDENTE':<32}  {m.descricao}")
+        return 0
+
+    if args.comando == "upgrade":
+        feitas = runner.upgrade(engine, ate=args.ate)
+        print(f"{len(feitas)} migração(ões) aplicada(s): {', '.join(feitas) or '-'}")
+        return 0
+
+    db = SessionLocal()
+    try:
+        resultados = check.verificar(db)
+    finally:
+        db.close()
+    print(check.relatorio(resultados))
+    return 0 if all(r.ok for r in resultados) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
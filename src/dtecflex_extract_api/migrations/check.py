@@ -0,0 +1,109 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import inspect, text
+from sqlalchemy.orm import Session
+
+from src.dtecflex_extract_api.resources.noticias.entities.noticia_raspada import NoticiaRaspadaModel
+from src.dtecflex_extract_api.resources.noticias.noticias_service import NoticiaService
+
+_STATUS = ["201-APPROVED", "203-PUBLISHED"]
+
+
+@dataclass
+class Formato:
+    nome: str
+    filters: Dict[str, Any]
+    # filtros sem índice possível (ex.: FONTE com LIKE '%x%'): o scan é reportado mas não reprova
+    scan_esperado: bool = False
+
+
+@dataclass
+class Resultado:
+    formato: str
+    consulta: str
+    linhas: List[Dict[str, Any]] = field(default_factory=list)
+    scan_esperado: bool = False
+
+    @property
+    def scans(self) -> List[Dict[str, Any]]:
+        return [l for l in self.linhas if (l.get("type") or "").upper() == "ALL"]
+
+    @property
+    def ok(self) -> bool:
+        return self.scan_esperado or not self.scans
+
+
+def formatos() -> List[Formato]:
+    """Os filtros que GET /noticias, /noticias/me e /noticias/por-data-categoria realmente montam."""
+    hoje = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    ontem = hoje - timedelta(days=1)
+    reg = f"C{ontem:%Y%m%d}"
+    return [
+        Formato("sem filtro", {}),
+        Formato("status", {"STATUS": _STATUS}),
+        Formato("categoria + reg_noticia", {"REG_NOTICIA_RANGE": (reg, f"{reg}\uffff"), "CATEGORIA": "Crime", "STATUS": _STATUS}),
+        Formato("data_publicacao", {"DATA_PUBLICACAO": (ontem, hoje)}),
+        Formato("dt_aprovacao", {"DT_APROVACAO": (ontem, hoje)}),
+        Formato("usuario", {"USUARIO_ID": 1}),
+        Formato("usuario + status", {"USUARIO_ID": 1, "STATUS": _STATUS}),
+        Formato("categoria + status", {"CATEGORIA": "Crime", "STATUS": _STATUS}),
+        Formato("fonte (LIKE)", {"FONTE": "g1"}, scan_esperado=True),
+        Formato("busca textual", {"BUSCA": "operação polícia"}),
+        Formato("busca + status", {"BUSCA": "operação polícia", "STATUS": _STATUS}),
+    ]
+
+
+def explain(session: Session, statement) -> List[Dict[str, Any]]:
+    compilado = statement.compile(dialect=session.get_bind().dialect)
+    params = (
+        tuple(compilado.params[k] for k in compilado.positiontup)
+        if compilado.positional else compilado.params
+    )
+    resultado = session.connection().exec_driver_sql(f"EXPLAIN {compilado}", params)
+    return [dict(r) for r in resultado.mappings()]
+
+
+def verificar(session: Session, id_referencia: Optional[int] = None) -> List[Resultado]:
+    """
+    EXPLAIN de cada formato de consulta da listagem: página (keyset, ORDER BY ID DESC LIMIT),
+    COUNT do total e a busca de registros na Auxiliar. Linhas com type=ALL são full scans.
+    """
+    service = NoticiaService(session=session)
+    id_referencia = id_referencia or 2 ** 31 - 1
+    resultados = []
+
+    for f in formatos():
+        pagina = (
+            service._query_listagem(f.filters, "resumo")
+            .filter(NoticiaRaspadaModel.ID < id_referencia)
+            .order_by(NoticiaRaspadaModel.ID.desc())
+            .limit(11)
+        )
+        resultados.append(Resultado(f.nome, "página", explain(session, pagina.statement), f.scan_esperado))
+
+        contagem = service._aplicar_filtros(session.query(NoticiaRaspadaModel.ID), f.filters)
+        resultados.append(Resultado(f.nome, "contagem", explain(session, contagem.statement), f.scan_esperado))
+
+    if not inspect(session.connection()).has_table("Auxiliar"):
+        return resultados
+    aux = session.execute(
+        text("EXPLAIN SELECT * FROM Auxiliar WHERE REGISTRO_NOTICIA IN (:p0, :p1)"),
+        {"p0": "C00000000000", "p1": "C00000000001"},
+    )
+    resultados.append(Resultado("auxiliar por registro", "aux", [dict(r) for r in aux.mappings()]))
+    return resultados
+
+
+def relatorio(resultados: List[Resultado]) -> str:
+    linhas = []
+    for r in resultados:
+        marca = "OK " if not r.scans else ("~  " if r.scan_esperado else "SCAN")
+        for l in r.linhas:
+            linhas.append(
+                f"{marca:<4} {r.formato:<26} {r.consulta:<9} {str(l.get('table')):<28} "
+                f"type={str(l.get('type')):<7} key={str(l.get('key')):<30} rows={l.get('rows')} "
+                f"{l.get('Extra') or ''}"
+            )
+    return "\n".join(linhas)
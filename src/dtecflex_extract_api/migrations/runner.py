@@ -0,0 +1,122 @@
+import importlib
+import logging
+import pkgutil
+from dataclasses import dataclass
+from datetime import datetime
+from types import ModuleType
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, func, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from src.dtecflex_extract_api.migrations import versions
+
+logger = logging.getLogger(__name__)
+
+_metadata = MetaData()
+
+# versões aplicadas; fora do Base para não entrar em metadata de modelo nenhum
+schema_migrations = Table(
+    "TB_SCHEMA_MIGRATIONS", _metadata,
+    Column("VERSAO", String(32), primary_key=True),
+    Column("DESCRICAO", String(250), nullable=False),
+    Column("DT_APLICACAO", DateTime, nullable=False, server_default=func.now()),
+)
+
+
+@dataclass
+class Migracao:
+    versao: str
+    descricao: str
+    modulo: ModuleType
+
+    def upgrade(self, conn: Connection):
+        self.modulo.upgrade(conn)
+
+
+def descobrir() -> List[Migracao]:
+    """Módulos de migrations/versions (NNNN_nome.py) com VERSAO, DESCRICAO e upgrade(conn), em ordem."""
+    migracoes = []
+    for info in pkgutil.iter_modules(versions.__path__):
+        modulo = importlib.import_module(f"{versions.__name__}.{info.name}")
+        migracoes.append(Migracao(modulo.VERSAO, modulo.DESCRICAO, modulo))
+    migracoes.sort(key=lambda m: m.versao)
+    repetidas = {m.versao for m in migracoes if sum(o.versao == m.versao for o in migracoes) > 1}
+    if repetidas:
+        raise RuntimeError(f"Versões de migração repetidas: {sorted(repetidas)}")
+    return migracoes
+
+
+def aplicadas(engine: Engine) -> Dict[str, datetime]:
+    schema_migrations.create(bind=engine, checkfirst=True)
+    with engine.connect() as conn:
+        rows = conn.execute(select(schema_migrations.c.VERSAO, schema_migrations.c.DT_APLICACAO))
+        return {r.VERSAO: r.DT_APLICACAO for r in rows}
+
+
+def pendentes(engine: Engine) -> List[Migracao]:
+    feitas = aplicadas(engine)
+    return [m for m in descobrir() if m.versao not in feitas]
+
+
+def upgrade(engine: Engine, ate: Optional[str] = None) -> List[str]:
+    """
+    Aplica as migrações pendentes em ordem, cada uma registrada em TB_SCHEMA_MIGRATIONS
+    ao terminar. No MySQL DDL faz commit implícito: as migrações devem ser idempotentes
+    (ver criar_indice) para poderem ser reexecutadas após uma falha no meio.
+    """
+    feitas = []
+    for m in pendentes(engine):
+        if ate and m.versao > ate:
+            break
+        logger.info(f"Aplicando migração {m.versao}: {m.descricao}")
+        with engine.begin() as conn:
+            m.upgrade(conn)
+            conn.execute(schema_migrations.insert().values(VERSAO=m.versao, DESCRICAO=m.descricao[:250]))
+        feitas.append(m.versao)
+    return feitas
+
+
+# ---------- helpers para as migrações ----------
+def tabela_existe(conn: Connection, tabela: str) -> bool:
+    return inspect(conn).has_table(tabela)
+
+
+def indice_existe(conn: Connection, tabela: str, nome: str) -> bool:
+    return conn.execute(
+        text(
+            "SELECT 1 FROM information_schema.STATISTICS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :tabela AND INDEX_NAME = :nome LIMIT 1"
+        ),
+        {"tabela": tabela, "nome": nome},
+    ).first() is not None
+
+
+def _coluna(coluna: str) -> str:
+    # "COL(20)" = índice de prefixo (colunas TEXT/BLOB)
+    nome, _, prefixo = coluna.partition("(")
+    return f"`{nome}`({prefixo}" if prefixo else f"`{nome}`"
+
+
+def tipo_coluna(conn: Connection, tabela: str, coluna: str) -> Optional[str]:
+    return conn.execute(
+        text(
+            "SELECT DATA_TYPE FROM information_schema.COLUMNS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :tabela AND COLUMN_NAME = :coluna"
+        ),
+        {"tabela": tabela, "coluna": coluna},
+    ).scalar()
+
+
+def criar_indice(conn: Connection, tabela: str, nome: str, colunas: Sequence[str], tipo: str = "") -> bool:
+    """
+    CREATE [FULLTEXT] INDEX idempotente (o MySQL não tem IF NOT EXISTS para índices).
+    Retorna se criou.
+    """
+    if indice_existe(conn, tabela, nome):
+        logger.info(f"Índice {nome} já existe em {tabela}")
+        return False
+    prefixo = f"{tipo} " if tipo else ""
+    conn.execute(text(f"CREATE {prefixo}INDEX `{nome}` ON `{tabela}` ({', '.join(_coluna(c) for c in colunas)})"))
+    logger.info(f"Índice {nome} criado em {tabela}({', '.join(colunas)})")
+    return True
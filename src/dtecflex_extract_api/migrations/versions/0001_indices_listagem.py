@@ -0,0 +1,21 @@
+from src.dtecflex_extract_api.migrations.runner import criar_indice
+
+VERSAO = "0001"
+DESCRICAO = "Índices dos filtros da listagem de notícias (STATUS, CATEGORIA/REG_NOTICIA, datas, usuário)"
+
+TABELA = "TB_NOTICIA_RASPADA"
+
+# (nome, colunas) — o ID no fim atende ao ORDER BY ID DESC / paginação por chave sem filesort
+INDICES = [
+    ("IX_NOTICIA_STATUS_ID", ["STATUS", "ID"]),
+    ("IX_NOTICIA_CATEGORIA_REG", ["CATEGORIA", "REG_NOTICIA"]),
+    ("IX_NOTICIA_REG_NOTICIA", ["REG_NOTICIA"]),
+    ("IX_NOTICIA_DATA_PUBLICACAO", ["DATA_PUBLICACAO"]),
+    ("IX_NOTICIA_DT_APROVACAO", ["DT_APROVACAO"]),
+    ("IX_NOTICIA_USUARIO_STATUS", ["ID_USUARIO", "STATUS"]),
+]
+
+
+def upgrade(conn):
+    for nome, colunas in INDICES:
+        criar_indice(conn, TABELA, nome, colunas)
@@ -0,0 +1,18 @@
+import logging
+
+from src.dtecflex_extract_api.migrations.runner import criar_indice, tabela_existe, tipo_coluna
+
+logger = logging.getLogger(__name__)
+
+VERSAO = "0002"
+DESCRICAO = "Índice em Auxiliar.REGISTRO_NOTICIA (registros anexados à listagem por data/categoria)"
+
+
+def upgrade(conn):
+    if not tabela_existe(conn, "Auxiliar"):
+        logger.warning("Tabela Auxiliar não existe neste banco; índice não criado")
+        return
+    tipo = (tipo_coluna(conn, "Auxiliar", "REGISTRO_NOTICIA") or "").lower()
+    # TEXT/BLOB só aceitam índice de prefixo; REG_NOTICIA tem até 20 caracteres
+    coluna = "REGISTRO_NOTICIA(20)" if "text" in tipo or "blob" in tipo else "REGISTRO_NOTICIA"
+    criar_indice(conn, "Auxiliar", "IX_AUXILIAR_REGISTRO_NOTICIA", [coluna])
@@ -0,0 +1,8 @@
+from src.dtecflex_extract_api.resources.noticias.entities.llm_extracao_cache import LlmExtracaoCacheModel
+
+VERSAO = "0003"
+DESCRICAO = "Tabela TB_LLM_EXTRACAO_CACHE (cópia durável do cache de extração de nomes)"
+
+
+def upgrade(conn):
+    LlmExtracaoCacheModel.__table__.create(bind=conn, checkfirst=True)
@@ -0,0 +1,9 @@
+from src.dtecflex_extract_api.migrations.runner import criar_indice
+
+VERSAO = "0004"
+DESCRICAO = "Índice FULLTEXT em TB_NOTICIA_RASPADA(TITULO, TEXTO_NOTICIA) para a busca q= da listagem"
+
+
+def upgrade(conn):
+    # o InnoDB reconstrói a tabela na primeira FULLTEXT: em bases grandes, rodar fora do horário de pico
+    criar_indice(conn, "TB_NOTICIA_RASPADA", "FT_NOTICIA_TITULO_TEXTO", ["TITULO", "TEXTO_NOTICIA"], tipo="FULLTEXT")
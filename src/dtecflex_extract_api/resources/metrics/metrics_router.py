@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
+
+from src.dtecflex_extract_api.resources.usuario.entities.usuario import UsuarioModel
+from src.dtecflex_extract_api.shared.utils.get_current_user import get_current_user
+from src.dtecflex_extract_api.utils.metrics import render_prometheus
+
+router = APIRouter()
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics(current_user: UsuarioModel = Depends(get_current_user)):
+    """
+    Contadores e histogramas compartilhados (API e workers) no formato de texto do Prometheus:
+    duração e tempo até o primeiro token das chamadas ao modelo, tokens de entrada/saída/em cache,
+    estratégia de parse do JSON e entidades descartadas pelo filtro de pessoas físicas.
+    Exige o mesmo Bearer token das outras rotas (no Prometheus: `authorization` do scrape_config).
+    """
+    try:
+        corpo = await run_in_threadpool(render_prometheus)
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Métricas indisponíveis: {e}")
+    return PlainTextResponse(corpo, media_type="text/plain; version=0.0.4")
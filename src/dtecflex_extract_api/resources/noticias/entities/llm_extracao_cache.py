@@ -0,0 +1,17 @@
+from sqlalchemy import Column, DateTime, String, Text, func
+from sqlalchemy.dialects.mysql import MEDIUMTEXT
+
+from src.dtecflex_extract_api.config.base import Base
+
+
+class LlmExtracaoCacheModel(Base):
+    __tablename__ = 'TB_LLM_EXTRACAO_CACHE'
+
+    CHAVE = Column(String(64), primary_key=True)  # sha256(modelo, prompt, texto normalizado)
+    MODELO = Column(String(100), nullable=False)
+    RESULTADO = Column(Text().with_variant(MEDIUMTEXT(), 'mysql'), nullable=False)  # JSON
+    DT_CRIACAO = Column(DateTime, nullable=False, server_default=func.now())
+    DT_EXPIRACAO = Column(DateTime, nullable=True, index=True)
+
+    def __repr__(self):
+        return f"<LlmExtracaoCacheModel(CHAVE='{self.CHAVE}', MODELO='{self.MODELO}')>"
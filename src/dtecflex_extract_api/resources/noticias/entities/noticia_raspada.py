@@ -1,10 +1,21 @@
-from sqlalchemy import Column, DateTime, Integer, String, Text, ForeignKey, func, BigInteger, Date
+from sqlalchemy import Column, DateTime, Integer, String, Text, ForeignKey, func, BigInteger, Date, Index
 from sqlalchemy.orm import relationship
 
 from src.dtecflex_extract_api.config.base import Base
 
 class NoticiaRaspadaModel(Base):
     __tablename__ = 'TB_NOTICIA_RASPADA'
+    # criados pelas migrações 0001 e 0004 (src/dtecflex_extract_api/migrations)
+    __table_args__ = (
+        Index('IX_NOTICIA_STATUS_ID', 'STATUS', 'ID'),
+        Index('IX_NOTICIA_CATEGORIA_REG', 'CATEGORIA', 'REG_NOTICIA'),
+        Index('IX_NOTICIA_REG_NOTICIA', 'REG_NOTICIA'),
+        Index('IX_NOTICIA_DATA_PUBLICACAO', 'DATA_PUBLICACAO'),
+        Index('IX_NOTICIA_DT_APROVACAO', 'DT_APROVACAO'),
+        Index('IX_NOTICIA_USUARIO_STATUS', 'ID_USUARIO', 'STATUS'),
+        # migração 0004: busca textual (q=) de GET /noticias
+        Index('FT_NOTICIA_TITULO_TEXTO', 'TITULO', 'TEXTO_NOTICIA', mysql_prefix='FULLTEXT'),
+    )
 
     ID = Column(Integer, primary_key=True, index=True)
     LINK_ID = Column(String(64), nullable=False, unique=True)
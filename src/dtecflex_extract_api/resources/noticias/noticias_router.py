@@ -1,12 +1,16 @@
+import json
 from collections import defaultdict
+from dataclasses import asdict
 from dtecflex_extract_api.services.transfer_service import normalize_category
-from dtecflex_extract_api.utils.pubsub import META_PREFIX, acquire_lock, get_meta, job_key, lock_key, meta_key, publish, save_meta, r_sync
+from dtecflex_extract_api.utils.pubsub import CAPTURE_PREFIX, EXTRACTION_PREFIX, META_PREFIX, acquire_lock, capture_job_key, extraction_job_key, get_meta, job_key, lock_key, meta_key, publish, save_meta, r_sync
 import requests
 from celery.result import AsyncResult
 from fastapi import Body, HTTPException, status, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
-from src.dtecflex_extract_api.config.celery import celery_app
+from src.dtecflex_extract_api.config.celery import celery_app, settings
 from src.dtecflex_extract_api.resources.noticias.entities.noticia_raspada import NoticiaRaspadaModel, NoticiaRaspadaNomeModel
 from src.dtecflex_extract_api.resources.noticias.schemas.noticia_create import NoticiaCreate
 from src.dtecflex_extract_api.resources.noticias.schemas.noticia_nome_update import NoticiaNomePartialUpdate, NoticiaNomesBatchUpdateIn
@@ -20,6 +24,14 @@ from src.dtecflex_extract_api.config.database import get_noticia_service
 from src.dtecflex_extract_api.resources.noticias.noticias_service import NoticiaService
 from src.dtecflex_extract_api.tasks.test import ping, add
 from src.dtecflex_extract_api.tasks.transfer import transfer_task
+from src.dtecflex_extract_api.tasks.capture import capture_batch_task
+from src.dtecflex_extract_api.tasks.extraction import extract_names_batch_task
+from src.dtecflex_extract_api.services.fetch_strategy import domain_stats
+from src.dtecflex_extract_api.services.llm_cache import get_llm_cache
+from src.dtecflex_extract_api.services.name_prescreen import listar_adiados, prescreen, stats as prescreen_stats
+from src.dtecflex_extract_api.services import model_router
+from src.dtecflex_extract_api.services.text_condenser import condense
+from src.dtecflex_extract_api.utils.cursor import decode_cursor, encode_cursor
 
 router = APIRouter()
 
@@ -40,6 +52,22 @@ class AprovarNoticiasIn(BaseModel):
 class NoticiaRequest(BaseModel):
     url: str
 
+class CapturaLoteIn(BaseModel):
+    ids: Optional[List[int]] = Field(None, description="IDs das notícias a capturar")
+    data: Optional[date] = Field(None, description="Data de publicação (YYYY-MM-DD)")
+    categoria: Optional[str] = Field(None, description="Nome ou abreviação: CR, LD, FF, SE, SA")
+    status: Optional[List[str]] = None
+    somente_sem_texto: bool = Field(True, description="Ignora notícias que já têm TEXTO_NOTICIA")
+    usar_cache: bool = Field(True, description="Se False, ignora o cache local de HTML")
+
+class ExtracaoNomesLoteIn(BaseModel):
+    ids: Optional[List[int]] = Field(None, description="IDs das notícias a pré-extrair")
+    data: Optional[date] = Field(None, description="Data de publicação (YYYY-MM-DD)")
+    categoria: Optional[str] = Field(None, description="Nome ou abreviação: CR, LD, FF, SE, SA")
+    status: Optional[List[str]] = None
+    forcar: bool = Field(False, description="Ignora o pré-filtro local e chama o modelo mesmo assim")
+    adiados: bool = Field(False, description="Reprocessa as notícias adiadas pelo pré-filtro (implica `forcar`)")
+
 class NoticiaUpdateSchema(BaseModel):
     fonte:         Optional[str] = None
     titulo:        Optional[str] = None
@@ -152,6 +180,10 @@ def list_noticias(
     dt_aprovacao: Optional[str] = Query(None, alias="dt_aprovacao"),
     data_fim: Optional[str] = Query(None, alias="data_fim"),
     usuario_id: Optional[int] = Query(None, alias="usuario_id"),
+    q: Optional[str] = Query(None, min_length=2, description="Busca em TITULO e TEXTO_NOTICIA (ordenada por relevância)"),
+    cursor: Optional[str] = Query(None, description="Token de `next`/`previous` (paginação por chave)"),
+    contagem: str = Query("exato", pattern="^(exato|estimado)$", description="`estimado` usa as estatísticas do MySQL para o total"),
+    projecao: str = Query("completa", pattern="^(completa|resumo)$", description="`resumo`: só colunas da grade e QTD_NOMES"),
     noticia_service: NoticiaService = Depends(get_noticia_service),
     current_user: UsuarioModel = Depends(get_current_user),
 ):
@@ -172,8 +204,6 @@ def list_noticias(
     if status and len(status) == 1 and "," in status[0]:
         status = [s.strip() for s in status[0].split(",") if s.strip()]
 
-    offset = (page - 1) * limit
-
     filters: Dict[str, Any] = {}
     if fonte:
         filters["FONTE"] = fonte
@@ -183,6 +213,8 @@ def list_noticias(
         filters["STATUS"] = status
     if usuario_id:
         filters["USUARIO_ID"] = usuario_id
+    if q and q.strip():
+        filters["BUSCA"] = q.strip()
     if start_aprv or end_aprv:
         filters["DT_APROVACAO"] = (start_aprv, end_aprv)
 
@@ -193,23 +225,62 @@ def list_noticias(
     elif df:
         filters["DATA_PUBLICACAO"] = (None, df)
 
-    noticias, total_count = noticia_service.list(offset=offset, limit=limit, filters=filters)
+    return _paginar(request, noticia_service, page, limit, cursor, filters, contagem=contagem, projecao=projecao)
+
 
+def _cursor_url(request: Request, cursor: Optional[Dict[str, Any]], limit: int) -> Optional[str]:
+    if cursor is None:
+        return None
+    url = request.url.remove_query_params("page")
+    return str(url.include_query_params(cursor=encode_cursor(cursor), limit=limit))
+
+
+def _paginar(
+        request: Request,
+        noticia_service: NoticiaService,
+        page: int,
+        limit: int,
+        cursor: Optional[str],
+        filters: Dict[str, Any],
+        incluir_aux: bool = False,
+        contagem: str = "exato",
+        projecao: str = "completa",
+) -> Dict[str, Any]:
+    """
+    Paginação das listagens. `next`/`previous` sempre usam cursor (paginação por chave);
+    `page` > 1 sem cursor continua aceito por compatibilidade, via OFFSET.
+    `contagem="estimado"` aceita um total aproximado (estatísticas do MySQL) em filtros amplos.
+    `projecao="resumo"` traz só as colunas da grade e QTD_NOMES (texto e nomes em GET /noticias/{id}).
+    """
+    total_count, estimado = noticia_service.contar(filters, modo=contagem)
     total_pages = (total_count + limit - 1) // limit
 
-    next_url = (
-        str(request.url.include_query_params(page=page + 1, limit=limit))
-        if page < total_pages else None
-    )
-    prev_url = (
-        str(request.url.include_query_params(page=page - 1, limit=limit))
-        if page > 1 else None
-    )
+    if cursor or page == 1:
+        try:
+            ref = decode_cursor(cursor) if cursor else None
+            noticias, proximo, anterior = noticia_service.list_keyset(
+                limit=limit, filters=filters, cursor=ref, incluir_aux=incluir_aux, projecao=projecao,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        next_url = _cursor_url(request, proximo, limit)
+        prev_url = _cursor_url(request, anterior, limit)
+    else:
+        noticias, _ = noticia_service.list(
+            offset=(page - 1) * limit, limit=limit, filters=filters, incluir_aux=incluir_aux, projecao=projecao,
+            total=total_count,
+        )
+        next_url = (
+            _cursor_url(request, noticia_service.cursor_de(noticias[-1], "n"), limit)
+            if noticias and page < total_pages else None
+        )
+        prev_url = _cursor_url(request, noticia_service.cursor_de(noticias[0], "p"), limit) if noticias else None
 
     return {
         "total_count": total_count,
+        "total_estimated": estimado,
         "total_pages": total_pages,
-        "page": page,
+        "page": None if cursor else page,
         "next": next_url,
         "previous": prev_url,
         "noticias": noticias,
@@ -316,19 +387,80 @@ def listar_categorias(
     return noticia_service.listar_categorias()
 
 @router.post("/capturar-texto-noticia")
-def capturar_texto_noticia(
+async def capturar_texto_noticia(
     request: NoticiaRequest,
+    cache: bool = Query(True, description="Se False, ignora o cache local de HTML e baixa da origem"),
     noticia_service: NoticiaService = Depends(get_noticia_service)
 ):
     try:
-        noticia = noticia_service.fetch_and_extract_text(request.url)
+        # download assíncrono: o worker segue atendendo outras capturas enquanto espera o portal
+        noticia = await noticia_service.fetch_and_extract_text(request.url, usar_cache=cache)
 
-        updated_noticia = noticia_service.update_noticia_text(request.url, noticia)
+        updated_noticia = await run_in_threadpool(noticia_service.update_noticia_text, request.url, noticia)
 
         return updated_noticia  # Retorna a notícia atualizada
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erro ao capturar texto da notícia: {e}")
 
+@router.post("/capturar-texto/lote", status_code=status.HTTP_202_ACCEPTED)
+def capturar_texto_lote(payload: CapturaLoteIn):
+    """
+    Agenda a captura de texto de várias notícias (por IDs ou por data/categoria) na fila "capture".
+    O progresso sai pelo mesmo canal Redis da publicação (meta + pub/sub na chave retornada).
+    """
+    if not payload.ids and not payload.data and not payload.categoria:
+        raise HTTPException(status_code=422, detail="Informe `ids` ou um filtro de `data`/`categoria`.")
+
+    categoria = cat_prefix = None
+    if payload.categoria:
+        try:
+            abrev, cat_prefix, categoria = normalize_category(payload.categoria)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+
+    date_dir = payload.data.strftime("%Y%m%d") if payload.data else "ALL"
+    key = capture_job_key(date_dir, cat_prefix, ids=payload.ids)
+
+    if not acquire_lock(key):
+        raise HTTPException(status_code=409, detail={
+            "message": "Captura já em andamento para estes filtros.",
+            "key": key, "state": "RUNNING",
+        })
+
+    data_str = payload.data.isoformat() if payload.data else None
+    job = capture_batch_task.apply_async(kwargs={
+        "ids": payload.ids,
+        "data": data_str,
+        "categoria": categoria,
+        "status": payload.status,
+        "somente_sem_texto": payload.somente_sem_texto,
+        "usar_cache": payload.usar_cache,
+        "job_key": key,
+    }, queue="capture")
+
+    meta = {"event": "ENQUEUED", "task_id": job.id, "progress": 0, "state": "QUEUED",
+            "date": data_str, "category": categoria, "key": key}
+    save_meta(key, **meta)
+    publish(key, meta)
+
+    return {"task_id": job.id, "message": "captura agendada", "key": key}
+
+@router.get("/capturar-texto/lote/status")
+def get_captura_lote_status(key: str = Query(..., description="Chave retornada ao agendar a captura")):
+    if not key.startswith(CAPTURE_PREFIX):
+        raise HTTPException(status_code=422, detail="Chave de captura inválida.")
+    return {"key": key, "meta": get_meta(key) or {}}
+
+@router.get("/capturar-texto/estrategias/{dominio}")
+def get_estrategia_captura(dominio: str):
+    """
+    Estatísticas de captura do domínio (taxa de texto e latência por estratégia) usadas no roteamento.
+    """
+    try:
+        return domain_stats(dominio.lower().removeprefix("www."))
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Estatísticas indisponíveis: {e}")
+
 @router.put("/{id}", response_model=dict)
 def update_noticia(
     id: int,
@@ -378,12 +510,184 @@ def set_user_id(
         "texto_noticia": updated.TEXTO_NOTICIA,
     }
 
+@router.post("/extrair-nomes/lote", status_code=status.HTTP_202_ACCEPTED)
+def extrair_nomes_lote(payload: ExtracaoNomesLoteIn):
+    """
+    Agenda a extração de nomes (LLM) de várias notícias na fila "llm".
+    Os resultados ficam guardados e GET /extrair-nomes/{id} passa a responder sem chamar o modelo.
+    """
+    if payload.adiados:
+        payload.ids = listar_adiados(settings.LLM_BATCH_MAX_ITEMS)
+        payload.forcar = True
+        if not payload.ids:
+            return {"task_id": None, "message": "nenhuma notícia adiada", "key": None}
+
+    if not payload.ids and not payload.data and not payload.categoria:
+        raise HTTPException(status_code=422, detail="Informe `ids` ou um filtro de `data`/`categoria`.")
+
+    categoria = cat_prefix = None
+    if payload.categoria:
+        try:
+            abrev, cat_prefix, categoria = normalize_category(payload.categoria)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+
+    date_dir = payload.data.strftime("%Y%m%d") if payload.data else "ALL"
+    key = extraction_job_key(date_dir, cat_prefix, ids=payload.ids)
+
+    if not acquire_lock(key):
+        raise HTTPException(status_code=409, detail={
+            "message": "Extração já em andamento para estes filtros.",
+            "key": key, "state": "RUNNING",
+        })
+
+    data_str = payload.data.isoformat() if payload.data else None
+    job = extract_names_batch_task.apply_async(kwargs={
+        "ids": payload.ids,
+        "data": data_str,
+        "categoria": categoria,
+        "status": payload.status,
+        "forcar": payload.forcar,
+        "job_key": key,
+    }, queue="llm")
+
+    meta = {"event": "ENQUEUED", "task_id": job.id, "progress": 0, "state": "QUEUED",
+            "date": data_str, "category": categoria, "key": key}
+    save_meta(key, **meta)
+    publish(key, meta)
+
+    return {"task_id": job.id, "message": "extração agendada", "key": key}
+
+@router.get("/extrair-nomes/lote/status")
+def get_extracao_lote_status(key: str = Query(..., description="Chave retornada ao agendar a extração")):
+    if not key.startswith(EXTRACTION_PREFIX):
+        raise HTTPException(status_code=422, detail="Chave de extração inválida.")
+    return {"key": key, "meta": get_meta(key) or {}}
+
+@router.delete("/extrair-nomes/cache")
+def limpar_cache_extracao(modelo: Optional[str] = Query(None, description="Limpa só as entradas deste modelo")):
+    cache = get_llm_cache()
+    if cache is None:
+        return {"removidos": 0, "message": "cache de LLM desabilitado"}
+    try:
+        return {"removidos": cache.clear(modelo)}
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Falha ao limpar o cache de LLM: {e}")
+
+@router.delete("/extrair-nomes/{id}/cache")
+def invalidar_cache_extracao(
+        id: int,
+        noticia_service: NoticiaService = Depends(get_noticia_service)
+):
+    try:
+        return {"id": id, "removido": noticia_service.invalidar_cache_nomes(id)}
+    except Exception as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@router.get("/extrair-nomes/rotas/stats")
+def get_rotas_stats():
+    """Chamadas, latência média, custo e taxa de escalada por modelo do roteamento de extração."""
+    try:
+        return model_router.stats()
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Estatísticas indisponíveis: {e}")
+
+@router.get("/extrair-nomes/prescreen/stats")
+def get_prescreen_stats():
+    """
+    Quantos textos o pré-filtro local avaliou/pulou/adiou e o histograma de escores,
+    para calibrar LLM_PRESCREEN_THRESHOLD.
+    """
+    try:
+        return prescreen_stats()
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Estatísticas indisponíveis: {e}")
+
+@router.get("/extrair-nomes/{id}/prescreen")
+def get_prescreen_noticia(
+        id: int,
+        noticia_service: NoticiaService = Depends(get_noticia_service)
+):
+    try:
+        text, _ = noticia_service.texto_para_extracao(id)
+    except Exception as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    res = prescreen(text or "")
+    limiar = settings.LLM_PRESCREEN_THRESHOLD
+    return {"id": id, "limiar": limiar, "chama_modelo": res.score >= limiar, **asdict(res)}
+
+@router.get("/extrair-nomes/{id}/condensado")
+def get_texto_condensado(
+        id: int,
+        foco_nomes: Optional[bool] = Query(None, description="Padrão: LLM_CONDENSE_FOCO_NOMES"),
+        noticia_service: NoticiaService = Depends(get_noticia_service)
+):
+    """Prévia do texto que vai ao modelo e quantos tokens a condensação economiza."""
+    try:
+        text, fonte = noticia_service.texto_para_extracao(id)
+    except Exception as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    foco = settings.LLM_CONDENSE_FOCO_NOMES if foco_nomes is None else foco_nomes
+    res = condense(text or "", fonte, foco, settings.LLM_CONDENSE_CONTEXTO, noticia_service.model)
+    return {"id": id, "fonte": fonte, "tokens_antes": res.tokens_antes, "tokens_depois": res.tokens_depois,
+            "tokens_economizados": res.tokens_economizados, "removidos": res.removidos, "texto": res.texto}
+
+def _sse(evento: Dict[str, Any]) -> str:
+    return f"event: {evento['event']}\ndata: {json.dumps(evento, ensure_ascii=False, default=str)}\n\n"
+
+@router.get("/extrair-nomes/{id}/stream")
+async def extrair_nomes_stream(
+        id: int,
+        forcar: bool = Query(False, description="Ignora o pré-filtro local"),
+        noticia_service: NoticiaService = Depends(get_noticia_service)
+):
+    """
+    Server-Sent Events: cada pessoa física sai num evento `NOME` assim que o modelo a completa;
+    o evento `DONE` traz a lista final (mesclada e deduplicada).
+    """
+    try:
+        # lê o texto antes de abrir o stream: a sessão do banco não acompanha a resposta
+        text, fonte = await run_in_threadpool(noticia_service.texto_para_extracao, id)
+    except Exception as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    async def eventos():
+        if not text:
+            yield _sse({"event": "DONE", "nomes": []})
+            return
+        try:
+            async for evento in noticia_service.extrair_nomes_stream(text, id, forcar=forcar, fonte=fonte):
+                yield _sse(evento)
+        except Exception as e:
+            yield _sse({"event": "FAILED", "error": str(e)})
+
+    return StreamingResponse(eventos(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@router.post("/extrair-nomes/{id}/salvar")
+async def extrair_e_salvar_nomes(
+        id: int,
+        forcar: bool = Query(False, description="Ignora o pré-filtro local"),
+        noticia_service: NoticiaService = Depends(get_noticia_service)
+):
+    """
+    Extrai os nomes e já grava em TB_NOTICIA_RASPADA_NOME numa única transação.
+    Nomes já cadastrados na notícia (mesmo nome normalizado) não são duplicados.
+    """
+    try:
+        return await noticia_service.extrair_e_salvar_nomes(id, forcar=forcar)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/extrair-nomes/{id}")
-def extrair_nomes(
+async def extrair_nomes(
         id: int,
+        forcar: bool = Query(False, description="Ignora o pré-filtro local"),
         noticia_service: NoticiaService = Depends(get_noticia_service)
 ):
-    return noticia_service.extrair_nomes(id)
+    return await noticia_service.extrair_nomes(id, forcar=forcar)
 
 @router.put("/{id}/nomes/batch")
 def update_nomes_batch(
@@ -439,6 +743,17 @@ def get_por_reg_noticia(
 ):
     return noticia_service.get_por_reg_noticia(reg)
 
+@router.get("/{id:int}")
+def get_noticia(
+        id: int,
+        noticia_service: NoticiaService = Depends(get_noticia_service)
+):
+    """Notícia completa, com TEXTO_NOTICIA e nomes (complementa a listagem com `projecao=resumo`)."""
+    try:
+        return noticia_service.get_detalhe(id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
 @router.delete("/excluir-noticia/{id}")
 def excluir_noticia(
         id: int,
@@ -507,6 +822,9 @@ def list_noticias_por_data_categoria(
     limit: int = Query(10, ge=1),
     status: Optional[List[str]] = Query(["201-APPROVED", "203-PUBLISHED"], alias="status"),
     incluir_aux: bool = Query(True, description="Se True, anexa registros da tabela Auxiliar em aux_registros"),
+    cursor: Optional[str] = Query(None, description="Token de `next`/`previous` (paginação por chave)"),
+    contagem: str = Query("exato", pattern="^(exato|estimado)$", description="`estimado` usa as estatísticas do MySQL para o total"),
+    projecao: str = Query("completa", pattern="^(completa|resumo)$", description="`resumo`: só colunas da grade e QTD_NOMES"),
     noticia_service: NoticiaService = Depends(get_noticia_service),
     # current_user: UsuarioModel = Depends(get_current_user),
 ):
@@ -531,8 +849,6 @@ def list_noticias_por_data_categoria(
     if status and len(status) == 1 and "," in status[0]:
         status = [s.strip() for s in status[0].split(",") if s.strip()]
 
-    offset = (page - 1) * limit
-
     filters: Dict[str, Any] = {
         "REG_NOTICIA_RANGE": (lo, hi),
         "CATEGORIA": full_name,   # ✅ usa o nome canônico ("Fraude", "Crime", etc.)
@@ -540,31 +856,16 @@ def list_noticias_por_data_categoria(
     if status:
         filters["STATUS"] = status
 
-    noticias, total_count = noticia_service.list(
-        offset=offset,
-        limit=limit,
-        filters=filters,
-        incluir_aux=incluir_aux,  # pode ligar/desligar pelo query param
-    )
-
-    total_pages = (total_count + limit - 1) // limit
+    # incluir_aux pode ligar/desligar pelo query param
+    resultado = _paginar(request, noticia_service, page, limit, cursor, filters,
+                         incluir_aux=incluir_aux, contagem=contagem, projecao=projecao)
 
     # regra de exibição: PUBLISHED sem aux_registros => mostrar como APPROVED
-    for i in noticias:
+    for i in resultado["noticias"]:
         if i.STATUS == '203-PUBLISHED' and not getattr(i, 'aux_registros', []):
             i.STATUS = '201-APPROVED'
 
-    next_url = str(request.url.include_query_params(page=page + 1, limit=limit)) if page < total_pages else None
-    prev_url = str(request.url.include_query_params(page=page - 1, limit=limit)) if page > 1 else None
-
-    return {
-        "total_count": total_count,
-        "total_pages": total_pages,
-        "page": page,
-        "next": next_url,
-        "previous": prev_url,
-        "noticias": noticias,
-    }
+    return resultado
 
 @router.get("/transfer/active")
 def get_active_transfers(
@@ -621,6 +922,9 @@ def _list_active_jobs(date: Optional[str]=None, category: Optional[str]=None) ->
     else:
         # scan seguro (evita KEYS *)
         for k in r_sync.scan_iter(f"{META_PREFIX}*"):
+            # jobs de captura/extração em lote usam o mesmo canal, mas não são publicações
+            if k.startswith((f"{META_PREFIX}{CAPTURE_PREFIX}", f"{META_PREFIX}{EXTRACTION_PREFIX}")):
+                continue
             keys.append(k)
 
     active: List[Dict[str, Any]] = []
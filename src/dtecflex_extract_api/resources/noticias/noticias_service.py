@@ -1,22 +1,42 @@
+import asyncio
 import json
 import os
 import uuid
 import logging
+import time
+from decimal import Decimal, InvalidOperation
 from collections import defaultdict
 from dtecflex_extract_api.resources.noticias.schemas.noticia_create import NoticiaCreate
 from dtecflex_extract_api.resources.noticias.schemas.noticia_nome_update import NoticiaNomePartialUpdate
-import trafilatura
+import httpx
 import requests
 from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple, Union
 from datetime import datetime
-from sqlalchemy import and_, case, text, func
+from types import SimpleNamespace
+from sqlalchemy import Numeric, and_, case, cast, insert, or_, select, text, func
+from sqlalchemy.dialects.mysql import match
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload
 from src.dtecflex_extract_api.resources.noticias.entities.noticia_raspada import NoticiaRaspadaModel, \
     NoticiaRaspadaNomeModel
-from openai import OpenAI
+from src.dtecflex_extract_api.config.celery import settings
+from src.dtecflex_extract_api.services.browser_pool import get_browser_pool
+from src.dtecflex_extract_api.services import count_cache
+from src.dtecflex_extract_api.services.extraction_pool import extract_text
+from src.dtecflex_extract_api.services.fetch_strategy import choose_strategies, dominio_de, record_attempt
+from src.dtecflex_extract_api.services.html_cache import get_html_cache
+from src.dtecflex_extract_api.services.page_render import build_render_job
+from src.dtecflex_extract_api.services.llm_cache import get_llm_cache
+from src.dtecflex_extract_api.services.llm_client import chat_completion, chat_completion_stream
+from src.dtecflex_extract_api.services import llm_telemetry, model_router
+from src.dtecflex_extract_api.services.name_prescreen import INDICADORES_ORGANIZACAO, abaixo_do_limiar, avaliar
+from src.dtecflex_extract_api.services.nomes_merge import merge_nomes, normalizar_nome
+from src.dtecflex_extract_api.services.text_chunker import chunk_text, count_tokens
+from src.dtecflex_extract_api.services.text_condenser import condense
+from src.dtecflex_extract_api.services.http_fetcher import FetchRejected, FetchResult, get_http_fetcher
+from src.dtecflex_extract_api.utils import metrics
+from src.dtecflex_extract_api.utils.json_stream import JsonArrayStream
 import re
 import hashlib
 from xml.sax.saxutils import escape
@@ -117,7 +137,6 @@ class NoticiaService:
             'Chrome/112.0.0.0 Mobile Safari/537.36'
         )
         self.timeout = timeout  # em segundos
-        self.client = OpenAI()
         self.notice_categoria = notice_categoria
         self.model = model
 
@@ -126,6 +145,19 @@ class NoticiaService:
         else:
             self.prompt = self.prompt_not_ambiental
 
+    def get_detalhe(self, id: int) -> NoticiaRaspadaModel:
+        """Notícia completa (TEXTO_NOTICIA e nomes), para a tela de detalhe; a listagem pode vir só com o resumo."""
+        noticia = (
+            self.session
+                .query(NoticiaRaspadaModel)
+                .options(selectinload(NoticiaRaspadaModel.nomes_raspados))
+                .filter(NoticiaRaspadaModel.ID == id)
+                .first()
+        )
+        if not noticia:
+            raise ValueError("Notícia não encontrada.")
+        return noticia
+
     def get_by_id(self, id: int):
         noticia = (
             self.session
@@ -161,6 +193,102 @@ class NoticiaService:
         self.session.refresh(obj)
         return obj
 
+    # tamanho das colunas de texto de TB_NOTICIA_RASPADA_NOME (a resposta do modelo não respeita)
+    _LIMITES_NOME = {
+        "NOME": 100, "CPF": 14, "APELIDO": 50, "OPERACAO": 50, "ATIVIDADE": 140,
+        "ENVOLVIMENTO": 500, "TIPO_SUSPEITA": 20,
+    }
+
+    def salvar_nomes_extraidos(self, noticia_id: int, nomes: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Grava as pessoas extraídas pelo modelo numa única transação, com um INSERT de várias linhas.
+        Nomes já cadastrados na notícia (comparados por normalizar_nome) são ignorados,
+        então repetir a extração não duplica registros.
+        """
+        s = self.session
+        try:
+            # trava a notícia: duas gravações simultâneas não inserem o mesmo nome duas vezes
+            noticia = (
+                s.query(NoticiaRaspadaModel.ID)
+                 .filter(NoticiaRaspadaModel.ID == noticia_id)
+                 .with_for_update()
+                 .first()
+            )
+            if not noticia:
+                raise ValueError("Notícia não encontrada.")
+
+            existentes = {
+                normalizar_nome(row.NOME)
+                for row in s.query(NoticiaRaspadaNomeModel.NOME).filter(NoticiaRaspadaNomeModel.NOTICIA_ID == noticia_id)
+            }
+
+            linhas, ignorados = [], []
+            for item in nomes:
+                chave = normalizar_nome(item.get("NOME") or "")
+                if not chave or chave in existentes:
+                    ignorados.append(item.get("NOME"))
+                    continue
+                existentes.add(chave)
+                linhas.append(self._linha_nome_extraido(noticia_id, item))
+
+            if linhas:
+                s.execute(insert(NoticiaRaspadaNomeModel.__table__).values(linhas))
+            s.commit()
+        except Exception:
+            s.rollback()
+            raise
+
+        logger.info(f"Notícia {noticia_id}: {len(linhas)} nome(s) gravado(s), {len(ignorados)} já existente(s)")
+        return {"inserted": len(linhas), "skipped": ignorados, "total": len(nomes)}
+
+    def _linha_nome_extraido(self, noticia_id: int, item: Dict[str, Any]) -> Dict[str, Any]:
+        def texto(campo: str) -> Optional[str]:
+            v = item.get(campo)
+            if v is None or not str(v).strip():
+                return None
+            return str(v).strip()[:self._LIMITES_NOME.get(campo, 500)]
+
+        idade = item.get("IDADE")
+        try:
+            idade = int(idade) if idade not in (None, "") else None
+        except (TypeError, ValueError):
+            idade = None
+
+        sexo = (texto("SEXO") or "")[:1].upper() or None
+        return {
+            "NOTICIA_ID": noticia_id,
+            "NOME": texto("NOME"),
+            "CPF": texto("CPF"),
+            "APELIDO": texto("APELIDO"),
+            "NOME_CPF": texto("NOME_CPF"),
+            "OPERACAO": texto("OPERACAO"),
+            "SEXO": sexo if sexo in ("M", "F") else None,
+            "PESSOA": (texto("PESSOA") or "F")[:2],
+            "IDADE": idade,
+            "ATIVIDADE": texto("ATIVIDADE"),
+            "ENVOLVIMENTO": texto("ENVOLVIMENTO"),
+            "TIPO_SUSPEITA": texto("TIPO_SUSPEITA"),
+            "FLG_PESSOA_PUBLICA": self._bool_to_flag(item.get("FLG_PESSOA_PUBLICA")),
+            "ANIVERSARIO": self._parse_data(item.get("ANIVERSARIO")),
+            "INDICADOR_PPE": self._bool_to_flag(item.get("INDICADOR_PPE")),
+        }
+
+    def _parse_data(self, v: Any):
+        if not v or not isinstance(v, str):
+            return None
+        for formato in ("%Y-%m-%d", "%d/%m/%Y"):
+            try:
+                return datetime.strptime(v.strip()[:10], formato).date()
+            except ValueError:
+                continue
+        return None
+
+    async def extrair_e_salvar_nomes(self, id, forcar: bool = False) -> Dict[str, Any]:
+        """extrair_nomes + salvar_nomes_extraidos: evita um POST /noticias/nome por pessoa."""
+        nomes = await self.extrair_nomes(id, forcar=forcar)
+        resultado = await asyncio.to_thread(self.salvar_nomes_extraidos, id, nomes)
+        return {"nomes": nomes, **resultado}
+
     def delete_nome(self, nome_id: int) -> None:
         obj = self.session.query(NoticiaRaspadaNomeModel).filter_by(ID=nome_id).first()
         if not obj:
@@ -195,6 +323,7 @@ class NoticiaService:
         try:
             self.session.add(entity)
             self.session.commit()
+            count_cache.invalidar()
             self.session.refresh(entity)
             return entity
         except IntegrityError as e:
@@ -207,78 +336,292 @@ class NoticiaService:
         limit: int = 10,
         filters: Optional[Dict[str, Any]] = None,
         incluir_aux: bool = False,
+        projecao: str = "completa",
+        total: Optional[int] = None,
     ) -> Tuple[List[NoticiaRaspadaModel], int]:
-        query = (
-            self.session.query(NoticiaRaspadaModel)
-            .options(joinedload(NoticiaRaspadaModel.nomes_raspados))
+        """`total` já conhecido (ex.: contado pelo chamador) evita uma segunda contagem."""
+        query = self._query_listagem(filters, projecao)
+        relevancia = self._relevancia_ordem(filters)
+        if relevancia is not None:
+            query = query.add_columns(relevancia.label("RELEVANCIA"))
+
+        total_count = total if total is not None else self.contar(filters)[0]
+        noticias = self._materializar(
+            query.order_by(*self._ordenacao(relevancia, "n"))
+                 .offset(offset)
+                 .limit(limit)
+                 .all(),
+            projecao,
+            relevancia is not None,
         )
 
-        if filters:
-            filter_conditions = []
-
-            if 'STATUS' in filters and filters['STATUS']:
-                filter_conditions.append(NoticiaRaspadaModel.STATUS.in_(filters['STATUS']))
-
-            if 'DT_APROVACAO' in filters:
-                data_inicio, data_fim = filters['DT_APROVACAO']
-                if data_inicio and data_fim:
-                    filter_conditions.append(NoticiaRaspadaModel.DT_APROVACAO.between(data_inicio, data_fim))
-                elif data_inicio:
-                    filter_conditions.append(NoticiaRaspadaModel.DT_APROVACAO >= data_inicio)
-                elif data_fim:
-                    filter_conditions.append(NoticiaRaspadaModel.DT_APROVACAO <= data_fim)
-
-            if 'DATA_PUBLICACAO' in filters:
-                data_inicio, data_fim = filters['DATA_PUBLICACAO']
-                if data_inicio and data_fim:
-                    filter_conditions.append(NoticiaRaspadaModel.DATA_PUBLICACAO.between(data_inicio, data_fim))
-                elif data_inicio:
-                    filter_conditions.append(NoticiaRaspadaModel.DATA_PUBLICACAO >= data_inicio)
-                elif data_fim:
-                    filter_conditions.append(NoticiaRaspadaModel.DATA_PUBLICACAO <= data_fim)
-
-            if 'FONTE' in filters and filters['FONTE']:
-                filter_conditions.append(NoticiaRaspadaModel.FONTE.ilike(f"%{filters['FONTE']}%"))
-
-            if 'CATEGORIA' in filters and filters['CATEGORIA']:
-                filter_conditions.append(NoticiaRaspadaModel.CATEGORIA == filters['CATEGORIA'])
-
-            if 'SUBCATEGORIA' in filters and filters['SUBCATEGORIA']:
-                subcategorias = " ".join(filters['SUBCATEGORIA'])
-                query = query.filter(
-                    text("MATCH(QUERY) AGAINST (:subcategorias IN BOOLEAN MODE)")
-                ).params(subcategorias=subcategorias)
-
-            if 'REG_NOTICIA_RANGE' in filters and filters['REG_NOTICIA_RANGE']:
-                lo, hi = filters['REG_NOTICIA_RANGE']
-                query = query.filter(
-                    NoticiaRaspadaModel.REG_NOTICIA >= lo,
-                    NoticiaRaspadaModel.REG_NOTICIA < hi
-                )
+        if incluir_aux and noticias:
+            self._anexar_aux(noticias)
 
-            if 'USUARIO_ID' in filters and filters['USUARIO_ID']:
-                filter_conditions.append(NoticiaRaspadaModel.ID_USUARIO == filters['USUARIO_ID'])
+        return noticias, total_count
 
-            if filter_conditions:
-                query = query.filter(and_(*filter_conditions))
+    def list_keyset(
+        self,
+        limit: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        cursor: Optional[Dict[str, Any]] = None,
+        incluir_aux: bool = False,
+        projecao: str = "completa",
+    ) -> Tuple[List[NoticiaRaspadaModel], Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        Paginação por chave (ID DESC): em vez de OFFSET, filtra a partir do último ID visto,
+        então qualquer página custa o mesmo que a primeira.
+        `cursor` = {"id": <ID de referência>, "d": "n" (próxima) | "p" (anterior)}.
+        Com busca textual (filters["BUSCA"]) a ordem é (RELEVANCIA DESC, ID DESC) e o
+        cursor leva também a relevância da linha de referência em "s" (decimal com 6 casas,
+        em string). Como o MySQL recalcula o MATCH a cada consulta, a estabilidade entre
+        páginas vale enquanto o índice FULLTEXT não muda; inserções/edições entre uma página
+        e outra podem repetir ou pular linhas na fronteira.
+        Retorna (notícias, cursor da próxima página, cursor da anterior); o total sai de `contar`.
+        """
+        query = self._query_listagem(filters, projecao)
+        relevancia = self._relevancia_ordem(filters)
+        if relevancia is not None:
+            query = query.add_columns(relevancia.label("RELEVANCIA"))
+
+        direcao = (cursor or {}).get("d", "n")
+        ref = (cursor or {}).get("id")
+        if ref is not None:
+            ref = int(ref)
+            score = (cursor or {}).get("s")
+            id_ref = NoticiaRaspadaModel.ID > ref if direcao == "p" else NoticiaRaspadaModel.ID < ref
+            if relevancia is not None:
+                # cursor de listagem sem busca: só o ID não posiciona na ordem por relevância
+                if score is None:
+                    raise ValueError("cursor inválido")
+                try:
+                    score = Decimal(str(score))
+                except InvalidOperation as e:
+                    raise ValueError("cursor inválido") from e
+                depois = relevancia > score if direcao == "p" else relevancia < score
+                query = query.filter(or_(depois, and_(relevancia == score, id_ref)))
+            else:
+                query = query.filter(id_ref)
 
-        total_count = query.count()
-        noticias = (
-            query.order_by(NoticiaRaspadaModel.ID.desc())
-                 .offset(offset)
-                 .limit(limit)
-                 .all()
+        # uma linha a mais só para saber se existe outra página nessa direção
+        noticias = self._materializar(
+            query.order_by(*self._ordenacao(relevancia, direcao)).limit(limit + 1).all(),
+            projecao,
+            relevancia is not None,
         )
+        tem_mais = len(noticias) > limit
+        noticias = noticias[:limit]
+        if direcao == "p":
+            noticias.reverse()
+
+        proximo = anterior = None
+        if noticias:
+            if direcao == "p":
+                anterior = self.cursor_de(noticias[0], "p") if tem_mais else None
+                proximo = self.cursor_de(noticias[-1], "n")
+            else:
+                proximo = self.cursor_de(noticias[-1], "n") if tem_mais else None
+                anterior = self.cursor_de(noticias[0], "p") if ref is not None else None
 
         if incluir_aux and noticias:
-            registros = [n.REG_NOTICIA for n in noticias if getattr(n, "REG_NOTICIA", None)]
-            aux_por_reg = self._fetch_aux_by_registros(registros)
+            self._anexar_aux(noticias)
 
-            for n in noticias:
-                setattr(n, "aux_registros", aux_por_reg.get(n.REG_NOTICIA, []))
+        return noticias, proximo, anterior
+
+    def contar(self, filters: Optional[Dict[str, Any]] = None, modo: str = "exato") -> Tuple[int, bool]:
+        """
+        Total da listagem filtrada: COUNT só sobre TB_NOTICIA_RASPADA (sem o joinedload dos nomes),
+        guardado em Redis por assinatura dos filtros.
+        `modo="estimado"` responde pelas estatísticas do MySQL (EXPLAIN / information_schema)
+        quando a estimativa passa de NOTICIAS_COUNT_ESTIMATE_MIN; abaixo disso conta exato.
+        Retorna (total, estimado).
+        """
+        cached = count_cache.get(filters)
+        if cached is not None:
+            return cached, False
+
+        if modo == "estimado":
+            estimativa = count_cache.get(filters, "estimado")
+            if estimativa is None:
+                estimativa = self._estimar_contagem(filters)
+                if estimativa is not None and estimativa >= settings.NOTICIAS_COUNT_ESTIMATE_MIN:
+                    count_cache.put(filters, estimativa, "estimado")
+            if estimativa is not None and estimativa >= settings.NOTICIAS_COUNT_ESTIMATE_MIN:
+                return estimativa, True
+
+        total = self._aplicar_filtros(
+            self.session.query(func.count(NoticiaRaspadaModel.ID)), filters
+        ).scalar() or 0
+        count_cache.put(filters, total)
+        return total, False
+
+    def _estimar_contagem(self, filters: Optional[Dict[str, Any]]) -> Optional[int]:
+        try:
+            if not filters:
+                return self.session.execute(
+                    text(
+                        "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :tabela"
+                    ),
+                    {"tabela": NoticiaRaspadaModel.__tablename__},
+                ).scalar()
+
+            if filters.get('SUBCATEGORIA'):
+                # os parâmetros do MATCH entram via .params() e não aparecem no statement compilado
+                return None
+
+            query = self._aplicar_filtros(self.session.query(NoticiaRaspadaModel.ID), filters)
+            compilado = query.statement.compile(dialect=self.session.get_bind().dialect)
+            params = (
+                tuple(compilado.params[k] for k in compilado.positiontup)
+                if compilado.positional else compilado.params
+            )
+            linhas = self.session.connection().exec_driver_sql(f"EXPLAIN {compilado}", params).mappings().all()
+            return max(int(linha.get("rows") or 0) for linha in linhas) if linhas else None
+        except Exception as e:
+            logger.debug(f"Estimativa de contagem indisponível: {e}")
+            return None
+
+    # colunas da projeção "resumo": o que a grade mostra, sem TEXTO_NOTICIA nem os nomes
+    _COLUNAS_RESUMO = (
+        "ID", "LINK_ID", "URL", "FONTE", "TITULO", "CATEGORIA", "STATUS", "REG_NOTICIA", "REGIAO", "UF",
+        "DATA_PUBLICACAO", "DT_RASPAGEM", "DT_APROVACAO", "ID_USUARIO",
+    )
+
+    def _query_listagem(self, filters: Optional[Dict[str, Any]], projecao: str):
+        if projecao != "resumo":
+            query = (
+                self.session.query(NoticiaRaspadaModel)
+                .options(joinedload(NoticiaRaspadaModel.nomes_raspados))
+            )
+            return self._aplicar_filtros(query, filters)
+
+        # contagem por subconsulta correlacionada: uma linha por notícia, sem JOIN com os nomes
+        qtd_nomes = (
+            select(func.count(NoticiaRaspadaNomeModel.ID))
+            .where(NoticiaRaspadaNomeModel.NOTICIA_ID == NoticiaRaspadaModel.ID)
+            .correlate(NoticiaRaspadaModel)
+            .scalar_subquery()
+            .label("QTD_NOMES")
+        )
+        colunas = [getattr(NoticiaRaspadaModel, c) for c in self._COLUNAS_RESUMO]
+        return self._aplicar_filtros(self.session.query(*colunas, qtd_nomes), filters)
+
+    def _materializar(self, linhas: list, projecao: str, com_relevancia: bool = False) -> list:
+        if projecao == "resumo":
+            # objetos simples com os mesmos atributos do modelo (STATUS, REG_NOTICIA...) para o resto do fluxo
+            return [SimpleNamespace(**linha._asdict()) for linha in linhas]
+        if not com_relevancia:
+            return linhas
+        noticias = []
+        for noticia, relevancia in linhas:
+            noticia.RELEVANCIA = relevancia
+            noticias.append(noticia)
+        return noticias
+
+    def _relevancia(self, filters: Optional[Dict[str, Any]]):
+        """MATCH(TITULO, TEXTO_NOTICIA) AGAINST(:busca): usa o índice FULLTEXT da migração 0004."""
+        busca = ((filters or {}).get('BUSCA') or "").strip()
+        if not busca:
+            return None
+        return match(NoticiaRaspadaModel.TITULO, NoticiaRaspadaModel.TEXTO_NOTICIA, against=busca) \
+            .in_natural_language_mode()
+
+    def _relevancia_ordem(self, filters: Optional[Dict[str, Any]]):
+        """
+        Relevância usada para ordenar e paginar: arredondada para DECIMAL(20,6), para que a
+        igualdade com o valor guardado no cursor seja exata (um DOUBLE que passou por JSON
+        não volta bit a bit igual ao recalculado).
+        """
+        relevancia = self._relevancia(filters)
+        if relevancia is None:
+            return None
+        return cast(func.round(relevancia, 6), Numeric(20, 6))
+
+    def _ordenacao(self, relevancia, direcao: str) -> list:
+        if direcao == "p":
+            ordem = [NoticiaRaspadaModel.ID.asc()]
+            return [relevancia.asc()] + ordem if relevancia is not None else ordem
+        ordem = [NoticiaRaspadaModel.ID.desc()]
+        return [relevancia.desc()] + ordem if relevancia is not None else ordem
+
+    def cursor_de(self, noticia, direcao: str) -> Dict[str, Any]:
+        """Cursor de paginação a partir de uma linha da listagem (inclui a relevância, se houver busca)."""
+        cursor = {"id": noticia.ID, "d": direcao}
+        relevancia = getattr(noticia, "RELEVANCIA", None)
+        if relevancia is not None:
+            cursor["s"] = str(relevancia)
+        return cursor
+
+    def _anexar_aux(self, noticias: List[NoticiaRaspadaModel]) -> None:
+        registros = [n.REG_NOTICIA for n in noticias if getattr(n, "REG_NOTICIA", None)]
+        aux_por_reg = self._fetch_aux_by_registros(registros)
+
+        for n in noticias:
+            setattr(n, "aux_registros", aux_por_reg.get(n.REG_NOTICIA, []))
+
+    # colunas editáveis por update() que algum filtro de _aplicar_filtros usa:
+    # mudar qualquer uma delas pode alterar os totais guardados em count_cache
+    _CAMPOS_FILTRADOS = {"STATUS", "CATEGORIA", "FONTE", "ID_USUARIO", "REG_NOTICIA", "TITULO", "TEXTO_NOTICIA"}
+
+    def _aplicar_filtros(self, query, filters: Optional[Dict[str, Any]]):
+        if not filters:
+            return query
+
+        filter_conditions = []
+
+        if 'STATUS' in filters and filters['STATUS']:
+            filter_conditions.append(NoticiaRaspadaModel.STATUS.in_(filters['STATUS']))
+
+        if 'DT_APROVACAO' in filters:
+            data_inicio, data_fim = filters['DT_APROVACAO']
+            if data_inicio and data_fim:
+                filter_conditions.append(NoticiaRaspadaModel.DT_APROVACAO.between(data_inicio, data_fim))
+            elif data_inicio:
+                filter_conditions.append(NoticiaRaspadaModel.DT_APROVACAO >= data_inicio)
+            elif data_fim:
+                filter_conditions.append(NoticiaRaspadaModel.DT_APROVACAO <= data_fim)
+
+        if 'DATA_PUBLICACAO' in filters:
+            data_inicio, data_fim = filters['DATA_PUBLICACAO']
+            if data_inicio and data_fim:
+                filter_conditions.append(NoticiaRaspadaModel.DATA_PUBLICACAO.between(data_inicio, data_fim))
+            elif data_inicio:
+                filter_conditions.append(NoticiaRaspadaModel.DATA_PUBLICACAO >= data_inicio)
+            elif data_fim:
+                filter_conditions.append(NoticiaRaspadaModel.DATA_PUBLICACAO <= data_fim)
+
+        if 'FONTE' in filters and filters['FONTE']:
+            filter_conditions.append(NoticiaRaspadaModel.FONTE.ilike(f"%{filters['FONTE']}%"))
+
+        if 'CATEGORIA' in filters and filters['CATEGORIA']:
+            filter_conditions.append(NoticiaRaspadaModel.CATEGORIA == filters['CATEGORIA'])
+
+        if 'SUBCATEGORIA' in filters and filters['SUBCATEGORIA']:
+            subcategorias = " ".join(filters['SUBCATEGORIA'])
+            query = query.filter(
+                text("MATCH(QUERY) AGAINST (:subcategorias IN BOOLEAN MODE)")
+            ).params(subcategorias=subcategorias)
+
+        if 'REG_NOTICIA_RANGE' in filters and filters['REG_NOTICIA_RANGE']:
+            lo, hi = filters['REG_NOTICIA_RANGE']
+            query = query.filter(
+                NoticiaRaspadaModel.REG_NOTICIA >= lo,
+                NoticiaRaspadaModel.REG_NOTICIA < hi
+            )
+
+        if 'USUARIO_ID' in filters and filters['USUARIO_ID']:
+            filter_conditions.append(NoticiaRaspadaModel.ID_USUARIO == filters['USUARIO_ID'])
+
+        relevancia = self._relevancia(filters)
+        if relevancia is not None:
+            filter_conditions.append(relevancia)
+
+        if filter_conditions:
+            query = query.filter(and_(*filter_conditions))
+
+        return query
 
-        return noticias, total_count
-    
     def update(self, id: int, data: Dict[str, Any]) -> NoticiaRaspadaModel:
         noticia = (
             self.session
@@ -301,15 +644,20 @@ class NoticiaService:
             "status": "STATUS",
         }
 
+        muda_contagem = False
         for campo_payload, valor in data.items():
             if valor is None:
                 continue
             attr = mapping.get(campo_payload)
             if not attr:
                 continue
+            if attr in self._CAMPOS_FILTRADOS and getattr(noticia, attr) != valor:
+                muda_contagem = True
             setattr(noticia, attr, valor)
 
         self.session.commit()
+        if muda_contagem:
+            count_cache.invalidar()
         self.session.refresh(noticia)
         return noticia
 
@@ -447,6 +795,7 @@ class NoticiaService:
                     )
                 )
                 self.session.commit()
+                count_cache.invalidar()
             except Exception:
                 self.session.rollback()
                 raise
@@ -472,6 +821,8 @@ class NoticiaService:
             noticia.TEXTO_NOTICIA = text
 
             self.session.commit()
+            # o texto entra na busca (filters["BUSCA"])
+            count_cache.invalidar()
 
             self.session.refresh(noticia)
 
@@ -482,6 +833,96 @@ class NoticiaService:
             print(f"Erro ao atualizar texto da notícia: {e}")
             raise
 
+    def update_texto_por_id(self, id: int, text: str) -> None:
+        try:
+            atualizadas = (
+                self.session.query(NoticiaRaspadaModel)
+                .filter(NoticiaRaspadaModel.ID == id)
+                .update({NoticiaRaspadaModel.TEXTO_NOTICIA: text}, synchronize_session=False)
+            )
+            if not atualizadas:
+                raise Exception(f"Notícia com ID {id} não encontrada")
+            self.session.commit()
+            count_cache.invalidar()
+        except Exception:
+            self.session.rollback()
+            raise
+
+    def _filtrar_alvos_lote(
+        self,
+        query,
+        ids: Optional[List[int]] = None,
+        data_inicio: Optional[datetime] = None,
+        data_fim: Optional[datetime] = None,
+        categoria: Optional[str] = None,
+        status: Optional[List[str]] = None,
+    ):
+        if ids:
+            query = query.filter(NoticiaRaspadaModel.ID.in_(ids))
+        if data_inicio:
+            query = query.filter(NoticiaRaspadaModel.DATA_PUBLICACAO >= data_inicio)
+        if data_fim:
+            query = query.filter(NoticiaRaspadaModel.DATA_PUBLICACAO <= data_fim)
+        if categoria:
+            query = query.filter(NoticiaRaspadaModel.CATEGORIA == categoria)
+        if status:
+            query = query.filter(NoticiaRaspadaModel.STATUS.in_(status))
+        return query
+
+    def listar_alvos_captura(
+        self,
+        ids: Optional[List[int]] = None,
+        data_inicio: Optional[datetime] = None,
+        data_fim: Optional[datetime] = None,
+        categoria: Optional[str] = None,
+        status: Optional[List[str]] = None,
+        somente_sem_texto: bool = False,
+        limite: Optional[int] = None,
+    ) -> List[Tuple[int, str]]:
+        """
+        Retorna (ID, URL) das notícias a capturar, por lista de IDs ou por filtro de data/categoria.
+        """
+        query = self._filtrar_alvos_lote(
+            self.session.query(NoticiaRaspadaModel.ID, NoticiaRaspadaModel.URL),
+            ids, data_inicio, data_fim, categoria, status,
+        )
+        if somente_sem_texto:
+            query = query.filter(
+                (NoticiaRaspadaModel.TEXTO_NOTICIA.is_(None)) | (NoticiaRaspadaModel.TEXTO_NOTICIA == "")
+            )
+
+        query = query.order_by(NoticiaRaspadaModel.ID.desc())
+        if limite:
+            query = query.limit(limite)
+
+        return [(row.ID, row.URL) for row in query.all()]
+
+    def listar_alvos_extracao(
+        self,
+        ids: Optional[List[int]] = None,
+        data_inicio: Optional[datetime] = None,
+        data_fim: Optional[datetime] = None,
+        categoria: Optional[str] = None,
+        status: Optional[List[str]] = None,
+        limite: Optional[int] = None,
+    ) -> List[Tuple[int, str, str]]:
+        """
+        Retorna (ID, TEXTO_NOTICIA, FONTE) das notícias com texto capturado, para extração de nomes em lote.
+        """
+        query = self._filtrar_alvos_lote(
+            self.session.query(NoticiaRaspadaModel.ID, NoticiaRaspadaModel.TEXTO_NOTICIA, NoticiaRaspadaModel.FONTE),
+            ids, data_inicio, data_fim, categoria, status,
+        ).filter(
+            NoticiaRaspadaModel.TEXTO_NOTICIA.isnot(None),
+            NoticiaRaspadaModel.TEXTO_NOTICIA != "",
+        )
+
+        query = query.order_by(NoticiaRaspadaModel.ID.desc())
+        if limite:
+            query = query.limit(limite)
+
+        return [(row.ID, row.TEXTO_NOTICIA, row.FONTE) for row in query.all()]
+
     def delete_by_id(self, id: str) -> None:
         noticia = (
             self.session
@@ -493,19 +934,44 @@ class NoticiaService:
             raise Exception(f"Notícia com URL {id} não encontrada")
         self.session.delete(noticia)
         self.session.commit()
+        count_cache.invalidar()
+
+    async def fetch_and_extract_text(self, url: str, usar_cache: bool = True) -> str:
+        cache = get_html_cache() if usar_cache else None
+        cached = await asyncio.to_thread(cache.get, url) if cache else None
+        if cached and cached.is_fresh(settings.HTML_CACHE_TTL):
+            return await extract_text(cached.html)
+
+        # a ordem das estratégias vem do histórico do domínio (portais JS vão direto ao Playwright)
+        dominio = dominio_de(url)
+        for estrategia in await choose_strategies(dominio):
+            inicio = time.perf_counter()
+            try:
+                html = await self._fetch(estrategia, url, cache, cached)
+            except FetchRejected as e:
+                # PDF, binário ou página gigante: nem adianta tentar renderizar
+                logger.warning(f"Download abandonado: {e}")
+                await record_attempt(dominio, estrategia, ok=False, com_texto=False,
+                                     latencia=time.perf_counter() - inicio)
+                break
+            latencia = time.perf_counter() - inicio
+            if not html:
+                await record_attempt(dominio, estrategia, ok=False, com_texto=False, latencia=latencia)
+                continue
 
-    def fetch_and_extract_text(self, url: str) -> str:
-        html = self._fetch(url)
-        if not html:
-            return ""
-        text = trafilatura.extract(html, include_comments=False)
-        return text or ""
+            # trafilatura roda no pool de processos para não segurar o GIL do worker da API
+            text = await extract_text(html)
+            await record_attempt(dominio, estrategia, ok=True, com_texto=bool(text), latencia=latencia)
+            if text:
+                return text
 
-    def extrair_nomes(self, id) -> list:
-        """
-        Extrai nomes de pessoas físicas de uma notícia usando GPT.
-        Retorna apenas entidades classificadas como pessoa física (PESSOA == 'F').
-        """
+        if cached:
+            # origem indisponível: melhor a cópia vencida do que nada
+            return await extract_text(cached.html)
+        return ""
+
+    def texto_para_extracao(self, id) -> Tuple[Optional[str], Optional[str]]:
+        """(TEXTO_NOTICIA, FONTE) da notícia; texto None se vazio."""
         # Corrigido: verificar noticia ANTES de acessar seus atributos
         noticia = (
             self.session
@@ -521,80 +987,476 @@ class NoticiaService:
         text = noticia.TEXTO_NOTICIA
         if not text or not text.strip():
             logger.warning(f"Notícia {id} possui texto vazio ou None")
+            return None, noticia.FONTE
+        return text, noticia.FONTE
+
+    async def extrair_nomes(self, id, forcar: bool = False) -> list:
+        """
+        Extrai nomes de pessoas físicas de uma notícia usando GPT.
+        Retorna apenas entidades classificadas como pessoa física (PESSOA == 'F').
+        Respostas repetidas (mesmo modelo, prompt e texto) saem do cache de LLM, sem custo de tokens.
+        """
+        text, fonte = await asyncio.to_thread(self.texto_para_extracao, id)
+        if not text:
             return []
 
         try:
-            artigo = f"<artigo>\n{text}\n</artigo>"
-            logger.info(f"Iniciando extração de nomes para notícia {id} (texto com {len(text)} caracteres)")
-            
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": self.prompt},
-                    {"role": "user", "content": artigo}
-                ]
-            )
-            
-            resposta = response.choices[0].message.content.strip()
-            logger.debug(f"Resposta GPT recebida (primeiros 500 chars): {resposta[:500]}")
+            return await self.extrair_nomes_do_texto(text, id, forcar=forcar, fonte=fonte) or []
+        except Exception as e:
+            logger.error(f"Erro ao extrair nomes da notícia {id}: {e}", exc_info=True)
+            return []
 
-            # Estratégias múltiplas para extrair JSON da resposta
-            json_str = self._extrair_json_da_resposta(resposta)
-            
-            if not json_str:
-                logger.warning(f"Não foi possível extrair JSON da resposta GPT para notícia {id}")
-                return []
+    def invalidar_cache_nomes(self, id) -> bool:
+        """Remove do cache de LLM a extração do texto atual da notícia (qualquer um dos prompts)."""
+        noticia = self.get_by_id(id)
+        cache = get_llm_cache()
+        if cache is None or not noticia.TEXTO_NOTICIA:
+            return False
+        removido = False
+        modelos = {self.model, settings.LLM_MODEL_ECONOMICO} - {""}
+        for modelo in modelos:
+            for prompt in (self.prompt_not_ambiental, self.prompt_is_ambiental):
+                removido = cache.invalidate(modelo, prompt, noticia.TEXTO_NOTICIA) or removido
+        return removido
+
+    def nomes_em_cache(self, cache, text: str) -> Optional[list]:
+        """
+        Resultado guardado para o texto. Vale a resposta do modelo principal e, enquanto o
+        roteamento ainda mandaria o texto ao modelo econômico, também a resposta deste.
+        """
+        modelos = [self.model]
+        economico = model_router.escolher(self.model, count_tokens(text, self.model))
+        if economico != self.model:
+            modelos.append(economico)
+        for modelo in modelos:
+            cached = cache.get(modelo, self.prompt, text)
+            if cached is not None:
+                return cached
+        return None
+
+    async def extrair_nomes_do_texto(self, text: str, id, usar_cache: bool = True, forcar: bool = False,
+                                     prescreen: bool = True, fonte: Optional[str] = None,
+                                     forcar_principal: bool = False) -> Optional[list]:
+        """
+        Chamada ao GPT + parse + filtro de pessoas físicas, sem acesso ao banco.
+        Textos longos são divididos em blocos (parágrafos, com sobreposição) enviados em paralelo
+        e os nomes de cada bloco são mesclados.
+        Sem `forcar`, textos reprovados pelo pré-filtro local devolvem [] sem chamar o modelo.
+        O texto é condensado (duplicatas/boilerplate da FONTE) antes de ir ao modelo; o cache
+        continua indexado pelo texto original e pelo modelo que respondeu.
+        Com `forcar_principal`, pula o modelo econômico (artigo já escalado pelo lote empacotado).
+        Retorna None se nenhuma resposta pôde ser interpretada; erros da API são propagados.
+        """
+        cache = get_llm_cache() if usar_cache else None
+        if cache is not None:
+            cached = await asyncio.to_thread(self.nomes_em_cache, cache, text)
+            if cached is not None:
+                logger.info(f"Nomes da notícia {id} servidos do cache de LLM ({len(cached)} nome(s))")
+                return cached
+
+        if prescreen and await self._pular_por_prescreen(text, id, forcar):
+            return []
+
+        texto_modelo = await self._condensar(text, fonte, id)
+        blocos = chunk_text(texto_modelo, settings.LLM_CHUNK_MAX_TOKENS, settings.LLM_CHUNK_OVERLAP_TOKENS, self.model)
+        logger.info(
+            f"Iniciando extração de nomes para notícia {id} "
+            f"(texto com {len(text)} caracteres, {len(blocos)} bloco(s))"
+        )
+
+        if len(blocos) == 1:
+            nomes_filtrados, modelo = await self._extrair_nomes_bloco(blocos[0], id, forcar_principal)
+        else:
+            sem = asyncio.Semaphore(max(1, settings.LLM_CHUNK_CONCURRENCY))
+
+            async def extrair_bloco(bloco: str):
+                async with sem:
+                    return await self._extrair_nomes_bloco(bloco, id, forcar_principal)
 
-            # Parse do JSON com tratamento de erros robusto
-            resposta_dict = self._parse_json_seguro(json_str, id)
+            respostas = await asyncio.gather(*(extrair_bloco(b) for b in blocos))
+            validos = [nomes for nomes, _ in respostas if nomes is not None]
+            if len(validos) < len(respostas):
+                logger.warning(f"{len(respostas) - len(validos)} de {len(respostas)} bloco(s) da notícia {id} sem JSON válido")
+            nomes_filtrados = merge_nomes(validos) if validos else None
+            # basta um bloco respondido pelo econômico para o resultado não valer como do principal
+            modelo = next((m for _, m in respostas if m != self.model), self.model)
+
+        if nomes_filtrados is None:
+            return None
+
+        if cache is not None:
+            await asyncio.to_thread(cache.put, modelo, self.prompt, text, nomes_filtrados)
+
+        logger.info(f"Extraídos {len(nomes_filtrados)} nome(s) de pessoa(s) física(s) da notícia {id}")
+        return nomes_filtrados
+
+    async def extrair_nomes_stream(self, text: str, id, forcar: bool = False,
+                                   fonte: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Variante em streaming de extrair_nomes_do_texto: emite {"event": "NOME", "nome": {...}}
+        assim que cada pessoa física fica completa na resposta do modelo e, no fim,
+        {"event": "DONE", "nomes": [...]} com a lista final (mesclada entre blocos).
+        """
+        cache = get_llm_cache()
+        if cache is not None:
+            cached = await asyncio.to_thread(self.nomes_em_cache, cache, text)
+            if cached is not None:
+                for nome in cached:
+                    yield {"event": "NOME", "nome": nome}
+                yield {"event": "DONE", "nomes": cached, "cache": True}
+                return
+
+        if await self._pular_por_prescreen(text, id, forcar):
+            yield {"event": "DONE", "nomes": [], "prescreen": True}
+            return
+
+        texto_modelo = await self._condensar(text, fonte, id)
+        blocos = chunk_text(texto_modelo, settings.LLM_CHUNK_MAX_TOKENS, settings.LLM_CHUNK_OVERLAP_TOKENS, self.model)
+        fila: asyncio.Queue = asyncio.Queue()
+        parciais: List[Optional[list]] = [None] * len(blocos)
+        sem = asyncio.Semaphore(max(1, settings.LLM_CHUNK_CONCURRENCY))
+
+        async def produzir(i: int, bloco: str):
+            async with sem:
+                try:
+                    parciais[i] = await self._stream_nomes_bloco(bloco, id, fila)
+                except Exception as e:
+                    logger.error(f"Erro no streaming de nomes da notícia {id} (bloco {i}): {e}")
+                    await fila.put({"event": "ERROR", "bloco": i, "error": str(e)})
+                finally:
+                    await fila.put(None)
+
+        tarefas = [asyncio.create_task(produzir(i, b)) for i, b in enumerate(blocos)]
+        emitidos = set()
+        pendentes = len(tarefas)
+        try:
+            while pendentes:
+                evento = await fila.get()
+                if evento is None:
+                    pendentes -= 1
+                    continue
+                if evento["event"] == "NOME":
+                    # a sobreposição entre blocos repete pessoas: emite cada uma só uma vez
+                    chave = normalizar_nome(evento["nome"].get("NOME", ""))
+                    if chave in emitidos:
+                        continue
+                    emitidos.add(chave)
+                yield evento
+        finally:
+            # cliente desconectou no meio: não deixa chamadas órfãs consumindo cota
+            for t in tarefas:
+                t.cancel()
+
+        validos = [p for p in parciais if p is not None]
+        if not validos:
+            yield {"event": "FAILED", "error": "resposta do modelo sem JSON válido"}
+            return
+
+        nomes = merge_nomes(validos) if len(blocos) > 1 else validos[0]
+        if cache is not None:
+            await asyncio.to_thread(cache.put, self.model, self.prompt, text, nomes)
+        yield {"event": "DONE", "nomes": nomes}
+
+    async def _stream_nomes_bloco(self, text: str, id, fila: asyncio.Queue) -> Optional[list]:
+        parser = JsonArrayStream()
+        nomes = []
+        entidades = 0
+        uso: List[Any] = []
+        inicio = time.perf_counter()
+        ttft = None
+
+        async for pedaco in chat_completion_stream(self.model, self._mensagens_extracao(text), on_usage=uso.append):
+            if ttft is None:
+                ttft = time.perf_counter() - inicio
+            for obj in parser.feed(pedaco):
+                entidades += 1
+                for nome in self._filtrar_pessoas_fisicas([obj], id):
+                    nomes.append(nome)
+                    await fila.put({"event": "NOME", "nome": nome})
+        await self._registrar_chamada(self.model, "stream", inicio, uso[-1] if uso else None, ttft)
+
+        if parser.iniciado:
+            await llm_telemetry.registrar_estrategia("stream", "stream")
+        else:
+            # resposta fora do formato de array: usa as estratégias do modo sem streaming
+            json_str, estrategia = self._extrair_json_com_estrategia(parser.texto.strip())
+            await llm_telemetry.registrar_estrategia("stream", estrategia)
+            resposta_dict = self._parse_json_seguro(json_str, id) if json_str else None
             if resposta_dict is None:
-                return []
+                logger.warning(f"Não foi possível extrair JSON do streaming GPT para notícia {id}")
+                return None
+            entidades = len(resposta_dict)
+            for nome in self._filtrar_pessoas_fisicas(resposta_dict, id):
+                nomes.append(nome)
+                await fila.put({"event": "NOME", "nome": nome})
+        await llm_telemetry.registrar_filtro(self.variante_prompt, entidades, len(nomes))
+        return nomes
+
+    async def _condensar(self, text: str, fonte: Optional[str], id) -> str:
+        if not settings.LLM_CONDENSE_ENABLED:
+            return text
+        res = await asyncio.to_thread(
+            condense, text, fonte, settings.LLM_CONDENSE_FOCO_NOMES, settings.LLM_CONDENSE_CONTEXTO, self.model,
+        )
+        if not res.texto.strip():
+            return text
+        logger.info(
+            f"Texto da notícia {id} condensado: {res.tokens_antes} → {res.tokens_depois} tokens "
+            f"({res.tokens_economizados} economizados; removidos {res.removidos})"
+        )
+        await metrics.aincr("condense:artigos")
+        await metrics.aincr("condense:tokens_antes", res.tokens_antes)
+        await metrics.aincr("condense:tokens_depois", res.tokens_depois)
+        return res.texto
 
-            # Filtrar apenas pessoas físicas
-            nomes_filtrados = self._filtrar_pessoas_fisicas(resposta_dict, id)
-            
-            logger.info(f"Extraídos {len(nomes_filtrados)} nome(s) de pessoa(s) física(s) da notícia {id}")
-            if len(nomes_filtrados) == 0 and len(resposta_dict) > 0:
-                logger.warning(
-                    f"Nenhuma pessoa física encontrada, mas {len(resposta_dict)} entidade(s) foram retornadas. "
-                    f"Verifique se o campo PESSOA está sendo classificado corretamente."
-                )
+    async def triagem(self, text: str, id, forcar: bool = False) -> Optional[str]:
+        """
+        Pré-filtro local. None = segue para o modelo; "skip"/"defer" = texto sem indício
+        de pessoas físicas (o valor é a ação configurada em LLM_PRESCREEN_ACTION).
+        """
+        if not settings.LLM_PRESCREEN_ENABLED:
+            return None
+        res = await asyncio.to_thread(avaliar, text)
+        if not abaixo_do_limiar(res):
+            return None
+        if forcar:
+            await metrics.aincr("prescreen:forcados")
+            return None
+        logger.info(f"Notícia {id} sem indício de pessoas (escore {res.score}, ação {settings.LLM_PRESCREEN_ACTION})")
+        return settings.LLM_PRESCREEN_ACTION
+
+    async def _pular_por_prescreen(self, text: str, id, forcar: bool) -> bool:
+        # em modo "defer" a consulta interativa sempre vai ao modelo; só o lote adia
+        if settings.LLM_PRESCREEN_ACTION != "skip":
+            return False
+        if await self.triagem(text, id, forcar) != "skip":
+            return False
+        await metrics.aincr("prescreen:pulados")
+        return True
+
+    async def extrair_nomes_pacote(self, artigos: List[Tuple[int, str, Optional[str]]],
+                                   usar_cache: bool = True) -> Tuple[Dict[int, Optional[list]], Set[int]]:
+        """
+        Extrai nomes de vários artigos curtos numa única chamada: cada um vai num bloco
+        <artigo id="..."> e o modelo responde um objeto JSON {id: [nomes]}.
+        Artigos ausentes ou com valor inválido na resposta ficam None, para o chamador
+        refazer individualmente. Devolve também os ids cuja resposta do modelo econômico
+        foi recusada: esses devem ser refeitos direto no modelo principal
+        (extrair_nomes_do_texto com forcar_principal). Erros da API são propagados.
+        """
+        textos = {nid: await self._condensar(texto, fonte, nid) for nid, texto, fonte in artigos}
+        maior = max(count_tokens(t, self.model) for t in textos.values())
+        modelo = model_router.escolher(self.model, maior)
+        inicio = time.perf_counter()
+        response = await chat_completion(
+            modelo, self._mensagens_pacote(textos), response_format={"type": "json_object"},
+        )
+        await self._registrar_chamada(modelo, "pacote", inicio, response.usage)
+
+        resposta = (response.choices[0].message.content or "").strip()
+        if response.choices[0].finish_reason == "length":
+            logger.warning(f"Resposta empacotada truncada ({len(artigos)} artigos); aproveitando os artigos completos")
+        por_id, estrategia = self._parse_pacote(resposta)
+        await llm_telemetry.registrar_estrategia("pacote", estrategia)
+
+        cache = get_llm_cache() if usar_cache else None
+        resultados: Dict[int, Optional[list]] = {}
+        escaladas: Set[int] = set()
+        for nid, texto, _ in artigos:
+            bruto = por_id.get(str(nid))
+            if not isinstance(bruto, list):
+                logger.warning(f"Notícia {nid} ausente ou inválida na resposta empacotada")
+                resultados[nid] = None
+                continue
+            entidades = [n for n in bruto if isinstance(n, dict)]
+            nomes = self._filtrar_pessoas_fisicas(entidades, nid)
+            await llm_telemetry.registrar_filtro(self.variante_prompt, len(entidades), len(nomes))
+            if modelo != self.model:
+                motivo = model_router.motivo_escalada(nomes, False, textos[nid])
+                if motivo is not None:
+                    # o chamador refaz este artigo sozinho, direto no modelo principal
+                    await model_router.registrar_escalada(modelo, motivo, nid)
+                    resultados[nid] = None
+                    escaladas.add(nid)
+                    continue
+            resultados[nid] = nomes
+            if cache is not None:
+                await asyncio.to_thread(cache.put, modelo, self.prompt, texto, nomes)
+
+        await metrics.aincr("pack:requisicoes")
+        await metrics.aincr("pack:artigos", len(artigos))
+        return resultados, escaladas
+
+    def _mensagens_pacote(self, textos: Dict[int, str]) -> List[Dict[str, str]]:
+        instrucao = (
+            "MODO LOTE: a mensagem traz vários artigos, cada um em <artigo id=\"N\">...</artigo>. "
+            "Aplique as instruções acima a cada artigo separadamente e responda APENAS com um objeto JSON "
+            "cujas chaves são os ids dos artigos (string) e cujos valores são o array de nomes daquele artigo, "
+            "no formato pedido ([] se não houver pessoas). Inclua todos os ids."
+        )
+        artigos = "\n\n".join(f'<artigo id="{nid}">\n{texto}\n</artigo>' for nid, texto in textos.items())
+        return [
+            {"role": "system", "content": self.prompt},
+            {"role": "system", "content": instrucao},
+            {"role": "user", "content": artigos}
+        ]
 
-            return nomes_filtrados
+    def _parse_pacote(self, resposta: str) -> Tuple[Dict[str, Any], str]:
+        """
+        Objeto {id: [nomes]} da resposta empacotada (e a estratégia usada);
+        se malformado, recupera os arrays completos um a um.
+        """
+        match = re.search(r'\{.*\}', resposta, re.DOTALL)
+        if match:
+            try:
+                parsed = json.loads(match.group(0))
+                if isinstance(parsed, dict):
+                    return {str(k).strip(): v for k, v in parsed.items()}, "objeto"
+            except json.JSONDecodeError as e:
+                logger.debug(f"Erro no parse da resposta empacotada: {e}")
+
+        decoder = json.JSONDecoder()
+        por_id: Dict[str, Any] = {}
+        for m in re.finditer(r'"(\d+)"\s*:\s*(?=\[)', resposta):
+            try:
+                valor, _ = decoder.raw_decode(resposta, m.end())
+            except json.JSONDecodeError:
+                continue
+            por_id[m.group(1)] = valor
+        return por_id, "recuperada" if por_id else "falha"
+
+    def _mensagens_extracao(self, text: str) -> List[Dict[str, str]]:
+        artigo = f"<artigo>\n{text}\n</artigo>"
+        return [
+            {"role": "system", "content": self.prompt},
+            {"role": "user", "content": artigo}
+        ]
 
-        except Exception as e:
-            logger.error(f"Erro ao extrair nomes da notícia {id}: {e}", exc_info=True)
-            return []
+    async def _extrair_nomes_bloco(self, text: str, id, forcar_principal: bool = False) -> Tuple[Optional[list], str]:
+        """
+        Textos curtos tentam primeiro o modelo econômico; a resposta só é aceita se
+        tiver JSON legível, não vier truncada e não contradisser o pré-filtro local.
+        Devolve os nomes e o modelo que os respondeu.
+        """
+        modelo = self.model if forcar_principal else model_router.escolher(self.model, count_tokens(text, self.model))
+        if modelo != self.model:
+            nomes, truncada = await self._chamar_modelo_bloco(modelo, text, id)
+            motivo = model_router.motivo_escalada(nomes, truncada, text)
+            if motivo is None:
+                return nomes, modelo
+            await model_router.registrar_escalada(modelo, motivo, id)
+
+        nomes, _ = await self._chamar_modelo_bloco(self.model, text, id)
+        return nomes, self.model
+
+    @property
+    def variante_prompt(self) -> str:
+        return "ambiental" if self.prompt is self.prompt_is_ambiental else "padrao"
+
+    async def _registrar_chamada(self, modelo: str, modo: str, inicio: float, usage: Any,
+                                 ttft_s: Optional[float] = None):
+        duracao = time.perf_counter() - inicio
+        await model_router.registrar(modelo, duracao, usage)
+        await llm_telemetry.registrar_chamada(modelo, self.variante_prompt, modo, duracao, usage, ttft_s)
+
+    async def _chamar_modelo_bloco(self, modelo: str, text: str, id) -> Tuple[Optional[list], bool]:
+        inicio = time.perf_counter()
+        response = await chat_completion(modelo, self._mensagens_extracao(text))
+        await self._registrar_chamada(modelo, "bloco", inicio, response.usage)
+
+        resposta = (response.choices[0].message.content or "").strip()
+        logger.debug(f"Resposta GPT recebida (primeiros 500 chars): {resposta[:500]}")
+        truncada = response.choices[0].finish_reason == "length"
+        if truncada:
+            logger.warning(f"Resposta do {modelo} truncada para notícia {id}; aproveitando os objetos completos")
+
+        # Estratégias múltiplas para extrair JSON da resposta
+        json_str, estrategia = self._extrair_json_com_estrategia(resposta)
+        await llm_telemetry.registrar_estrategia("bloco", estrategia)
+
+        if not json_str:
+            logger.warning(f"Não foi possível extrair JSON da resposta GPT para notícia {id}")
+            return None, truncada
+
+        # Parse do JSON com tratamento de erros robusto
+        resposta_dict = self._parse_json_seguro(json_str, id)
+        if resposta_dict is None:
+            return None, truncada
+
+        # Filtrar apenas pessoas físicas
+        nomes_filtrados = self._filtrar_pessoas_fisicas(resposta_dict, id)
+        await llm_telemetry.registrar_filtro(self.variante_prompt, len(resposta_dict), len(nomes_filtrados))
+
+        if len(nomes_filtrados) == 0 and len(resposta_dict) > 0:
+            logger.warning(
+                f"Nenhuma pessoa física encontrada, mas {len(resposta_dict)} entidade(s) foram retornadas. "
+                f"Verifique se o campo PESSOA está sendo classificado corretamente."
+            )
+
+        return nomes_filtrados, truncada
 
     def _extrair_json_da_resposta(self, resposta: str) -> Optional[str]:
         """
         Extrai JSON da resposta do GPT usando múltiplas estratégias.
         Retorna o JSON como string ou None se não encontrar.
         """
+        return self._extrair_json_com_estrategia(resposta)[0]
+
+    def _extrair_json_com_estrategia(self, resposta: str) -> Tuple[Optional[str], str]:
+        """Como _extrair_json_da_resposta, devolvendo também o nome da estratégia que funcionou."""
         if not resposta:
-            return None
+            return None, "vazia"
 
         # Estratégia 1: JSON entre ```json ... ```
         match = re.search(r'```json\s*(\[.*?\])\s*```', resposta, re.DOTALL)
         if match:
-            return match.group(1)
+            return match.group(1), "bloco_json"
 
         # Estratégia 2: JSON entre ``` ... ```
         match = re.search(r'```\s*(\[.*?\])\s*```', resposta, re.DOTALL)
         if match:
-            return match.group(1)
+            return match.group(1), "bloco"
 
         # Estratégia 3: Procurar por array JSON diretamente
         match = re.search(r'(\[\s*\{.*?\}\s*\])', resposta, re.DOTALL)
         if match:
-            return match.group(1)
+            return match.group(1), "array"
 
         # Estratégia 4: Se a resposta inteira parece ser JSON
         resposta_limpa = resposta.strip()
         if resposta_limpa.startswith('[') and resposta_limpa.endswith(']'):
-            return resposta_limpa
+            return resposta_limpa, "inteira"
 
-        return None
+        # Estratégia 5: array truncado (resposta cortada pelo limite de tokens)
+        recuperado = self._recuperar_array_truncado(resposta_limpa)
+        return recuperado, "truncada" if recuperado else "falha"
+
+    def _recuperar_array_truncado(self, resposta: str) -> Optional[str]:
+        """
+        Aproveita os objetos completos de um array JSON que não chegou a ser fechado,
+        descartando o último objeto pela metade.
+        """
+        inicio = resposta.find('[')
+        if inicio < 0:
+            return None
+
+        decoder = json.JSONDecoder()
+        objetos = []
+        pos = inicio + 1
+        while True:
+            while pos < len(resposta) and resposta[pos] in ' \t\r\n,':
+                pos += 1
+            if pos >= len(resposta) or resposta[pos] != '{':
+                break
+            try:
+                obj, pos = decoder.raw_decode(resposta, pos)
+            except json.JSONDecodeError:
+                break
+            objetos.append(obj)
+
+        if not objetos:
+            return None
+        return json.dumps(objetos, ensure_ascii=False)
 
     def _parse_json_seguro(self, json_str: str, noticia_id: int) -> Optional[List[Dict]]:
         """
@@ -672,13 +1534,7 @@ class NoticiaService:
             # Heurística: se tem SEXO ou IDADE, é provavelmente uma pessoa física
             # Mas só incluímos se NÃO tiver características de organização
             nome_upper = nome.upper()
-            indicadores_org = [
-                'MINISTÉRIO', 'SERVIÇO', 'DEPARTAMENTO', 'SECRETARIA', 
-                'TRIBUNAL', 'JUSTIÇA', 'POLÍCIA', 'CORPO', 'FORÇA',
-                'EMPRESA', 'LTDA', 'SA', 'ME', 'EPP'
-            ]
-            
-            parece_organizacao = any(ind in nome_upper for ind in indicadores_org)
+            parece_organizacao = any(ind in nome_upper for ind in INDICADORES_ORGANIZACAO)
             
             if (tem_sexo or tem_idade or tem_aniversario) and not parece_organizacao:
                 # Adiciona com PESSOA = 'F' para garantir consistência
@@ -750,38 +1606,54 @@ class NoticiaService:
 
             return results
 
-    def _fetch(self, url: str) -> str:
-        html = self._fetch_with_requests(url)
-        if html is None:
-            html = self._fetch_with_playwright(url)
-        return html or ""
+    async def _fetch(self, estrategia: str, url: str, cache=None, cached=None) -> str | None:
+        if estrategia == 'http':
+            # com validadores (ETag/Last-Modified) a revalidação é um GET condicional
+            r = await self._fetch_http(url, cached.validators() if cached else None)
+            if r is None:
+                return None
+            if r.status_code == 304:
+                if not cached:
+                    return None
+                await asyncio.to_thread(cache.touch, url)
+                return cached.html
+            if cache:
+                await asyncio.to_thread(
+                    cache.put, url, r.text,
+                    r.headers.get('etag'), r.headers.get('last-modified'), 'http',
+                )
+            return r.text
+
+        html = await self._fetch_with_playwright(url)
+        if html and cache:
+            await asyncio.to_thread(cache.put, url, html, None, None, 'playwright')
+        return html
 
-    def _fetch_with_requests(self, url: str) -> str | None:
-        headers = {'User-Agent': self.user_agent}
+    async def _fetch_http(self, url: str, extra_headers: Optional[Dict[str, str]] = None) -> FetchResult | None:
+        headers = {'User-Agent': self.user_agent, **(extra_headers or {})}
         try:
-            r = requests.get(url, headers=headers, timeout=self.timeout)
-            if r.status_code == 200:
-                return r.text
-        except requests.exceptions.Timeout:
-            print(f"Timeout requests: {url}")
-        except requests.RequestException as e:
-            print(f"Erro requests: {e}")
+            r = await get_http_fetcher().get(url, headers=headers, timeout=self.timeout)
+            if r.status_code in (200, 304):
+                return r
+        except httpx.TimeoutException:
+            logger.warning(f"Timeout HTTP: {url}")
+        except httpx.HTTPError as e:
+            logger.warning(f"Erro HTTP: {e}")
         return None
 
-    def _fetch_with_playwright(self, url: str) -> str | None:
+    async def _fetch_with_playwright(self, url: str, modo: Optional[str] = None) -> str | None:
+        render = build_render_job(url, self.timeout * 1000, modo or settings.PLAYWRIGHT_RENDER_MODE)
+
         try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                page = browser.new_page(user_agent=self.user_agent)
-                page.goto(url, timeout=self.timeout * 1000)
-                page.wait_for_load_state('networkidle', timeout=self.timeout * 1000)
-                content = page.content()
-                browser.close()
-                return content
-        # except PlaywrightTimeoutError:
-        #     print(f"Timeout Playwright: {url}")
+            # navegador aquecido do pool do processo (sem custo de cold start);
+            # com a fila cheia o submit bloqueia esperando vaga, por isso roda fora do event loop
+            future = await asyncio.to_thread(get_browser_pool().submit, render, user_agent=self.user_agent)
+            return await asyncio.wait_for(
+                asyncio.wrap_future(future),
+                timeout=settings.PLAYWRIGHT_ACQUIRE_TIMEOUT + self.timeout * 2,
+            )
         except Exception as e:
-            print(f"Erro Playwright: {e}")
+            logger.warning(f"Erro Playwright: {url}: {e}", exc_info=True)
         return None
 
     def _make_link_id(self, url: str) -> str:
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
 from src.dtecflex_extract_api.services.transfer_service import normalize_category
-from src.dtecflex_extract_api.utils.pubsub import r_async, channel_name, job_key, get_meta
+from src.dtecflex_extract_api.utils.pubsub import CAPTURE_PREFIX, EXTRACTION_PREFIX, r_async, channel_name, job_key, get_meta
 
 router = APIRouter()
 
@@ -35,3 +35,35 @@ async def publication_ws(
         except Exception:
             pass
         await pubsub.aclose()
+
+
+@router.websocket("/ws/capture")
+@router.websocket("/ws/extraction")
+async def batch_job_ws(
+    websocket: WebSocket,
+    key: str = Query(..., description="Chave retornada por POST /noticias/capturar-texto/lote ou /noticias/extrair-nomes/lote"),
+):
+    await websocket.accept()
+    if not key.startswith((CAPTURE_PREFIX, EXTRACTION_PREFIX)):
+        await websocket.close(code=1008)
+        return
+
+    meta = get_meta(key)
+    if meta:
+        await websocket.send_json({"event": "SNAPSHOT", **meta})
+
+    chan = channel_name(key)
+    pubsub = r_async.pubsub()
+    await pubsub.subscribe(chan)
+    try:
+        async for msg in pubsub.listen():
+            if msg and msg.get("type") == "message":
+                await websocket.send_text(msg["data"])
+    except WebSocketDisconnect:
+        pass
+    finally:
+        try:
+            await pubsub.unsubscribe(chan)
+        except Exception:
+            pass
+        await pubsub.aclose()
@@ -0,0 +1,292 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, Set
+
+from playwright.sync_api import sync_playwright
+
+from src.dtecflex_extract_api.config.celery import settings
+
+logger = logging.getLogger(__name__)
+
+PageJob = Callable[[Any], Any]
+
+_STOP = object()
+
+
+def _process_tree_rss_mb(root_pid: int) -> float:
+    """
+    Soma o RSS (MB) de um processo e de todos os seus descendentes lendo /proc.
+    Fora do Linux retorna 0 (o limite de memória fica desativado).
+    """
+    if not os.path.isdir("/proc"):
+        return 0.0
+
+    filhos: Dict[int, list] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "rb") as f:
+                stat = f.read().decode(errors="ignore")
+            # o nome do processo pode conter espaços: o ppid vem depois do último ')'
+            ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        filhos.setdefault(ppid, []).append(int(entry))
+
+    total_kb = 0
+    pendentes = [root_pid]
+    while pendentes:
+        pid = pendentes.pop()
+        pendentes.extend(filhos.get(pid, []))
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for linha in f:
+                    if linha.startswith("VmRSS:"):
+                        total_kb += int(linha.split()[1])
+                        break
+        except (OSError, ValueError):
+            continue
+    return total_kb / 1024
+
+
+def _child_pids() -> Set[int]:
+    if not os.path.isdir("/proc"):
+        return set()
+    pids = set()
+    me = os.getpid()
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "rb") as f:
+                stat = f.read().decode(errors="ignore")
+            if int(stat.rsplit(")", 1)[1].split()[1]) == me:
+                pids.add(int(entry))
+        except (OSError, IndexError, ValueError):
+            continue
+    return pids
+
+
+class _BrowserWorker(threading.Thread):
+    """
+    Thread dona de um Chromium. A API síncrona do Playwright só pode ser usada
+    na thread que a iniciou, então cada navegador vive (e morre) aqui dentro.
+    """
+
+    def __init__(self, pool: "BrowserPool", idx: int):
+        super().__init__(name=f"browser-pool-{idx}", daemon=True)
+        self.pool = pool
+        self._playwright = None
+        self._browser = None
+        self._contexts: Dict[str, Any] = {}
+        self._driver_pids: Set[int] = set()
+        self._pages = 0
+        self._last_used = time.monotonic()
+
+    # ---------- ciclo de vida do navegador ----------
+
+    def _launch(self):
+        # serializa o start para identificar qual processo (driver) pertence a esta thread
+        with self.pool._launch_lock:
+            antes = _child_pids()
+            self._playwright = sync_playwright().start()
+            self._browser = self._playwright.chromium.launch(headless=True)
+            self._driver_pids = _child_pids() - antes
+        self._pages = 0
+        logger.info(f"[{self.name}] Chromium iniciado")
+
+    def _close(self):
+        for ctx in self._contexts.values():
+            try:
+                ctx.close()
+            except Exception:
+                pass
+        self._contexts = {}
+        if self._browser is not None:
+            try:
+                self._browser.close()
+            except Exception:
+                pass
+        if self._playwright is not None:
+            try:
+                self._playwright.stop()
+            except Exception:
+                pass
+        self._browser = None
+        self._playwright = None
+        self._driver_pids = set()
+
+    def _healthy(self) -> bool:
+        try:
+            return self._browser is not None and self._browser.is_connected()
+        except Exception:
+            return False
+
+    def _rss_mb(self) -> float:
+        return sum(_process_tree_rss_mb(pid) for pid in self._driver_pids)
+
+    def _maybe_recycle(self):
+        motivo = None
+        if self._pages >= settings.PLAYWRIGHT_MAX_PAGES_PER_BROWSER:
+            motivo = f"{self._pages} páginas"
+        elif settings.PLAYWRIGHT_MAX_RSS_MB:
+            rss = self._rss_mb()
+            if rss > settings.PLAYWRIGHT_MAX_RSS_MB:
+                motivo = f"{rss:.0f} MB de RSS"
+        if motivo:
+            logger.info(f"[{self.name}] Reciclando Chromium ({motivo})")
+            self._close()
+
+    def _context(self, user_agent: Optional[str]):
+        key = user_agent or ""
+        ctx = self._contexts.get(key)
+        if ctx is None:
+            ctx = self._browser.new_context(user_agent=user_agent) if user_agent else self._browser.new_context()
+            self._contexts[key] = ctx
+        return ctx
+
+    # ---------- loop principal ----------
+
+    def run(self):
+        while True:
+            try:
+                job = self.pool._jobs.get(timeout=30)
+            except queue.Empty:
+                self._idle_check()
+                continue
+
+            if job is _STOP:
+                break
+
+            fn, future, user_agent = job
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            try:
+                if not self._healthy():
+                    self._close()
+                    self._launch()
+                page = self._context(user_agent).new_page()
+                try:
+                    result = fn(page)
+                finally:
+                    try:
+                        page.close()
+                    except Exception:
+                        pass
+                future.set_result(result)
+            except BaseException as e:
+                future.set_exception(e)
+                if not self._healthy():
+                    # navegador caiu durante a página: descarta para relançar no próximo job
+                    self._close()
+            finally:
+                self._pages += 1
+                self._last_used = time.monotonic()
+
+            if self._browser is not None:
+                self._maybe_recycle()
+
+        self._close()
+
+    def _idle_check(self):
+        if self._browser is None:
+            return
+        ocioso = time.monotonic() - self._last_used
+        if not self._healthy() or ocioso > settings.PLAYWRIGHT_IDLE_TIMEOUT:
+            logger.info(f"[{self.name}] Fechando Chromium ocioso/inativo")
+            self._close()
+
+
+class BrowserPool:
+    """
+    Pool de navegadores Chromium aquecidos, compartilhado pelo processo.
+
+    A concorrência é limitada pelo número de threads (uma página por navegador
+    por vez). Os jobs recebem uma `Page` nova de um contexto já aberto e devem
+    devolver o resultado; a página é sempre fechada ao final.
+    """
+
+    def __init__(self, size: int, queue_size: int):
+        self.size = max(1, size)
+        self._jobs: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._workers: list = []
+        self._launch_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _ensure_started(self):
+        if self._workers:
+            return
+        with self._lock:
+            if self._workers:
+                return
+            for i in range(self.size):
+                w = _BrowserWorker(self, i)
+                w.start()
+                self._workers.append(w)
+
+    def submit(self, fn: PageJob, user_agent: Optional[str] = None) -> Future:
+        if self._closed:
+            raise RuntimeError("Pool de navegadores encerrado")
+        self._ensure_started()
+        future: Future = Future()
+        try:
+            self._jobs.put((fn, future, user_agent), timeout=settings.PLAYWRIGHT_ACQUIRE_TIMEOUT)
+        except queue.Full:
+            raise TimeoutError("Nenhum navegador livre no pool (fila cheia)")
+        return future
+
+    def run(self, fn: PageJob, user_agent: Optional[str] = None, timeout: Optional[float] = None) -> Any:
+        future = self.submit(fn, user_agent=user_agent)
+        try:
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            future.cancel()  # só surte efeito se ainda estiver na fila
+            raise
+
+    def shutdown(self, timeout: float = 10):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            workers = list(self._workers)
+        for _ in workers:
+            self._jobs.put(_STOP)
+        for w in workers:
+            w.join(timeout=timeout)
+        logger.info("Pool de navegadores encerrado")
+
+
+_pool: Optional[BrowserPool] = None
+_pool_pid: Optional[int] = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Retorna o pool do processo atual (recriado após fork)."""
+    global _pool, _pool_pid
+    pid = os.getpid()
+    if _pool is not None and _pool_pid == pid:
+        return _pool
+    with _pool_lock:
+        if _pool is None or _pool_pid != pid:
+            _pool = BrowserPool(settings.PLAYWRIGHT_POOL_SIZE, settings.PLAYWRIGHT_QUEUE_SIZE)
+            _pool_pid = pid
+    return _pool
+
+
+def shutdown_browser_pool():
+    global _pool
+    if _pool is not None and _pool_pid == os.getpid():
+        _pool.shutdown()
+    _pool = None
+
+
+atexit.register(shutdown_browser_pool)
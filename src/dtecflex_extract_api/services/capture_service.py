@@ -0,0 +1,84 @@
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.dtecflex_extract_api.resources.noticias.noticias_service import NoticiaService
+from src.dtecflex_extract_api.services.http_fetcher import close_http_fetcher
+
+ProgressCb = Optional[Callable[[int, int, str, dict | None], None]]
+
+
+async def _capturar_lote(
+    noticia_service: NoticiaService,
+    alvos: List[Tuple[int, str]],
+    concurrency: int,
+    logger,
+    progress_cb: ProgressCb = None,
+    usar_cache: bool = True,
+) -> Dict[str, Any]:
+    sem = asyncio.Semaphore(max(1, concurrency))
+    total = len(alvos)
+    capturadas, vazias, falhas = [], [], []
+
+    async def capturar(noticia_id: int, url: str):
+        async with sem:
+            try:
+                return noticia_id, await noticia_service.fetch_and_extract_text(url, usar_cache=usar_cache), None
+            except Exception as e:
+                return noticia_id, None, str(e)
+
+    try:
+        tarefas = [capturar(nid, url) for nid, url in alvos]
+        for idx, tarefa in enumerate(asyncio.as_completed(tarefas), start=1):
+            noticia_id, texto, erro = await tarefa
+
+            if erro:
+                logger.error(f"Falha ao capturar notícia {noticia_id}: {erro}")
+                falhas.append(noticia_id)
+            elif not texto:
+                vazias.append(noticia_id)
+            else:
+                try:
+                    # a sessão é usada por uma escrita de cada vez (este loop aguarda cada uma)
+                    await asyncio.to_thread(noticia_service.update_texto_por_id, noticia_id, texto)
+                    capturadas.append(noticia_id)
+                except Exception as e:
+                    logger.error(f"Falha ao gravar texto da notícia {noticia_id}: {e}")
+                    falhas.append(noticia_id)
+
+            if progress_cb:
+                progress_cb(idx, total, "CAPTURE", {
+                    "last": noticia_id,
+                    "captured": len(capturadas), "empty": len(vazias), "failed": len(falhas),
+                })
+    finally:
+        await close_http_fetcher()
+
+    return {"captured": capturadas, "empty": vazias, "failed": falhas}
+
+
+def run_capture(
+    noticia_service: NoticiaService,
+    alvos: List[Tuple[int, str]],
+    concurrency: int,
+    logger,
+    progress_cb: ProgressCb = None,
+    usar_cache: bool = True,
+) -> Dict[str, Any]:
+    total = len(alvos)
+    if progress_cb:
+        progress_cb(0, total or 1, "START", None)
+    if not alvos:
+        return {"total": 0, "captured": 0, "empty": [], "failed": []}
+
+    result = asyncio.run(_capturar_lote(noticia_service, alvos, concurrency, logger, progress_cb, usar_cache))
+
+    summary = {
+        "total": total,
+        "captured": len(result["captured"]),
+        "empty": result["empty"],
+        "failed": result["failed"],
+    }
+    if progress_cb:
+        progress_cb(total, total or 1, "SUMMARY", summary)
+    logger.info(f"Resumo captura: {summary}")
+    return summary
@@ -0,0 +1,66 @@
+import hashlib
+import json
+import logging
+from typing import Any, Dict, Optional
+
+from src.dtecflex_extract_api.config.celery import settings
+from src.dtecflex_extract_api.utils.pubsub import r_sync
+
+logger = logging.getLogger(__name__)
+
+COUNT_PREFIX = "noticias:count:"
+GERACAO_KEY = f"{COUNT_PREFIX}geracao"
+
+
+def _normalizar(valor: Any) -> Any:
+    if isinstance(valor, dict):
+        return {str(k): _normalizar(v) for k, v in sorted(valor.items()) if v not in (None, "", [], ())}
+    if isinstance(valor, (list, tuple, set)):
+        itens = [_normalizar(v) for v in valor]
+        # listas de valores (STATUS) não dependem da ordem; tuplas de intervalo sim
+        return sorted(itens, key=str) if isinstance(valor, (list, set)) else itens
+    if hasattr(valor, "isoformat"):
+        return valor.isoformat()
+    return valor
+
+
+def assinatura(filters: Optional[Dict[str, Any]]) -> str:
+    """Hash dos filtros normalizados: mesma consulta, mesma chave, qualquer que seja a ordem."""
+    bruto = json.dumps(_normalizar(filters or {}), sort_keys=True, default=str)
+    return hashlib.sha1(bruto.encode()).hexdigest()
+
+
+def _chave(filters: Optional[Dict[str, Any]], modo: str) -> str:
+    geracao = r_sync.get(GERACAO_KEY) or "0"
+    return f"{COUNT_PREFIX}{geracao}:{modo}:{assinatura(filters)}"
+
+
+def get(filters: Optional[Dict[str, Any]], modo: str = "exato") -> Optional[int]:
+    if not settings.NOTICIAS_COUNT_CACHE_ENABLED:
+        return None
+    try:
+        valor = r_sync.get(_chave(filters, modo))
+    except Exception as e:
+        logger.debug(f"Falha ao ler contagem em cache: {e}")
+        return None
+    return int(valor) if valor is not None else None
+
+
+def put(filters: Optional[Dict[str, Any]], total: int, modo: str = "exato"):
+    if not settings.NOTICIAS_COUNT_CACHE_ENABLED:
+        return
+    try:
+        r_sync.set(_chave(filters, modo), int(total), ex=settings.NOTICIAS_COUNT_CACHE_TTL)
+    except Exception as e:
+        logger.debug(f"Falha ao gravar contagem em cache: {e}")
+
+
+def invalidar():
+    """
+    Chamado após escritas em colunas usadas pelos filtros (ou que inserem/removem notícias).
+    Troca a geração em vez de apagar chaves; as antigas expiram pelo TTL.
+    """
+    try:
+        r_sync.incr(GERACAO_KEY)
+    except Exception as e:
+        logger.warning(f"Falha ao invalidar contagens em cache: {e}")
@@ -0,0 +1,144 @@
+import asyncio
+import atexit
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from src.dtecflex_extract_api.config.celery import settings
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_pid: Optional[int] = None
+_lock = threading.Lock()
+
+
+def _init_worker():
+    # aquece o trafilatura (import + caches internos) antes do primeiro job real
+    import trafilatura
+    trafilatura.extract("<html><body><article><p>aquecimento</p></article></body></html>")
+
+
+class _PrazoExcedido(Exception):
+    """Levantada dentro do processo de trabalho quando o alarme da extração dispara."""
+
+
+def _alarme(signum, frame):
+    raise _PrazoExcedido()
+
+
+def _extract(html: str) -> Optional[str]:
+    import trafilatura
+    return trafilatura.extract(html, include_comments=False)
+
+
+def _extract_com_prazo(html: str, timeout: int) -> Optional[str]:
+    # o próprio processo de trabalho se interrompe e continua vivo para os próximos jobs
+    anterior = signal.signal(signal.SIGALRM, _alarme)
+    signal.alarm(max(1, timeout))
+    try:
+        return _extract(html)
+    finally:
+        signal.alarm(0)
+        signal.signal(signal.SIGALRM, anterior)
+
+
+def _process_pool_allowed() -> bool:
+    # processos daemon (ex.: filhos do prefork do Celery) não podem ter filhos
+    return settings.EXTRACTION_POOL_ENABLED and not multiprocessing.current_process().daemon
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor, _executor_pid
+    pid = os.getpid()
+    if _executor is not None and _executor_pid == pid:
+        return _executor
+    with _lock:
+        if _executor is None or _executor_pid != pid:
+            ctx = multiprocessing.get_context(settings.EXTRACTION_MP_CONTEXT)
+            if settings.EXTRACTION_MP_CONTEXT == "forkserver":
+                ctx.set_forkserver_preload(["trafilatura"])
+            # recicla os processos periodicamente (memória do lxml); não suportado com fork
+            max_tasks = settings.EXTRACTION_MAX_TASKS_PER_CHILD or None
+            if settings.EXTRACTION_MP_CONTEXT == "fork":
+                max_tasks = None
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.EXTRACTION_WORKERS or os.cpu_count(),
+                mp_context=ctx,
+                initializer=_init_worker,
+                max_tasks_per_child=max_tasks,
+            )
+            _executor_pid = pid
+    return _executor
+
+
+def _reset_executor(executor: ProcessPoolExecutor):
+    """
+    Descarta o pool; os próximos jobs vão para um pool novo. Processos ainda
+    ocupados terminam o job atual (o alarme do próprio processo limita o tempo)
+    e saem em seguida.
+    """
+    global _executor
+    with _lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def extract_text(html: str) -> str:
+    """
+    Roda o trafilatura fora do processo da API (pool de processos), com teto
+    de tamanho do HTML e timeout por job. Levanta TimeoutError se estourar.
+    """
+    if not html:
+        return ""
+
+    if len(html) > settings.EXTRACTION_MAX_HTML_CHARS:
+        logger.warning(f"HTML com {len(html)} caracteres truncado para {settings.EXTRACTION_MAX_HTML_CHARS}")
+        html = html[:settings.EXTRACTION_MAX_HTML_CHARS]
+
+    timeout = settings.EXTRACTION_TIMEOUT
+
+    if not _process_pool_allowed():
+        text = await asyncio.wait_for(asyncio.to_thread(_extract, html), timeout=timeout)
+        return text or ""
+
+    loop = asyncio.get_running_loop()
+    for tentativa in (1, 2):
+        executor = _get_executor()
+        try:
+            # folga de 1s para o alarme do processo disparar antes do prazo daqui
+            text = await asyncio.wait_for(
+                loop.run_in_executor(executor, _extract_com_prazo, html, timeout), timeout=timeout + 1
+            )
+            return text or ""
+        except _PrazoExcedido:
+            # o processo se interrompeu sozinho e segue no pool
+            raise TimeoutError(f"Extração de texto excedeu {timeout}s")
+        except asyncio.TimeoutError:
+            logger.error(f"Extração excedeu {timeout}s sem resposta do processo; reciclando pool de processos")
+            _reset_executor(executor)
+            raise TimeoutError(f"Extração de texto excedeu {timeout}s")
+        except BrokenProcessPool:
+            # processo morreu (OOM, reset por timeout de outro job...): tenta uma vez num pool novo
+            logger.warning("Pool de extração quebrado; recriando")
+            _reset_executor(executor)
+            if tentativa == 2:
+                raise
+    return ""
+
+
+def shutdown_extraction_pool():
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None and _executor_pid == os.getpid():
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+atexit.register(shutdown_extraction_pool)
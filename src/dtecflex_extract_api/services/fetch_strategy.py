@@ -0,0 +1,104 @@
+import asyncio
+import logging
+import statistics
+from typing import Any, Dict, List
+from urllib.parse import urlsplit
+
+from src.dtecflex_extract_api.config.celery import settings
+from src.dtecflex_extract_api.utils.pubsub import r_sync
+
+logger = logging.getLogger(__name__)
+
+STRATEGY_PREFIX = "capture:strategy:"
+ESTRATEGIAS = ("http", "playwright")
+_LATENCIAS_GUARDADAS = 50
+
+
+def dominio_de(url: str) -> str:
+    host = (urlsplit(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def _stats_key(dominio: str) -> str:
+    return f"{STRATEGY_PREFIX}{dominio}"
+
+
+def _lat_key(dominio: str, estrategia: str) -> str:
+    return f"{STRATEGY_PREFIX}{dominio}:lat:{estrategia}"
+
+
+def domain_stats(dominio: str) -> Dict[str, Any]:
+    """Estatísticas por estratégia: tentativas, taxa de sucesso com texto e latência mediana (ms)."""
+    raw = r_sync.hgetall(_stats_key(dominio)) or {}
+    out: Dict[str, Any] = {"dominio": dominio, "chamadas": int(raw.get("chamadas", 0))}
+    for estrategia in ESTRATEGIAS:
+        tentativas = int(raw.get(f"{estrategia}:tentativas", 0))
+        sucessos = int(raw.get(f"{estrategia}:sucessos", 0))
+        com_texto = int(raw.get(f"{estrategia}:com_texto", 0))
+        latencias = [float(v) for v in r_sync.lrange(_lat_key(dominio, estrategia), 0, -1)]
+        out[estrategia] = {
+            "tentativas": tentativas,
+            "sucessos": sucessos,
+            "com_texto": com_texto,
+            "taxa_texto": (com_texto / tentativas) if tentativas else None,
+            "latencia_mediana_ms": statistics.median(latencias) if latencias else None,
+        }
+    return out
+
+
+def _choose(dominio: str) -> List[str]:
+    padrao = list(ESTRATEGIAS)
+
+    chamadas = r_sync.hincrby(_stats_key(dominio), "chamadas", 1)
+    r_sync.expire(_stats_key(dominio), settings.FETCH_STRATEGY_TTL_DAYS * 86400)
+    if settings.FETCH_STRATEGY_PROBE_EVERY and chamadas % settings.FETCH_STRATEGY_PROBE_EVERY == 0:
+        # re-sonda periodicamente a ordem padrão para perceber se o portal mudou
+        return padrao
+
+    stats = domain_stats(dominio)
+    req, pw = stats["http"], stats["playwright"]
+    if req["tentativas"] < settings.FETCH_STRATEGY_MIN_SAMPLES:
+        return padrao
+
+    taxa_req = req["taxa_texto"] or 0.0
+    taxa_pw = pw["taxa_texto"]
+    if taxa_req >= settings.FETCH_STRATEGY_MIN_SUCCESS:
+        return padrao
+    if taxa_pw is None or taxa_pw > taxa_req:
+        return ["playwright", "http"]
+    return padrao
+
+
+def _record(dominio: str, estrategia: str, ok: bool, com_texto: bool, latencia: float):
+    key = _stats_key(dominio)
+    pipe = r_sync.pipeline()
+    pipe.hincrby(key, f"{estrategia}:tentativas", 1)
+    if ok:
+        pipe.hincrby(key, f"{estrategia}:sucessos", 1)
+        pipe.lpush(_lat_key(dominio, estrategia), round(latencia * 1000, 1))
+        pipe.ltrim(_lat_key(dominio, estrategia), 0, _LATENCIAS_GUARDADAS - 1)
+        pipe.expire(_lat_key(dominio, estrategia), settings.FETCH_STRATEGY_TTL_DAYS * 86400)
+    if com_texto:
+        pipe.hincrby(key, f"{estrategia}:com_texto", 1)
+    pipe.expire(key, settings.FETCH_STRATEGY_TTL_DAYS * 86400)
+    pipe.execute()
+
+
+async def choose_strategies(dominio: str) -> List[str]:
+    """Ordem de estratégias para o domínio; na falta de Redis/dados usa http → playwright."""
+    if not settings.FETCH_STRATEGY_ENABLED or not dominio:
+        return list(ESTRATEGIAS)
+    try:
+        return await asyncio.to_thread(_choose, dominio)
+    except Exception as e:
+        logger.warning(f"Falha ao consultar estratégia de captura para {dominio}: {e}")
+        return list(ESTRATEGIAS)
+
+
+async def record_attempt(dominio: str, estrategia: str, ok: bool, com_texto: bool, latencia: float):
+    if not settings.FETCH_STRATEGY_ENABLED or not dominio:
+        return
+    try:
+        await asyncio.to_thread(_record, dominio, estrategia, ok, com_texto, latencia)
+    except Exception as e:
+        logger.warning(f"Falha ao registrar estatística de captura para {dominio}: {e}")
@@ -0,0 +1,200 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from src.dtecflex_extract_api.config.celery import settings
+
+logger = logging.getLogger(__name__)
+
+_TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "mc_cid", "mc_eid", "amp")
+
+
+def normalize_url(url: str) -> str:
+    """Normaliza a URL para a chave do cache (host minúsculo, sem fragmento nem parâmetros de rastreio)."""
+    parts = urlsplit(url.strip())
+    scheme = (parts.scheme or "http").lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        host = f"{host}:{port}"
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(_TRACKING_PARAMS)
+    )
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+@dataclass
+class CachedPage:
+    url: str
+    html: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+    via: str
+
+    def is_fresh(self, ttl: int) -> bool:
+        return (time.time() - self.stored_at) < ttl
+
+    def validators(self) -> dict:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HtmlCache:
+    """
+    Cache local de HTML endereçado pelo hash da URL normalizada.
+
+    Cada página vira dois arquivos: o corpo comprimido (`.html.gz`) e os
+    metadados (`.json`, com ETag/Last-Modified). O mtime do `.json` marca o
+    último acesso e orienta a remoção LRU quando o diretório passa do limite.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._written_since_evict = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+        base = os.path.join(self.directory, key[:2], key)
+        return f"{base}.html.gz", f"{base}.json"
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                html = gzip.decompress(f.read()).decode("utf-8")
+            os.utime(meta_path)  # marca acesso para o LRU
+        except (OSError, ValueError):
+            return None
+        return CachedPage(
+            url=meta.get("url", url),
+            html=html,
+            etag=meta.get("etag"),
+            last_modified=meta.get("last_modified"),
+            stored_at=meta.get("stored_at", 0),
+            via=meta.get("via", ""),
+        )
+
+    def put(self, url: str, html: str, etag: Optional[str] = None,
+            last_modified: Optional[str] = None, via: str = "http"):
+        body_path, meta_path = self._paths(url)
+        body = gzip.compress(html.encode("utf-8"), compresslevel=6)
+        meta = json.dumps({
+            "url": url, "etag": etag, "last_modified": last_modified,
+            "stored_at": time.time(), "via": via, "size": len(body),
+        }).encode("utf-8")
+        try:
+            os.makedirs(os.path.dirname(body_path), exist_ok=True)
+            self._atomic_write(body_path, body)
+            self._atomic_write(meta_path, meta)
+        except OSError as e:
+            logger.warning(f"Falha ao gravar cache de HTML ({url}): {e}")
+            return
+
+        with self._lock:
+            self._written_since_evict += len(body) + len(meta)
+            precisa_evict = self._written_since_evict > self.max_bytes // 10
+            if precisa_evict:
+                self._written_since_evict = 0
+        if precisa_evict:
+            self.evict()
+
+    def touch(self, url: str):
+        """Revalidação com 304: renova o TTL sem regravar o corpo."""
+        _, meta_path = self._paths(url)
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            meta["stored_at"] = time.time()
+            self._atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+        except (OSError, ValueError):
+            pass
+
+    def invalidate(self, url: str):
+        for path in self._paths(url):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def evict(self):
+        """Remove as entradas menos acessadas até o cache ficar abaixo de 90% do limite."""
+        entradas = []
+        total = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                meta_path = os.path.join(root, name)
+                body_path = meta_path[:-len(".json")] + ".html.gz"
+                try:
+                    st = os.stat(meta_path)
+                    size = st.st_size + os.path.getsize(body_path)
+                except OSError:
+                    size, st = 0, None
+                if st is None:
+                    continue
+                total += size
+                entradas.append((st.st_mtime, size, meta_path, body_path))
+
+        if total <= self.max_bytes:
+            return
+
+        alvo = int(self.max_bytes * 0.9)
+        removidos = 0
+        for _, size, meta_path, body_path in sorted(entradas):
+            if total <= alvo:
+                break
+            for path in (meta_path, body_path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+            removidos += 1
+        logger.info(f"Cache de HTML: {removidos} entrada(s) removida(s) (LRU)")
+
+    @staticmethod
+    def _atomic_write(path: str, data: bytes):
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+
+
+_cache: Optional[HtmlCache] = None
+
+
+def get_html_cache() -> Optional[HtmlCache]:
+    """Cache do processo, ou None se desativado em settings."""
+    global _cache
+    if not settings.HTML_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        _cache = HtmlCache(settings.HTML_CACHE_DIR, settings.HTML_CACHE_MAX_MB * 1024 * 1024)
+    return _cache
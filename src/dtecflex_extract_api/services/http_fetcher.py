@@ -0,0 +1,215 @@
+import asyncio
+import codecs
+import logging
+import re
+import time
+import weakref
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from src.dtecflex_extract_api.config.celery import settings
+
+logger = logging.getLogger(__name__)
+
+_SNIFF_BYTES = 2048
+_META_CHARSET_RE = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([a-zA-Z0-9_\-]+)""", re.IGNORECASE)
+_BINARY_SIGNATURES = (
+    b"%PDF", b"PK\x03\x04", b"\x89PNG", b"\xff\xd8\xff", b"GIF8", b"RIFF",
+    b"\x1f\x8b", b"ID3", b"\x00\x00\x00", b"OggS", b"\xd0\xcf\x11\xe0",
+)
+
+
+class FetchRejected(Exception):
+    """Resposta abandonada antes do fim (não-HTML ou acima do tamanho máximo)."""
+
+    def __init__(self, motivo: str, url: str):
+        super().__init__(f"{motivo}: {url}")
+        self.motivo = motivo
+        self.url = url
+
+
+def _charset_from_content_type(content_type: str) -> Optional[str]:
+    for part in content_type.split(";")[1:]:
+        k, _, v = part.strip().partition("=")
+        if k.lower() == "charset" and v:
+            return v.strip('"\' ')
+    return None
+
+
+def _valid_codec(name: Optional[str]) -> Optional[str]:
+    if not name:
+        return None
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+
+def _looks_binary(head: bytes) -> bool:
+    start = head.lstrip()[:8]
+    return start.startswith(_BINARY_SIGNATURES) or b"\x00" in head[:_SNIFF_BYTES]
+
+
+@dataclass
+class FetchResult:
+    url: str
+    status_code: int
+    text: str
+    headers: Dict[str, str] = field(default_factory=dict)
+    elapsed: float = 0.0
+    http_version: str = ""
+
+
+class AsyncFetcher:
+    """
+    Cliente HTTP assíncrono para captura de notícias.
+
+    Mantém conexões keep-alive por host (HTTP/2 quando o servidor oferece) e
+    limita a concorrência global e por host, para que um único worker consiga
+    manter dezenas de capturas em andamento sem martelar o mesmo portal.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_per_host: int = 6,
+        http2: bool = True,
+        keepalive_expiry: float = 30.0,
+        max_bytes: int = 5 * 1024 * 1024,
+        allowed_types: tuple = ("text/html", "application/xhtml+xml"),
+    ):
+        self._client = httpx.AsyncClient(
+            http2=http2,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+        )
+        self._global = asyncio.Semaphore(max_connections)
+        self._max_per_host = max_per_host
+        # só hosts com requisição em andamento ou na fila: a entrada sai quando o último termina
+        self._per_host: Dict[str, asyncio.Semaphore] = {}
+        self._per_host_users: Dict[str, int] = {}
+        self._max_bytes = max_bytes
+        self._allowed_types = tuple(t.lower() for t in allowed_types)
+
+    @asynccontextmanager
+    async def _host_slot(self, url: str):
+        host = (urlsplit(url).hostname or "").lower()
+        sem = self._per_host.get(host)
+        if sem is None:
+            sem = self._per_host[host] = asyncio.Semaphore(self._max_per_host)
+        self._per_host_users[host] = self._per_host_users.get(host, 0) + 1
+        try:
+            async with sem:
+                yield
+        finally:
+            restantes = self._per_host_users[host] - 1
+            if restantes:
+                self._per_host_users[host] = restantes
+            else:
+                # ninguém usando nem esperando: o semáforo está livre e pode sair
+                del self._per_host_users[host]
+                del self._per_host[host]
+
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: float = 30) -> FetchResult:
+        """
+        GET em streaming: rejeita cedo respostas não-HTML ou maiores que `max_bytes`
+        e decodifica o corpo incrementalmente (charset do header ou do <meta>).
+        """
+        async with self._global, self._host_slot(url):
+            inicio = time.perf_counter()
+            async with self._client.stream("GET", url, headers=headers, timeout=timeout) as r:
+                resp_headers = dict(r.headers)
+                text = ""
+                if r.status_code == 200:
+                    text = await self._read_html(r, url)
+                return FetchResult(
+                    url=str(r.url),
+                    status_code=r.status_code,
+                    text=text,
+                    headers=resp_headers,
+                    elapsed=time.perf_counter() - inicio,
+                    http_version=r.http_version,
+                )
+
+    async def _read_html(self, r: httpx.Response, url: str) -> str:
+        content_type = r.headers.get("content-type", "")
+        mime = content_type.split(";")[0].strip().lower()
+        if mime and mime not in self._allowed_types:
+            raise FetchRejected(f"content-type não suportado ({mime})", url)
+
+        declared = r.headers.get("content-length")
+        if declared and declared.isdigit() and int(declared) > self._max_bytes:
+            raise FetchRejected(f"conteúdo de {declared} bytes acima do limite", url)
+
+        encoding = _valid_codec(_charset_from_content_type(content_type))
+        decoder = None
+        head = b""
+        partes = []
+        total = 0
+
+        async for chunk in r.aiter_bytes():
+            total += len(chunk)
+            if total > self._max_bytes:
+                raise FetchRejected(f"conteúdo acima de {self._max_bytes} bytes", url)
+            if decoder is None:
+                head += chunk
+                if len(head) < _SNIFF_BYTES:
+                    continue
+                decoder = self._start_decoder(head, encoding, url)
+                partes.append(decoder.decode(head))
+            else:
+                partes.append(decoder.decode(chunk))
+
+        if decoder is None:
+            decoder = self._start_decoder(head, encoding, url)
+            partes.append(decoder.decode(head))
+        partes.append(decoder.decode(b"", final=True))
+        return "".join(partes)
+
+    @staticmethod
+    def _start_decoder(head: bytes, encoding: Optional[str], url: str):
+        if _looks_binary(head):
+            raise FetchRejected("conteúdo binário", url)
+        if not encoding and head.startswith(codecs.BOM_UTF8):
+            encoding = "utf-8-sig"
+        if not encoding:
+            m = _META_CHARSET_RE.search(head)
+            encoding = _valid_codec(m.group(1).decode("ascii", "ignore")) if m else None
+        return codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+
+    async def aclose(self):
+        await self._client.aclose()
+
+
+# o AsyncClient fica preso ao event loop em que foi criado: um fetcher por loop
+_fetchers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncFetcher]" = weakref.WeakKeyDictionary()
+
+
+def get_http_fetcher() -> AsyncFetcher:
+    loop = asyncio.get_running_loop()
+    fetcher = _fetchers.get(loop)
+    if fetcher is None:
+        fetcher = AsyncFetcher(
+            max_connections=settings.HTTP_FETCH_MAX_CONNECTIONS,
+            max_per_host=settings.HTTP_FETCH_MAX_PER_HOST,
+            http2=settings.HTTP_FETCH_HTTP2,
+            keepalive_expiry=settings.HTTP_FETCH_KEEPALIVE_EXPIRY,
+            max_bytes=settings.HTTP_FETCH_MAX_BYTES,
+            allowed_types=tuple(settings.HTTP_FETCH_ALLOWED_CONTENT_TYPES),
+        )
+        _fetchers[loop] = fetcher
+    return fetcher
+
+
+async def close_http_fetcher():
+    fetcher = _fetchers.pop(asyncio.get_running_loop(), None)
+    if fetcher is not None:
+        await fetcher.aclose()
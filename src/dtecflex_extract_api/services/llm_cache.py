@@ -0,0 +1,183 @@
+import hashlib
+import json
+import logging
+import re
+import unicodedata
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from src.dtecflex_extract_api.config.celery import settings
+from src.dtecflex_extract_api.resources.noticias.entities.llm_extracao_cache import LlmExtracaoCacheModel
+from src.dtecflex_extract_api.utils.pubsub import r_sync
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_PREFIX = "llm:cache:"
+_WS_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Normaliza o que não muda o sentido do artigo (Unicode, espaços, quebras de linha)."""
+    text = unicodedata.normalize("NFC", text or "")
+    return _WS_RE.sub(" ", text).strip()
+
+
+def cache_key(model: str, prompt: str, text: str) -> str:
+    h = hashlib.sha256()
+    for parte in (model, prompt.strip(), normalize_text(text)):
+        h.update(parte.encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+class LlmCache:
+    """
+    Resultados da extração de nomes por (modelo, prompt, texto normalizado).
+    O modelo da chave é o que de fato respondeu (com o roteamento, pode ser o
+    econômico); quem lê decide de quais modelos aceita a resposta.
+
+    Redis responde o caso comum; a tabela TB_LLM_EXTRACAO_CACHE guarda uma cópia
+    durável para quando o Redis foi reiniciado/expurgado ou está fora do ar.
+    """
+
+    def __init__(self, ttl_days: int = 30, db_fallback: bool = True):
+        self.ttl = ttl_days * 86400
+        self.db_fallback = db_fallback
+
+    # ---------- Redis ----------
+    def _redis_get(self, chave: str) -> Optional[str]:
+        try:
+            return r_sync.get(f"{LLM_CACHE_PREFIX}{chave}")
+        except Exception as e:
+            logger.warning(f"Redis indisponível para o cache de LLM: {e}")
+            return None
+
+    def _redis_set(self, chave: str, raw: str, ttl: Optional[int] = None):
+        try:
+            r_sync.set(f"{LLM_CACHE_PREFIX}{chave}", raw, ex=ttl or self.ttl or None)
+        except Exception as e:
+            logger.warning(f"Falha ao gravar cache de LLM no Redis: {e}")
+
+    # ---------- MySQL ----------
+    def _session(self):
+        # import tardio: config.database importa o NoticiaService, que importa este módulo.
+        # A tabela TB_LLM_EXTRACAO_CACHE é criada pela migração 0003.
+        from src.dtecflex_extract_api.config.database import SessionLocal
+
+        return SessionLocal()
+
+    def _db_get(self, chave: str) -> Optional[LlmExtracaoCacheModel]:
+        db = self._session()
+        try:
+            row = db.get(LlmExtracaoCacheModel, chave)
+            if row and row.DT_EXPIRACAO and row.DT_EXPIRACAO < datetime.now():
+                db.delete(row)
+                db.commit()
+                return None
+            if row:
+                db.expunge(row)
+            return row
+        finally:
+            db.close()
+
+    def _db_put(self, chave: str, model: str, raw: str):
+        db = self._session()
+        try:
+            expira = datetime.now() + timedelta(seconds=self.ttl) if self.ttl else None
+            db.merge(LlmExtracaoCacheModel(CHAVE=chave, MODELO=model, RESULTADO=raw,
+                                           DT_CRIACAO=datetime.now(), DT_EXPIRACAO=expira))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    # ---------- API ----------
+    def get(self, model: str, prompt: str, text: str) -> Optional[List[dict]]:
+        chave = cache_key(model, prompt, text)
+        raw = self._redis_get(chave)
+
+        if raw is None and self.db_fallback:
+            try:
+                row = self._db_get(chave)
+            except Exception as e:
+                logger.warning(f"Falha ao consultar cache de LLM no banco: {e}")
+                row = None
+            if row is not None:
+                raw = row.RESULTADO
+                restante = None
+                if row.DT_EXPIRACAO:
+                    restante = max(1, int((row.DT_EXPIRACAO - datetime.now()).total_seconds()))
+                self._redis_set(chave, raw, restante)  # reaquece o Redis
+
+        if raw is None:
+            return None
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return None
+
+    def put(self, model: str, prompt: str, text: str, nomes: List[dict]):
+        chave = cache_key(model, prompt, text)
+        raw = json.dumps(nomes, ensure_ascii=False, default=str)
+        self._redis_set(chave, raw)
+        if self.db_fallback:
+            try:
+                self._db_put(chave, model, raw)
+            except Exception as e:
+                logger.warning(f"Falha ao gravar cache de LLM no banco: {e}")
+
+    def invalidate(self, model: str, prompt: str, text: str) -> bool:
+        return self.invalidate_key(cache_key(model, prompt, text))
+
+    def invalidate_key(self, chave: str) -> bool:
+        removido = False
+        try:
+            removido = bool(r_sync.delete(f"{LLM_CACHE_PREFIX}{chave}"))
+        except Exception as e:
+            logger.warning(f"Falha ao invalidar cache de LLM no Redis: {e}")
+        if self.db_fallback:
+            db = self._session()
+            try:
+                removido = bool(db.query(LlmExtracaoCacheModel)
+                                .filter(LlmExtracaoCacheModel.CHAVE == chave)
+                                .delete(synchronize_session=False)) or removido
+                db.commit()
+            finally:
+                db.close()
+        return removido
+
+    def clear(self, model: Optional[str] = None) -> int:
+        """Remove todas as entradas (ou só as de um modelo). Retorna quantas saíram do banco/Redis."""
+        total = 0
+        if model is None:
+            chaves = list(r_sync.scan_iter(f"{LLM_CACHE_PREFIX}*"))
+            for i in range(0, len(chaves), 500):
+                total += r_sync.delete(*chaves[i:i + 500])
+        if self.db_fallback:
+            db = self._session()
+            try:
+                query = db.query(LlmExtracaoCacheModel)
+                if model is not None:
+                    for (chave,) in query.filter(LlmExtracaoCacheModel.MODELO == model) \
+                                         .with_entities(LlmExtracaoCacheModel.CHAVE):
+                        r_sync.delete(f"{LLM_CACHE_PREFIX}{chave}")
+                    query = query.filter(LlmExtracaoCacheModel.MODELO == model)
+                total = max(total, query.delete(synchronize_session=False))
+                db.commit()
+            finally:
+                db.close()
+        return total
+
+
+_cache: Optional[LlmCache] = None
+
+
+def get_llm_cache() -> Optional[LlmCache]:
+    global _cache
+    if not settings.LLM_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        _cache = LlmCache(ttl_days=settings.LLM_CACHE_TTL_DAYS, db_fallback=settings.LLM_CACHE_DB_FALLBACK)
+    return _cache
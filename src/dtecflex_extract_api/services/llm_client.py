@@ -0,0 +1,97 @@
+import asyncio
+import logging
+import random
+import weakref
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+import openai
+from openai import AsyncOpenAI
+
+from src.dtecflex_extract_api.config.celery import settings
+from src.dtecflex_extract_api.services import llm_rate_limiter
+from src.dtecflex_extract_api.services.text_chunker import count_tokens
+
+logger = logging.getLogger(__name__)
+
+# o AsyncOpenAI usa um httpx.AsyncClient preso ao event loop: um cliente por loop
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = weakref.WeakKeyDictionary()
+
+
+def get_async_openai() -> AsyncOpenAI:
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        # as novas tentativas ficam por nossa conta, coordenadas pelo limitador
+        client = AsyncOpenAI(max_retries=0, timeout=settings.LLM_REQUEST_TIMEOUT)
+        _clients[loop] = client
+    return client
+
+
+async def close_async_openai():
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
+
+
+def estimate_tokens(model: str, messages: List[Dict[str, str]]) -> int:
+    entrada = sum(count_tokens(m.get("content") or "", model) + 4 for m in messages)
+    return entrada + settings.LLM_EXPECTED_OUTPUT_TOKENS
+
+
+async def _create_raw(model: str, messages: List[Dict[str, str]], estimados: int, **kwargs: Any):
+    client = get_async_openai()
+    for tentativa in range(settings.LLM_MAX_RETRIES + 1):
+        await llm_rate_limiter.acquire(model, estimados)
+        try:
+            return await client.chat.completions.with_raw_response.create(model=model, messages=messages, **kwargs)
+        except openai.RateLimitError as e:
+            if tentativa >= settings.LLM_MAX_RETRIES:
+                raise
+            espera = await llm_rate_limiter.pause(model, e.response.headers if e.response else None, tentativa)
+            logger.warning(f"429 da OpenAI ({model}); nova tentativa em {espera:.1f}s")
+            await asyncio.sleep(espera)
+        except (openai.APIConnectionError, openai.InternalServerError) as e:
+            if tentativa >= settings.LLM_MAX_RETRIES:
+                raise
+            espera = min(30.0, 2 ** tentativa) * (0.5 + random.random())
+            logger.warning(f"Falha transitória da OpenAI ({e.__class__.__name__}); nova tentativa em {espera:.1f}s")
+            await asyncio.sleep(espera)
+
+
+async def chat_completion(model: str, messages: List[Dict[str, str]], **kwargs: Any):
+    """
+    chat.completions.create com cota compartilhada por modelo (Redis) e novas
+    tentativas com backoff guiado pelos headers de rate limit da OpenAI.
+    """
+    estimados = estimate_tokens(model, messages)
+    raw = await _create_raw(model, messages, estimados, **kwargs)
+    completion = raw.parse()
+    usados = completion.usage.total_tokens if completion.usage else None
+    await llm_rate_limiter.record_response(model, raw.headers, estimados, usados)
+    return completion
+
+
+async def chat_completion_stream(model: str, messages: List[Dict[str, str]],
+                                 on_usage: Optional[Callable[[Any], None]] = None,
+                                 **kwargs: Any) -> AsyncIterator[str]:
+    """
+    Variante em streaming: devolve os pedaços de texto conforme o modelo gera.
+    As novas tentativas só acontecem antes do primeiro pedaço.
+    `on_usage` recebe o `usage` do último pedaço (tokens de entrada/saída).
+    """
+    estimados = estimate_tokens(model, messages)
+    raw = await _create_raw(model, messages, estimados, stream=True,
+                            stream_options={"include_usage": True}, **kwargs)
+    stream = raw.parse()
+    usados = None
+    try:
+        async for chunk in stream:
+            if chunk.usage:
+                usados = chunk.usage.total_tokens
+                if on_usage:
+                    on_usage(chunk.usage)
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    finally:
+        await stream.close()
+        await llm_rate_limiter.record_response(model, raw.headers, estimados, usados)
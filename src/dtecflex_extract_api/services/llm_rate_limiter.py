@@ -0,0 +1,168 @@
+import asyncio
+import logging
+import re
+from typing import Mapping, Optional, Tuple
+
+from src.dtecflex_extract_api.config.celery import settings
+from src.dtecflex_extract_api.utils.pubsub import r_sync
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_PREFIX = "llm:ratelimit:"
+_DURACAO_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_MS = {"ms": 1, "s": 1000, "m": 60_000, "h": 3_600_000}
+
+# Dois baldes (requisições e tokens) no mesmo hash, reabastecidos continuamente.
+# Usa o relógio do Redis para que todos os processos/hosts vejam o mesmo tempo.
+# Retorna 0 se a cota foi concedida ou quantos ms esperar antes de tentar de novo.
+_ACQUIRE_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local rpm = tonumber(ARGV[1])
+local tpm = tonumber(ARGV[2])
+local custo = math.min(tonumber(ARGV[3]), tpm)
+local h = redis.call('HMGET', KEYS[1], 'req', 'tok', 'ts', 'pausa')
+local pausa = tonumber(h[4]) or 0
+if pausa > now then return math.ceil(pausa - now) end
+local req = tonumber(h[1]) or rpm
+local tok = tonumber(h[2]) or tpm
+local ts = tonumber(h[3]) or now
+local dt = math.max(0, now - ts)
+req = math.min(rpm, req + dt * rpm / 60000)
+tok = math.min(tpm, tok + dt * tpm / 60000)
+local espera = 0
+if req < 1 then espera = math.max(espera, (1 - req) * 60000 / rpm) end
+if tok < custo then espera = math.max(espera, (custo - tok) * 60000 / tpm) end
+if espera == 0 then
+  req = req - 1
+  tok = tok - custo
+end
+redis.call('HSET', KEYS[1], 'req', req, 'tok', tok, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], 300000)
+return math.ceil(espera)
+"""
+
+# Ajusta o balde com o que a API informou (tokens reais consumidos, cota restante, pausa).
+_SYNC_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local delta_tok = tonumber(ARGV[1])
+local rest_req = tonumber(ARGV[2])
+local rest_tok = tonumber(ARGV[3])
+local pausa_ms = tonumber(ARGV[4])
+if delta_tok ~= 0 then redis.call('HINCRBYFLOAT', KEYS[1], 'tok', -delta_tok) end
+if rest_req >= 0 then
+  local req = tonumber(redis.call('HGET', KEYS[1], 'req') or rest_req)
+  if rest_req < req then redis.call('HSET', KEYS[1], 'req', rest_req) end
+end
+if rest_tok >= 0 then
+  local tok = tonumber(redis.call('HGET', KEYS[1], 'tok') or rest_tok)
+  if rest_tok < tok then redis.call('HSET', KEYS[1], 'tok', rest_tok) end
+end
+if pausa_ms > 0 then
+  local atual = tonumber(redis.call('HGET', KEYS[1], 'pausa') or 0)
+  if now + pausa_ms > atual then redis.call('HSET', KEYS[1], 'pausa', now + pausa_ms) end
+end
+redis.call('PEXPIRE', KEYS[1], 300000)
+return 1
+"""
+
+_acquire_script = r_sync.register_script(_ACQUIRE_LUA)
+_sync_script = r_sync.register_script(_SYNC_LUA)
+
+
+def parse_duracao_ms(valor: Optional[str]) -> Optional[float]:
+    """Converte '6m0s', '1.5s', '20ms' (formato dos headers x-ratelimit-reset-*) em ms."""
+    if not valor:
+        return None
+    valor = valor.strip()
+    try:
+        return float(valor) * 1000  # retry-after em segundos
+    except ValueError:
+        pass
+    partes = _DURACAO_RE.findall(valor)
+    if not partes:
+        return None
+    return sum(float(n) * _MS[u] for n, u in partes)
+
+
+def _limites(model: str) -> Tuple[int, int]:
+    proprio = settings.LLM_RATE_LIMITS.get(model) or {}
+    return (
+        int(proprio.get("rpm", settings.LLM_DEFAULT_RPM)),
+        int(proprio.get("tpm", settings.LLM_DEFAULT_TPM)),
+    )
+
+
+def _key(model: str) -> str:
+    return f"{RATE_LIMIT_PREFIX}{model}"
+
+
+async def acquire(model: str, tokens: int):
+    """Espera até haver cota de 1 requisição e `tokens` tokens para o modelo, no cluster todo."""
+    rpm, tpm = _limites(model)
+    if not settings.LLM_RATE_LIMIT_ENABLED or rpm <= 0 or tpm <= 0:
+        return
+    while True:
+        try:
+            espera_ms = await asyncio.to_thread(_acquire_script, keys=[_key(model)], args=[rpm, tpm, tokens])
+        except Exception as e:
+            # sem Redis não há coordenação: segue e deixa a API decidir
+            logger.warning(f"Limitador de LLM indisponível ({e}); seguindo sem cota compartilhada")
+            return
+        if not espera_ms:
+            return
+        await asyncio.sleep(min(int(espera_ms), 60_000) / 1000)
+
+
+async def record_response(model: str, headers: Mapping[str, str], tokens_estimados: int,
+                          tokens_usados: Optional[int] = None):
+    """
+    Sincroniza o balde com a resposta da API: corrige a estimativa de tokens,
+    rebaixa a cota local ao que a OpenAI diz restar e pausa todos os processos
+    até o reset quando a cota está esgotada.
+    """
+    if not settings.LLM_RATE_LIMIT_ENABLED:
+        return
+    delta = (tokens_usados - tokens_estimados) if tokens_usados is not None else 0
+
+    def _int(nome: str) -> int:
+        try:
+            return int(headers.get(nome))
+        except (TypeError, ValueError):
+            return -1
+
+    rest_req = _int("x-ratelimit-remaining-requests")
+    rest_tok = _int("x-ratelimit-remaining-tokens")
+    pausa_ms = 0.0
+    if rest_req == 0:
+        pausa_ms = max(pausa_ms, parse_duracao_ms(headers.get("x-ratelimit-reset-requests")) or 1000)
+    if 0 <= rest_tok < settings.LLM_EXPECTED_OUTPUT_TOKENS:
+        pausa_ms = max(pausa_ms, parse_duracao_ms(headers.get("x-ratelimit-reset-tokens")) or 1000)
+
+    try:
+        await asyncio.to_thread(_sync_script, keys=[_key(model)], args=[delta, rest_req, rest_tok, int(pausa_ms)])
+    except Exception as e:
+        logger.warning(f"Falha ao sincronizar limitador de LLM: {e}")
+
+
+async def pause(model: str, headers: Optional[Mapping[str, str]], tentativa: int) -> float:
+    """Após um 429: pausa o modelo no cluster (retry-after/reset ou backoff exponencial). Retorna segundos."""
+    headers = headers or {}
+    try:
+        retry_after_ms = float(headers.get("retry-after-ms"))
+    except (TypeError, ValueError):
+        retry_after_ms = None
+    espera_ms = (
+        retry_after_ms
+        or parse_duracao_ms(headers.get("retry-after"))
+        or parse_duracao_ms(headers.get("x-ratelimit-reset-requests"))
+        or min(60_000, 1000 * 2 ** tentativa)
+    )
+    if settings.LLM_RATE_LIMIT_ENABLED:
+        try:
+            await asyncio.to_thread(_sync_script, keys=[_key(model)], args=[0, -1, -1, int(espera_ms)])
+        except Exception as e:
+            logger.warning(f"Falha ao registrar pausa do limitador de LLM: {e}")
+    return espera_ms / 1000
+
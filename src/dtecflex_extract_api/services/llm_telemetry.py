@@ -0,0 +1,53 @@
+import asyncio
+from typing import Any, Optional
+
+from src.dtecflex_extract_api.utils import metrics
+
+# Limites dos histogramas (segundos / tokens / entidades)
+_SEGUNDOS = (0.25, 0.5, 1, 2, 4, 8, 16, 32, 64, 120)
+_TOKENS_ENTRADA = (250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+_TOKENS_SAIDA = (50, 100, 200, 400, 800, 1600, 3200)
+_ENTIDADES = (0, 1, 2, 5, 10, 20, 50)
+
+
+def _registrar_chamada(modelo: str, prompt: str, modo: str, duracao_s: float, usage: Any,
+                       ttft_s: Optional[float]):
+    rotulos = {"model": modelo, "prompt": prompt, "mode": modo}
+    entrada = getattr(usage, "prompt_tokens", 0) or 0
+    saida = getattr(usage, "completion_tokens", 0) or 0
+    detalhes = getattr(usage, "prompt_tokens_details", None)
+    em_cache = getattr(detalhes, "cached_tokens", 0) or 0
+
+    metrics.observe("llm_request_duration_seconds", duracao_s, _SEGUNDOS, **rotulos)
+    if ttft_s is not None:
+        metrics.observe("llm_time_to_first_token_seconds", ttft_s, _SEGUNDOS, **rotulos)
+    if usage is not None:
+        metrics.observe("llm_input_tokens", entrada, _TOKENS_ENTRADA, **rotulos)
+        metrics.observe("llm_output_tokens", saida, _TOKENS_SAIDA, **rotulos)
+        metrics.incr_serie("llm_cached_input_tokens_total", em_cache, **rotulos)
+
+
+async def registrar_chamada(modelo: str, prompt: str, modo: str, duracao_s: float, usage: Any,
+                            ttft_s: Optional[float] = None):
+    """
+    Uma chamada ao modelo: tempo total, tempo até o primeiro token (streaming) e
+    tokens de entrada/saída/em cache, rotulados por modelo, variante de prompt e modo
+    (bloco, pacote, stream).
+    """
+    await asyncio.to_thread(_registrar_chamada, modelo, prompt, modo, duracao_s, usage, ttft_s)
+
+
+async def registrar_estrategia(modo: str, estrategia: str):
+    """Qual estratégia de _extrair_json_da_resposta achou o JSON ("falha" se nenhuma)."""
+    await asyncio.to_thread(metrics.incr_serie, "llm_json_strategy_total", mode=modo, strategy=estrategia)
+
+
+def _registrar_filtro(prompt: str, retornadas: int, mantidas: int):
+    metrics.observe("llm_entities_dropped", retornadas - mantidas, _ENTIDADES, prompt=prompt)
+    metrics.incr_serie("llm_entities_returned_total", retornadas, prompt=prompt)
+    metrics.incr_serie("llm_entities_kept_total", mantidas, prompt=prompt)
+
+
+async def registrar_filtro(prompt: str, retornadas: int, mantidas: int):
+    """Entidades devolvidas pelo modelo x pessoas físicas que sobraram em _filtrar_pessoas_fisicas."""
+    await asyncio.to_thread(_registrar_filtro, prompt, retornadas, mantidas)
@@ -0,0 +1,94 @@
+import logging
+import re
+from typing import Any, Dict, List, Optional
+
+from src.dtecflex_extract_api.config.celery import settings
+from src.dtecflex_extract_api.services.name_prescreen import prescreen
+from src.dtecflex_extract_api.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+ROUTE_PREFIX = "route:"
+# o nome do modelo pode ter ":" (fine-tunes: "ft:gpt-4o-mini:org::id"); o campo é o que fica no fim
+_CAMPO_RE = re.compile(r"^(.+?):(escaladas:[^:]+|[^:]+)$")
+
+
+def escolher(modelo_principal: str, tokens: int) -> str:
+    """Modelo da primeira tentativa: o econômico para textos curtos, o principal para o resto."""
+    if not settings.LLM_ROUTING_ENABLED or not settings.LLM_MODEL_ECONOMICO:
+        return modelo_principal
+    if tokens > settings.LLM_ROUTING_MAX_TOKENS:
+        return modelo_principal
+    return settings.LLM_MODEL_ECONOMICO
+
+
+def motivo_escalada(nomes: Optional[list], truncada: bool, text: str) -> Optional[str]:
+    """
+    Por que a resposta do modelo econômico não serve (None = serve):
+    JSON ilegível, resposta cortada ou lista vazia num texto em que o
+    pré-filtro local viu nomes com prenome conhecido.
+    """
+    if nomes is None:
+        return "parse"
+    if truncada:
+        return "truncada"
+    if not nomes and prescreen(text).fortes > 0:
+        return "prescreen"
+    return None
+
+
+def custo_usd(modelo: str, tokens_entrada: int, tokens_saida: int) -> float:
+    precos = settings.LLM_MODEL_PRICES.get(modelo) or {}
+    return (tokens_entrada * precos.get("input", 0.0) + tokens_saida * precos.get("output", 0.0)) / 1_000_000
+
+
+async def registrar(modelo: str, latencia_s: float, usage: Any):
+    """Chamada, latência e tokens/custo por modelo nos contadores compartilhados."""
+    entrada = getattr(usage, "prompt_tokens", 0) or 0
+    saida = getattr(usage, "completion_tokens", 0) or 0
+    base = f"{ROUTE_PREFIX}{modelo}:"
+    await metrics.aincr(f"{base}chamadas")
+    await metrics.aincr(f"{base}latencia_ms", int(latencia_s * 1000))
+    await metrics.aincr(f"{base}tokens_entrada", entrada)
+    await metrics.aincr(f"{base}tokens_saida", saida)
+    # hincrby só aceita inteiros: custo guardado em micro-dólares
+    await metrics.aincr(f"{base}custo_micro_usd", int(custo_usd(modelo, entrada, saida) * 1_000_000))
+
+
+async def registrar_escalada(modelo: str, motivo: str, id):
+    logger.info(f"Notícia {id}: resposta de {modelo} descartada ({motivo}); escalando para o modelo principal")
+    await metrics.aincr(f"{ROUTE_PREFIX}{modelo}:escaladas")
+    await metrics.aincr(f"{ROUTE_PREFIX}{modelo}:escaladas:{motivo}")
+
+
+def stats() -> Dict[str, Any]:
+    contadores = metrics.get_counters(ROUTE_PREFIX)
+    por_modelo: Dict[str, Dict[str, int]] = {}
+    for chave, valor in contadores.items():
+        m = _CAMPO_RE.match(chave[len(ROUTE_PREFIX):])
+        if not m:
+            continue
+        modelo, campo = m.groups()
+        por_modelo.setdefault(modelo, {})[campo] = valor
+
+    rotas: List[Dict[str, Any]] = []
+    for modelo, c in sorted(por_modelo.items()):
+        chamadas = c.get("chamadas", 0)
+        escaladas = c.get("escaladas", 0)
+        rotas.append({
+            "modelo": modelo,
+            "chamadas": chamadas,
+            "latencia_media_ms": round(c.get("latencia_ms", 0) / chamadas) if chamadas else None,
+            "tokens_entrada": c.get("tokens_entrada", 0),
+            "tokens_saida": c.get("tokens_saida", 0),
+            "custo_usd": round(c.get("custo_micro_usd", 0) / 1_000_000, 4),
+            "escaladas": escaladas,
+            "taxa_escalada": round(escaladas / chamadas, 4) if chamadas else None,
+            "motivos": {k.split(":", 1)[1]: v for k, v in c.items() if k.startswith("escaladas:")},
+        })
+    return {
+        "habilitado": settings.LLM_ROUTING_ENABLED,
+        "modelo_economico": settings.LLM_MODEL_ECONOMICO,
+        "limite_tokens": settings.LLM_ROUTING_MAX_TOKENS,
+        "rotas": rotas,
+    }
@@ -0,0 +1,186 @@
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from src.dtecflex_extract_api.config.celery import settings
+from src.dtecflex_extract_api.resources.noticias.noticias_service import NoticiaService
+from src.dtecflex_extract_api.services.llm_cache import get_llm_cache
+from src.dtecflex_extract_api.services.llm_client import close_async_openai
+from src.dtecflex_extract_api.services.name_prescreen import adiar, remover_adiado
+from src.dtecflex_extract_api.utils import metrics
+
+ProgressCb = Optional[Callable[[int, int, str, dict | None], None]]
+
+
+def _empacotar(alvos: List[Tuple[int, str, str]]) -> Tuple[List[List[Tuple[int, str, str]]], List[Tuple[int, str, str]]]:
+    """Separa os artigos curtos em pacotes de até LLM_PACK_MAX_ARTICLES; os demais seguem sozinhos."""
+    if not settings.LLM_PACK_ENABLED or settings.LLM_PACK_MAX_ARTICLES < 2:
+        return [], list(alvos)
+    curtos = [a for a in alvos if len(a[1] or "") < settings.LLM_PACK_MAX_CHARS]
+    longos = [a for a in alvos if len(a[1] or "") >= settings.LLM_PACK_MAX_CHARS]
+    n = settings.LLM_PACK_MAX_ARTICLES
+    return [curtos[i:i + n] for i in range(0, len(curtos), n)], longos
+
+
+async def _extrair_lote(
+    noticia_service: NoticiaService,
+    alvos: List[Tuple[int, str, str]],
+    concurrency: int,
+    logger,
+    progress_cb: ProgressCb = None,
+    forcar: bool = False,
+) -> Dict[str, Any]:
+    sem = asyncio.Semaphore(max(1, concurrency))
+    cache = get_llm_cache()
+    total = len(alvos)
+    extraidas, sem_parse, falhas, puladas, adiadas = [], [], [], [], []
+    nomes_total = em_cache = empacotadas = 0
+
+    async def preparar(noticia_id: int, texto: str):
+        """Cache e pré-filtro; devolve o resultado final ou None se o artigo precisa ir ao modelo."""
+        # acerto de cache é contado à parte; a cota do modelo é coordenada pelo limitador
+        if cache is not None:
+            cached = await asyncio.to_thread(noticia_service.nomes_em_cache, cache, texto)
+            if cached is not None:
+                return noticia_id, cached, "cache", None
+        decisao = await noticia_service.triagem(texto, noticia_id, forcar=forcar)
+        if decisao == "defer":
+            await asyncio.to_thread(adiar, noticia_id)
+            return noticia_id, None, "defer", None
+        if decisao == "skip":
+            await metrics.aincr("prescreen:pulados")
+            return noticia_id, None, "skip", None
+        return None
+
+    async def chamar_modelo(noticia_id: int, texto: str, fonte: str, forcar_principal: bool = False):
+        # o resultado vai para o cache de LLM, consultado por GET /extrair-nomes/{id}
+        nomes = await noticia_service.extrair_nomes_do_texto(
+            texto, noticia_id, usar_cache=cache is not None, prescreen=False, fonte=fonte,
+            forcar_principal=forcar_principal,
+        )
+        if forcar and nomes is not None:
+            await asyncio.to_thread(remover_adiado, noticia_id)
+        return noticia_id, nomes, "modelo", None
+
+    async def extrair(noticia_id: int, texto: str, fonte: str):
+        async with sem:
+            try:
+                return [await preparar(noticia_id, texto) or await chamar_modelo(noticia_id, texto, fonte)]
+            except Exception as e:
+                return [(noticia_id, None, "modelo", str(e))]
+
+    async def extrair_pacote(pacote: List[Tuple[int, str, str]]):
+        saida, restantes = [], []
+        async with sem:
+            for nid, texto, fonte in pacote:
+                try:
+                    pronto = await preparar(nid, texto)
+                except Exception as e:
+                    pronto = (nid, None, "modelo", str(e))
+                if pronto:
+                    saida.append(pronto)
+                else:
+                    restantes.append((nid, texto, fonte))
+
+            por_id: Dict[int, Optional[list]] = {}
+            escaladas: Set[int] = set()
+            if len(restantes) > 1:
+                try:
+                    por_id, escaladas = await noticia_service.extrair_nomes_pacote(restantes, usar_cache=cache is not None)
+                except Exception as e:
+                    logger.warning(f"Falha na chamada empacotada ({len(restantes)} notícias): {e}; refazendo uma a uma")
+
+        for nid, texto, fonte in restantes:
+            nomes = por_id.get(nid)
+            if nomes is not None:
+                if forcar:
+                    await asyncio.to_thread(remover_adiado, nid)
+                saida.append((nid, nomes, "pacote", None))
+                continue
+            # fora do pacote (sozinho, ausente na resposta ou erro): a falha fica atribuída a esta notícia;
+            # a que o modelo econômico já errou no pacote vai direto ao principal
+            if len(restantes) > 1:
+                await metrics.aincr("pack:refeitos")
+            async with sem:
+                try:
+                    saida.append(await chamar_modelo(nid, texto, fonte, forcar_principal=nid in escaladas))
+                except Exception as e:
+                    saida.append((nid, None, "modelo", str(e)))
+        return saida
+
+    pacotes, avulsos = _empacotar(alvos)
+    try:
+        tarefas = [extrair(nid, texto, fonte) for nid, texto, fonte in avulsos]
+        tarefas += [extrair_pacote(p) for p in pacotes]
+        idx = 0
+        for tarefa in asyncio.as_completed(tarefas):
+            for noticia_id, nomes, origem, erro in await tarefa:
+                idx += 1
+                em_cache += origem == "cache"
+                empacotadas += origem == "pacote"
+
+                if origem == "skip":
+                    puladas.append(noticia_id)
+                elif origem == "defer":
+                    adiadas.append(noticia_id)
+                elif erro:
+                    logger.error(f"Falha ao extrair nomes da notícia {noticia_id}: {erro}")
+                    falhas.append(noticia_id)
+                elif nomes is None:
+                    sem_parse.append(noticia_id)
+                else:
+                    extraidas.append(noticia_id)
+                    nomes_total += len(nomes)
+
+                if progress_cb:
+                    progress_cb(idx, total, "EXTRACT", {
+                        "last": noticia_id,
+                        "extracted": len(extraidas), "cached": em_cache, "packed": empacotadas,
+                        "unparsed": len(sem_parse), "failed": len(falhas),
+                        "skipped": len(puladas), "deferred": len(adiadas),
+                    })
+    finally:
+        await close_async_openai()
+
+    return {"extracted": extraidas, "names": nomes_total, "cached": em_cache, "packed": empacotadas,
+            "unparsed": sem_parse, "failed": falhas, "skipped": puladas, "deferred": adiadas}
+
+
+def run_name_extraction(
+    noticia_service: NoticiaService,
+    alvos: List[Tuple[int, str, str]],
+    concurrency: int,
+    logger,
+    progress_cb: ProgressCb = None,
+    forcar: bool = False,
+) -> Dict[str, Any]:
+    """
+    Extrai nomes de várias notícias em paralelo e guarda o resultado no cache de LLM
+    para que GET /noticias/extrair-nomes/{id} responda sem chamar o modelo de novo.
+    Com `forcar`, ignora o pré-filtro local (ex.: reprocessar as notícias adiadas).
+    Artigos curtos vão em pacotes (várias notícias por chamada, resposta indexada pelo ID);
+    a notícia que falhar no pacote é refeita sozinha.
+    """
+    total = len(alvos)
+    if progress_cb:
+        progress_cb(0, total or 1, "START", None)
+    if not alvos:
+        return {"total": 0, "extracted": 0, "names": 0, "cached": 0, "packed": 0, "unparsed": [], "failed": [],
+                "skipped": 0, "deferred": 0}
+
+    result = asyncio.run(_extrair_lote(noticia_service, alvos, concurrency, logger, progress_cb, forcar))
+
+    summary = {
+        "total": total,
+        "extracted": len(result["extracted"]),
+        "names": result["names"],
+        "cached": result["cached"],
+        "packed": result["packed"],
+        "unparsed": result["unparsed"],
+        "failed": result["failed"],
+        "skipped": len(result["skipped"]),
+        "deferred": len(result["deferred"]),
+    }
+    if progress_cb:
+        progress_cb(total, total or 1, "SUMMARY", summary)
+    logger.info(f"Resumo extração de nomes: {summary}")
+    return summary
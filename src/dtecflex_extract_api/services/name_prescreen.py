@@ -0,0 +1,194 @@
+import math
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+from src.dtecflex_extract_api.config.celery import settings
+from src.dtecflex_extract_api.utils import metrics
+from src.dtecflex_extract_api.utils.pubsub import r_sync
+
+PRESCREEN_PREFIX = "llm:prescreen:"
+ADIADOS_KEY = f"{PRESCREEN_PREFIX}adiados"
+
+# Usados também por NoticiaService._filtrar_pessoas_fisicas para descartar organizações
+INDICADORES_ORGANIZACAO = [
+    'MINISTÉRIO', 'SERVIÇO', 'DEPARTAMENTO', 'SECRETARIA',
+    'TRIBUNAL', 'JUSTIÇA', 'POLÍCIA', 'CORPO', 'FORÇA',
+    'EMPRESA', 'LTDA', 'SA', 'ME', 'EPP'
+]
+
+# Palavras que iniciam sequências em maiúscula mas não são nomes de pessoa
+# (além de INDICADORES_ORGANIZACAO, incluídos abaixo de _sem_acento)
+_NAO_PESSOA_EXTRAS = {
+    # órgãos, cargos e instituições
+    "governo", "prefeitura", "camara", "senado",
+    "assembleia", "supremo", "superior", "procuradoria", "promotoria", "defensoria", "delegacia",
+    "receita", "banco", "caixa", "universidade", "instituto", "fundacao", "associacao", "conselho",
+    "comissao", "agencia", "operacao", "federal", "estadual", "municipal", "nacional", "civil",
+    "militar", "ibama", "pf", "prf", "mpf", "stf", "stj", "tj", "tse", "cpi", "pcc", "cv",
+    "grupo", "partido", "hospital", "escola", "igreja", "presidente", "ministro", "governador",
+    "prefeito", "vereador", "deputado", "senador", "delegado", "juiz", "juiza", "desembargador",
+    # lugares
+    "sao", "santa", "santo", "rio", "porto", "belo", "campo", "campos", "vila", "rua", "avenida",
+    "estado", "mato", "espirito", "distrito", "minas", "grande", "nova", "novo", "bairro", "brasil",
+    # início de frase / meses / dias
+    "o", "a", "os", "as", "na", "no", "nas", "nos", "em", "para", "segundo",
+    "ainda", "apos", "com", "por", "ele", "ela", "eles", "elas", "nesta", "neste", "nessa", "nesse",
+    "janeiro", "fevereiro", "marco", "abril", "maio", "junho", "julho", "agosto", "setembro",
+    "outubro", "novembro", "dezembro", "segunda", "terca", "quarta", "quinta", "sexta", "sabado",
+    "domingo", "leia", "veja", "foto", "g1", "uol",
+}
+
+# Prenomes frequentes no Brasil (sem acento, minúsculas)
+_PRENOMES = {
+    "adriana", "adriano", "alexandre", "alessandra", "alex", "aline", "amanda", "ana", "anderson",
+    "andre", "andrea", "andreia", "angela", "antonio", "antonia", "aparecida", "arthur", "augusto",
+    "beatriz", "benedito", "bernardo", "bruna", "bruno", "caio", "camila", "carla", "carlos",
+    "carolina", "cassio", "cecilia", "celso", "cesar", "claudia", "claudio", "cleber", "cristiane",
+    "cristiano", "daniel", "daniela", "danilo", "davi", "david", "debora", "denise", "diego",
+    "douglas", "edson", "eduardo", "elaine", "eliane", "elias", "elisa", "emerson", "erica",
+    "evandro", "everton", "fabiana", "fabio", "fabricio", "felipe", "fernanda", "fernando",
+    "flavia", "flavio", "francisca", "francisco", "gabriel", "gabriela", "geraldo", "gilberto",
+    "gilmar", "gilson", "giovana", "giovanni", "guilherme", "gustavo", "helena", "heitor",
+    "henrique", "hugo", "igor", "isabel", "isabela", "ivan", "jair", "jefferson", "jessica",
+    "joao", "joana", "jorge", "jose", "josefa", "joseph", "julia", "juliana", "juliano", "julio",
+    "karina", "kleber", "larissa", "laura", "leandro", "leonardo", "leticia", "lucas", "lucia",
+    "luciana", "luciano", "luis", "luiz", "luiza", "manoel", "manuel", "marcela", "marcelo",
+    "marcia", "marcio", "marco", "marcos", "maria", "mariana", "marina", "mario", "marta", "mateus",
+    "matheus", "mauricio", "mauro", "michel", "michele", "miguel", "milton", "monica", "murilo",
+    "natalia", "nelson", "nicolas", "osvaldo", "otavio", "patricia", "paula", "paulo", "pedro",
+    "priscila", "rafael", "rafaela", "raimunda", "raimundo", "raquel", "reginaldo", "renan",
+    "renata", "renato", "ricardo", "roberta", "roberto", "robson", "rodrigo", "rogerio", "ronaldo",
+    "rosa", "rosana", "rosangela", "rubens", "samuel", "sandra", "sebastiao", "sergio", "silvia",
+    "simone", "sonia", "tatiana", "thiago", "tiago", "valdir", "valeria", "vanessa", "vera",
+    "vicente", "victor", "vinicius", "vitor", "vitoria", "wagner", "walter", "wellington",
+    "wesley", "william", "wilson",
+}
+
+_CONECTORES = {"da", "de", "do", "das", "dos", "e"}
+_CONTEXTO_RE = re.compile(
+    r"\b(pres[oa]s?|prisão|suspeit[oa]s?|acusad[oa]s?|investigad[oa]s?|denunciad[oa]s?|"
+    r"condenad[oa]s?|réu|ré|indiciad[oa]s?|foragid[oa]s?|identificad[oa] como|"
+    r"\d{1,3} anos|empresári[oa]|advogad[oa]|ex-\w+)\b",
+    re.IGNORECASE,
+)
+_MAIUSCULA = r"[A-ZÁÂÃÀÉÊÍÓÔÕÚÇ][a-záâãàéêíóôõúçü'’]+"
+_SEQUENCIA_RE = re.compile(rf"{_MAIUSCULA}(?:\s+(?:(?:da|de|do|das|dos|e)\s+)?{_MAIUSCULA})+")
+
+
+def _sem_acento(s: str) -> str:
+    s = unicodedata.normalize("NFKD", s)
+    return "".join(c for c in s if not unicodedata.combining(c)).lower()
+
+
+_NAO_PESSOA = {_sem_acento(i) for i in INDICADORES_ORGANIZACAO} | _NAO_PESSOA_EXTRAS
+
+
+@dataclass
+class PrescreenResult:
+    score: float
+    candidatos: List[str] = field(default_factory=list)
+    fortes: int = 0
+    fracos: int = 0
+    contexto: int = 0
+
+
+def prescreen(text: str) -> PrescreenResult:
+    """
+    Estima (0..1) a chance de o texto citar pessoas físicas, sem chamar o modelo.
+
+    Conta sequências de 2+ palavras capitalizadas: "fortes" quando começam por um
+    prenome conhecido, "fracas" quando não parecem órgão, cargo ou lugar. Termos
+    de contexto criminal (preso, suspeito, "32 anos"...) reforçam o escore.
+    """
+    fortes = fracos = 0
+    candidatos: List[str] = []
+
+    for m in _SEQUENCIA_RE.finditer(text or ""):
+        tokens = m.group(0).split()
+        # descarta palavras de início de frase/cargos antes do nome ("O empresário João Silva")
+        while tokens and _sem_acento(tokens[0]) in _NAO_PESSOA | _CONECTORES:
+            tokens.pop(0)
+        if len([t for t in tokens if _sem_acento(t) not in _CONECTORES]) < 2:
+            continue
+        normalizados = [_sem_acento(t) for t in tokens]
+        if any(t in _NAO_PESSOA for t in normalizados if t not in _CONECTORES):
+            continue
+        if _sem_acento(tokens[0]) in _PRENOMES:
+            fortes += 1
+        else:
+            fracos += 1
+        candidatos.append(" ".join(tokens))
+
+    contexto = len(_CONTEXTO_RE.findall(text or ""))
+    bruto = fortes + 0.35 * fracos
+    score = (1 - math.exp(-bruto)) * (1.0 if contexto else 0.8)
+    return PrescreenResult(
+        score=round(score, 3),
+        candidatos=list(dict.fromkeys(candidatos)),
+        fortes=fortes,
+        fracos=fracos,
+        contexto=contexto,
+    )
+
+
+def tem_nome(trecho: str) -> bool:
+    """Trecho cita (possivelmente) uma pessoa: sequência candidata ou prenome conhecido isolado."""
+    if prescreen(trecho).candidatos:
+        return True
+    return any(
+        _sem_acento(m.group(0)) in _PRENOMES
+        for m in re.finditer(_MAIUSCULA, trecho or "")
+    )
+
+
+def score_bucket(score: float) -> str:
+    """Faixa de 0.1 usada no histograma de escores (para calibrar o limiar)."""
+    inicio = min(9, int(score * 10)) / 10
+    return f"{inicio:.1f}-{inicio + 0.1:.1f}"
+
+
+def avaliar(text: str) -> PrescreenResult:
+    """Roda o pré-filtro e registra o escore no histograma compartilhado."""
+    res = prescreen(text)
+    metrics.incr("prescreen:avaliados")
+    metrics.incr(f"prescreen:faixa:{score_bucket(res.score)}")
+    return res
+
+
+def abaixo_do_limiar(res: PrescreenResult) -> bool:
+    return settings.LLM_PRESCREEN_ENABLED and res.score < settings.LLM_PRESCREEN_THRESHOLD
+
+
+def adiar(noticia_id: int):
+    """Guarda a notícia para uma passada posterior (lote com `forcar`)."""
+    r_sync.sadd(ADIADOS_KEY, noticia_id)
+    metrics.incr("prescreen:adiados")
+
+
+def remover_adiado(noticia_id: int):
+    r_sync.srem(ADIADOS_KEY, noticia_id)
+
+
+def listar_adiados(limite: int = 1000) -> List[int]:
+    return [int(i) for i in r_sync.srandmember(ADIADOS_KEY, limite) or []]
+
+
+def stats() -> Dict[str, Any]:
+    contadores = metrics.get_counters("prescreen:")
+    avaliados = contadores.get("prescreen:avaliados", 0)
+    pulados = contadores.get("prescreen:pulados", 0)
+    adiados = contadores.get("prescreen:adiados", 0)
+    faixas = {k.rsplit(":", 1)[-1]: v for k, v in contadores.items() if k.startswith("prescreen:faixa:")}
+    return {
+        "limiar": settings.LLM_PRESCREEN_THRESHOLD,
+        "acao": settings.LLM_PRESCREEN_ACTION,
+        "avaliados": avaliados,
+        "pulados": pulados,
+        "adiados": adiados,
+        "forcados": contadores.get("prescreen:forcados", 0),
+        "taxa_pulo": round((pulados + adiados) / avaliados, 4) if avaliados else None,
+        "histograma": dict(sorted(faixas.items())),
+        "pendentes_adiados": r_sync.scard(ADIADOS_KEY),
+    }
@@ -0,0 +1,95 @@
+import re
+import unicodedata
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+# do mais grave para o mais brando: em conflito entre blocos, prevalece o mais grave
+_GRAVIDADE = ["condenado", "réu", "preso", "denunciado", "acusado", "investigado", "suspeito"]
+_BOOLEANOS = ("ENVOLVIMENTO_GOV", "FLG_PESSOA_PUBLICA", "INDICADOR_PPE")
+
+
+def normalizar_nome(nome: str) -> str:
+    nome = unicodedata.normalize("NFKD", nome or "")
+    nome = "".join(c for c in nome if not unicodedata.combining(c))
+    return re.sub(r"\s+", " ", re.sub(r"[^\w\s]", " ", nome)).strip().lower()
+
+
+def _vazio(v: Any) -> bool:
+    return v is None or (isinstance(v, str) and not v.strip())
+
+
+def _mais_frequente(valores: List[Any]) -> Any:
+    # empate: fica o que apareceu primeiro
+    contagem = Counter(valores)
+    return max(valores, key=lambda v: (contagem[v], -valores.index(v)))
+
+
+def _envolvimento(valores: List[str]) -> Optional[str]:
+    def grau(v: str) -> int:
+        v = v.strip().lower()
+        for i, termo in enumerate(_GRAVIDADE):
+            if termo in v:
+                return i
+        return len(_GRAVIDADE)
+    return min(valores, key=grau)
+
+
+def _idade(valores: List[Any]) -> Any:
+    numeros = []
+    for v in valores:
+        try:
+            numeros.append(int(v))
+        except (TypeError, ValueError):
+            continue
+    return _mais_frequente(numeros) if numeros else valores[0]
+
+
+def _reconciliar(registros: List[Dict[str, Any]]) -> Dict[str, Any]:
+    campos: List[str] = []
+    for r in registros:
+        campos.extend(k for k in r if k not in campos)
+
+    out: Dict[str, Any] = {}
+    for campo in campos:
+        valores = [r.get(campo) for r in registros if not _vazio(r.get(campo))]
+        if not valores:
+            out[campo] = registros[0].get(campo)
+        elif campo == "NOME":
+            out[campo] = max(valores, key=len)  # forma mais completa
+        elif campo == "ENVOLVIMENTO":
+            out[campo] = _envolvimento([str(v) for v in valores])
+        elif campo == "IDADE":
+            out[campo] = _idade(valores)
+        elif campo == "SEXO":
+            out[campo] = _mais_frequente([str(v).strip().upper() for v in valores])
+        elif campo in _BOOLEANOS:
+            out[campo] = any(v is True or str(v).lower() in ("true", "s", "1") for v in valores)
+        elif isinstance(valores[0], str):
+            out[campo] = max(valores, key=lambda v: len(str(v)))
+        else:
+            out[campo] = _mais_frequente(valores) if all(isinstance(v, (str, int, float, bool)) for v in valores) else valores[0]
+    return out
+
+
+def merge_nomes(listas: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    Junta as listas de nomes de vários blocos do mesmo artigo.
+
+    A mesma pessoa (nome normalizado sem acento/pontuação, ou mesmo CPF) vira um
+    único registro; SEXO/IDADE ficam com o valor mais frequente e ENVOLVIMENTO
+    com o termo mais grave. A ordem é a da primeira aparição no texto.
+    """
+    grupos: Dict[str, List[Dict[str, Any]]] = {}
+    por_cpf: Dict[str, str] = {}
+
+    for lista in listas:
+        for item in lista or []:
+            chave = normalizar_nome(item.get("NOME", ""))
+            if not chave:
+                continue
+            cpf = re.sub(r"\D", "", str(item.get("CPF") or ""))
+            if cpf and cpf.strip("0"):
+                chave = por_cpf.setdefault(cpf, chave)
+            grupos.setdefault(chave, []).append(item)
+
+    return [_reconciliar(registros) if len(registros) > 1 else registros[0] for registros in grupos.values()]
@@ -0,0 +1,61 @@
+import logging
+from typing import Any, Callable
+from urllib.parse import urlsplit
+
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from src.dtecflex_extract_api.config.celery import settings
+
+logger = logging.getLogger(__name__)
+
+MODO_TEXTO = "texto"
+MODO_COMPLETO = "completo"
+
+
+def _host_bloqueado(host: str) -> bool:
+    host = (host or "").lower()
+    return any(host == d or host.endswith(f".{d}") for d in settings.PLAYWRIGHT_BLOCKED_DOMAINS)
+
+
+def _instalar_bloqueios(page):
+    tipos_bloqueados = set(settings.PLAYWRIGHT_BLOCKED_RESOURCE_TYPES)
+
+    def handler(route):
+        req = route.request
+        if req.resource_type in tipos_bloqueados or _host_bloqueado(urlsplit(req.url).hostname):
+            return route.abort()
+        return route.continue_()
+
+    page.route("**/*", handler)
+
+
+def build_render_job(url: str, timeout_ms: int, modo: str = MODO_TEXTO) -> Callable[[Any], str]:
+    """
+    Monta o job executado pelo pool de navegadores.
+
+    - "completo": comportamento original (carrega tudo e espera `networkidle`).
+    - "texto": bloqueia imagens/fontes/mídia e domínios de anúncio/rastreamento,
+      espera só o DOMContentLoaded e devolve assim que o contêiner do artigo existir.
+    """
+    if modo == MODO_COMPLETO:
+        def render(page):
+            page.goto(url, timeout=timeout_ms)
+            page.wait_for_load_state('networkidle', timeout=timeout_ms)
+            return page.content()
+        return render
+
+    def render_texto(page):
+        _instalar_bloqueios(page)
+        page.goto(url, timeout=timeout_ms, wait_until='domcontentloaded')
+        try:
+            page.wait_for_selector(
+                settings.PLAYWRIGHT_ARTICLE_SELECTOR,
+                state='attached',
+                timeout=min(settings.PLAYWRIGHT_ARTICLE_WAIT_MS, timeout_ms),
+            )
+        except PlaywrightTimeoutError:
+            # sem contêiner reconhecível: devolve o DOM como está e deixa o trafilatura decidir
+            logger.debug(f"Contêiner do artigo não encontrado a tempo: {url}")
+        return page.content()
+
+    return render_texto
@@ -0,0 +1,92 @@
+import logging
+import re
+from functools import lru_cache
+from typing import Callable, List
+
+logger = logging.getLogger(__name__)
+
+_PARAGRAFO_RE = re.compile(r"\n\s*\n|\n")
+_FRASE_RE = re.compile(r"(?<=[.!?…])\s+")
+
+
+@lru_cache(maxsize=8)
+def _encoder(model: str):
+    try:
+        import tiktoken
+    except ImportError:
+        logger.warning("tiktoken não instalado: contagem de tokens aproximada (caracteres / 4)")
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        # o arquivo de encoding é baixado no primeiro uso: sem rede (e sem cache local) cai na aproximação
+        logger.warning(f"Encoding do tiktoken indisponível ({e}): contagem de tokens aproximada (caracteres / 4)")
+        return None
+
+
+def count_tokens(text: str, model: str = "gpt-4o") -> int:
+    enc = _encoder(model)
+    if enc is None:
+        return (len(text) + 3) // 4
+    return len(enc.encode(text, disallowed_special=()))
+
+
+def _paragrafos(text: str, max_tokens: int, contar: Callable[[str], int]) -> List[str]:
+    """Quebra em parágrafos; parágrafo maior que o limite é quebrado em frases (e, em último caso, em pedaços)."""
+    pedacos: List[str] = []
+    for par in _PARAGRAFO_RE.split(text):
+        par = par.strip()
+        if not par:
+            continue
+        if contar(par) <= max_tokens:
+            pedacos.append(par)
+            continue
+        for frase in _FRASE_RE.split(par):
+            if contar(frase) <= max_tokens:
+                pedacos.append(frase)
+                continue
+            # frase gigante sem pontuação: corta por tamanho aproximado
+            passo = max(1, len(frase) * max_tokens // max(1, contar(frase)))
+            pedacos.extend(frase[i:i + passo] for i in range(0, len(frase), passo))
+    return pedacos
+
+
+def chunk_text(text: str, max_tokens: int, overlap_tokens: int = 0, model: str = "gpt-4o") -> List[str]:
+    """
+    Divide o texto em blocos de até `max_tokens`, respeitando parágrafos.
+
+    Cada bloco repete os últimos parágrafos do anterior (até `overlap_tokens`) para
+    que uma pessoa citada na fronteira apareça com o contexto do envolvimento.
+    """
+    contar = lambda s: count_tokens(s, model)  # noqa: E731
+    if contar(text) <= max_tokens:
+        return [text]
+
+    pedacos = _paragrafos(text, max_tokens, contar)
+    # cada parágrafo conta também o separador que o junta ao anterior no bloco
+    sep = contar("\n\n")
+    tamanhos = [contar(p) + sep for p in pedacos]
+
+    blocos: List[str] = []
+    atual: List[int] = []
+    total = 0
+    for i, tam in enumerate(tamanhos):
+        if atual and total + tam > max_tokens + sep:
+            blocos.append("\n\n".join(pedacos[j] for j in atual))
+            # sobreposição: recua sobre os últimos parágrafos do bloco fechado
+            sobra: List[int] = []
+            acumulado = 0
+            for j in reversed(atual):
+                if acumulado + tamanhos[j] > overlap_tokens + sep or acumulado + tamanhos[j] + tam > max_tokens + sep:
+                    break
+                sobra.insert(0, j)
+                acumulado += tamanhos[j]
+            atual, total = sobra, acumulado
+        atual.append(i)
+        total += tam
+    if atual:
+        blocos.append("\n\n".join(pedacos[j] for j in atual))
+    return blocos
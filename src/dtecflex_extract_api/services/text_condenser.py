@@ -0,0 +1,120 @@
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from src.dtecflex_extract_api.config.celery import settings
+from src.dtecflex_extract_api.services.name_prescreen import tem_nome
+from src.dtecflex_extract_api.services.text_chunker import count_tokens
+
+_FRASE_RE = re.compile(r"(?<=[.!?…])\s+(?=[A-ZÁÂÃÀÉÊÍÓÔÕÚÇ\"“(])")
+
+# Parágrafos que nunca são conteúdo do artigo (valem para qualquer portal)
+_BOILERPLATE_GERAL = [
+    r"^\s*(leia|veja|saiba) (também|mais)\b",
+    r"^\s*(mais lidas|relacionadas|notícias relacionadas|conteúdo relacionado)\s*:?\s*$",
+    r"^\s*(foto|imagem|crédito|créditos|reprodução|divulgação|arquivo)\s*[:/|-]",
+    r"\((foto|imagem|reprodução|divulgação)\s*[:/][^)]*\)\s*$",
+    r"\b(utilizamos|usamos) cookies\b|\bpolítica de (privacidade|cookies)\b|\baceitar (todos os )?cookies\b",
+    r"^\s*(assine|assinante|faça login|cadastre-se|receba (as|nossas) notícias|inscreva-se)\b",
+    r"^\s*(compartilhe|compartilhar|siga (o|a|nosso|nossa)\b.*\b(instagram|facebook|twitter|x|whatsapp|telegram|youtube))",
+    r"\b(clique aqui|entre no (nosso )?canal|grupo (do|no) whatsapp)\b",
+    r"^\s*publicidade\s*$",
+    r"^\s*(continua (após|depois) (a )?publicidade|continue lendo)\b",
+]
+
+# Padrões específicos por FONTE (chave comparada sem acento/maiúsculas, por substring)
+_BOILERPLATE_FONTE: Dict[str, List[str]] = {
+    "g1": [r"^\s*veja os vídeos (mais assistidos|do g1)", r"^\s*▶?\s*assista", r"^\s*vídeos:"],
+    "globo": [r"^\s*veja os vídeos", r"^\s*vídeos:"],
+    "uol": [r"^\s*(uol|receba) ", r"^\s*\*\s*com informações"],
+    "folha": [r"^\s*(leia mais|assine a folha)", r"^\s*tudo sobre"],
+    "estadao": [r"^\s*(leia mais|assine o estadão)", r"^\s*estadão conteúdo\s*$"],
+    "metropoles": [r"^\s*(siga o metrópoles|receba notícias do metrópoles)", r"^\s*(quer ficar por dentro)"],
+    "cnn": [r"^\s*(assista|leia mais) (também|a cnn)"],
+}
+
+
+def _sem_acento(s: str) -> str:
+    s = unicodedata.normalize("NFKD", s or "")
+    return "".join(c for c in s if not unicodedata.combining(c)).lower()
+
+
+def _padroes(fonte: Optional[str]) -> List[re.Pattern]:
+    padroes = list(_BOILERPLATE_GERAL)
+    fonte_n = _sem_acento(fonte or "")
+    extras = {**_BOILERPLATE_FONTE, **settings.LLM_CONDENSE_PADROES_FONTE}
+    for chave, lista in extras.items():
+        if chave and _sem_acento(chave) in fonte_n:
+            padroes.extend(lista)
+    return [re.compile(p, re.IGNORECASE) for p in padroes]
+
+
+def _chave_dedup(paragrafo: str) -> str:
+    return re.sub(r"\W+", " ", _sem_acento(paragrafo)).strip()
+
+
+@dataclass
+class CondensedText:
+    texto: str
+    tokens_antes: int
+    tokens_depois: int
+    removidos: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def tokens_economizados(self) -> int:
+        return self.tokens_antes - self.tokens_depois
+
+
+def condense(text: str, fonte: Optional[str] = None, foco_nomes: bool = False,
+             contexto: int = 1, model: str = "gpt-4o") -> CondensedText:
+    """
+    Enxuga o TEXTO_NOTICIA antes de mandar ao modelo:
+
+    - remove parágrafos repetidos (comparação sem acento/pontuação);
+    - remove boilerplate conhecido ("leia também", legendas, cookies...) e o da FONTE;
+    - com `foco_nomes`, mantém só as frases com nomes candidatos e `contexto` frases em volta.
+
+    Parágrafo ou frase que cita um nome nunca é descartado (só a cópia repetida).
+    """
+    removidos = {"duplicados": 0, "boilerplate": 0, "sem_nome": 0}
+    padroes = _padroes(fonte)
+    vistos = set()
+    paragrafos: List[str] = []
+
+    for par in re.split(r"\n+", text or ""):
+        par = par.strip()
+        if not par:
+            continue
+        chave = _chave_dedup(par)
+        if chave in vistos:
+            removidos["duplicados"] += 1
+            continue
+        vistos.add(chave)
+        if any(p.search(par) for p in padroes) and not tem_nome(par):
+            removidos["boilerplate"] += 1
+            continue
+        paragrafos.append(par)
+
+    if foco_nomes:
+        frases_por_par = [_FRASE_RE.split(p) for p in paragrafos]
+        planas = [(i, f) for i, frases in enumerate(frases_por_par) for f in frases]
+        manter = set()
+        for j, (_, frase) in enumerate(planas):
+            if tem_nome(frase):
+                manter.update(range(max(0, j - contexto), min(len(planas), j + contexto + 1)))
+        if manter:
+            removidos["sem_nome"] = len(planas) - len(manter)
+            novos: Dict[int, List[str]] = {}
+            for j in sorted(manter):
+                i, frase = planas[j]
+                novos.setdefault(i, []).append(frase)
+            paragrafos = [" ".join(frases) for _, frases in sorted(novos.items())]
+
+    condensado = "\n\n".join(paragrafos)
+    return CondensedText(
+        texto=condensado,
+        tokens_antes=count_tokens(text or "", model),
+        tokens_depois=count_tokens(condensado, model),
+        removidos=removidos,
+    )
@@ -7,6 +7,7 @@ from typing import Any, Callable, Dict, List, Optional, Tuple
 import mysql.connector
 
 from src.dtecflex_extract_api.config.celery import settings
+from src.dtecflex_extract_api.services import count_cache
 ProgressCb = Optional[Callable[[int, int, str, dict | None], None]]
 CAT_ABREV = {
     'Lavagem de Dinheiro': 'LD',
@@ -143,6 +144,7 @@ def transferir_arquivo(local_pattern: str, remote_dir: str, noticia_id: int, log
                 ("205-TRANSFERED", noticia_id),
             )
             conn.commit()
+            count_cache.invalidar()
             logger.info(f"Notícia {noticia_id} -> 205-TRANSFERED")
         except mysql.connector.Error as err:
             logger.error(f"Erro ao atualizar TB_NOTICIA_RASPADA: {err}")
@@ -322,6 +324,8 @@ def insert_names_to_aux(noticias, logger):
                 not_published_news.append(news_id)
 
         conn.commit()
+        if published_news:
+            count_cache.invalidar()
         # ✅ corrige o log
         logger.info(f"Total de nomes inseridos na Auxiliar: {total_inserted}")
 
@@ -1,2 +1,4 @@
 from .test import *
-from .transfer import *
\ No newline at end of file
+from .transfer import *
+from .capture import *
+from .extraction import *
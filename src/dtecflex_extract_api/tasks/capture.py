@@ -0,0 +1,51 @@
+from datetime import datetime
+
+from celery.signals import worker_process_shutdown
+from celery.utils.log import get_task_logger
+from src.dtecflex_extract_api.tasks.job_progress import JobProgress
+from src.dtecflex_extract_api.config.celery import celery_app, settings
+from src.dtecflex_extract_api.config.database import SessionLocal
+from src.dtecflex_extract_api.resources.noticias.noticias_service import NoticiaService
+from src.dtecflex_extract_api.services.browser_pool import shutdown_browser_pool
+from src.dtecflex_extract_api.services.capture_service import run_capture
+
+logger = get_task_logger(__name__)
+
+@worker_process_shutdown.connect
+def _close_browser_pool(**kwargs):
+    shutdown_browser_pool()
+
+@celery_app.task(name="dtecflex.capture_batch", bind=True, queue="capture",
+                 max_retries=0, soft_time_limit=60*60)
+def capture_batch_task(self, ids: list[int] | None = None, data: str | None = None,
+                       categoria: str | None = None, status: list[str] | None = None,
+                       somente_sem_texto: bool = True, usar_cache: bool = True,
+                       job_key: str | None = None):
+    job = JobProgress(self, job_key, date=data, category=categoria)
+    db = SessionLocal()
+    try:
+        data_inicio = data_fim = None
+        if data:
+            d = datetime.strptime(data, "%Y-%m-%d")
+            data_inicio = d
+            data_fim = d.replace(hour=23, minute=59, second=59, microsecond=999999)
+
+        noticia_service = NoticiaService(session=db)
+        alvos = noticia_service.listar_alvos_captura(
+            ids=ids, data_inicio=data_inicio, data_fim=data_fim, categoria=categoria,
+            status=status, somente_sem_texto=somente_sem_texto,
+            limite=settings.CAPTURE_BATCH_MAX_ITEMS,
+        )
+
+        result = run_capture(noticia_service, alvos, settings.CAPTURE_BATCH_CONCURRENCY,
+                             logger=logger, progress_cb=job.progress, usar_cache=usar_cache)
+
+        job.done(result)
+        return result
+
+    except Exception as e:
+        job.fail(e)
+        raise
+    finally:
+        db.close()
+        job.release()
@@ -0,0 +1,45 @@
+from datetime import datetime
+
+from celery.utils.log import get_task_logger
+from src.dtecflex_extract_api.tasks.job_progress import JobProgress
+from src.dtecflex_extract_api.config.celery import celery_app, settings
+from src.dtecflex_extract_api.config.database import SessionLocal
+from src.dtecflex_extract_api.resources.noticias.noticias_service import NoticiaService
+from src.dtecflex_extract_api.services.name_extraction_service import run_name_extraction
+
+logger = get_task_logger(__name__)
+
+@celery_app.task(name="dtecflex.extract_names_batch", bind=True, queue="llm",
+                 max_retries=0, soft_time_limit=2*60*60)
+def extract_names_batch_task(self, ids: list[int] | None = None, data: str | None = None,
+                             categoria: str | None = None, status: list[str] | None = None,
+                             forcar: bool = False, job_key: str | None = None):
+    job = JobProgress(self, job_key, date=data, category=categoria)
+    db = SessionLocal()
+    try:
+        data_inicio = data_fim = None
+        if data:
+            d = datetime.strptime(data, "%Y-%m-%d")
+            data_inicio = d
+            data_fim = d.replace(hour=23, minute=59, second=59, microsecond=999999)
+
+        noticia_service = NoticiaService(session=db)
+        alvos = noticia_service.listar_alvos_extracao(
+            ids=ids, data_inicio=data_inicio, data_fim=data_fim, categoria=categoria,
+            status=status, limite=settings.LLM_BATCH_MAX_ITEMS,
+        )
+        # os textos já estão em memória: libera a conexão durante as chamadas ao modelo
+        db.close()
+
+        result = run_name_extraction(noticia_service, alvos, settings.LLM_BATCH_CONCURRENCY,
+                                     logger=logger, progress_cb=job.progress, forcar=forcar)
+
+        job.done(result)
+        return result
+
+    except Exception as e:
+        job.fail(e)
+        raise
+    finally:
+        db.close()
+        job.release()
@@ -0,0 +1,41 @@
+from src.dtecflex_extract_api.utils.pubsub import publish, release_lock, save_meta
+
+
+class JobProgress:
+    """
+    Eventos PROGRESS/DONE/FAILED de um job Celery: grava o meta do job,
+    publica no canal de pub/sub (/ws/...) e atualiza o estado da task.
+    `contexto` vai em todos os payloads (ex.: date/category).
+    """
+
+    def __init__(self, task, key: str | None, **contexto):
+        self.task = task
+        self.key = key
+        self.contexto = contexto
+
+    def _emitir(self, payload: dict):
+        payload = {"task_id": self.task.request.id, **payload, **self.contexto, "key": self.key}
+        save_meta(self.key, **payload)
+        publish(self.key, payload)
+        return payload
+
+    def progress(self, step: int, total: int, phase: str, extra: dict | None = None):
+        pct = int((step / total) * 100) if total else 0
+        payload = self._emitir({
+            "event": "PROGRESS",
+            "progress": pct,
+            "state": phase,
+            "step": step, "total": total,
+            **(extra or {}),
+        })
+        self.task.update_state(state="PROGRESS", meta=payload)
+
+    def done(self, result):
+        self._emitir({"event": "DONE", "progress": 100, "state": "DONE", "result": result})
+
+    def fail(self, error: Exception):
+        self._emitir({"event": "FAILED", "progress": 0, "state": "FAILED", "error": str(error)})
+
+    def release(self):
+        if self.key:
+            release_lock(self.key)
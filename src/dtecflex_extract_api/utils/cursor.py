@@ -0,0 +1,29 @@
+import base64
+import json
+from typing import Any, Dict
+
+
+def encode_cursor(dados: Dict[str, Any]) -> str:
+    """Token opaco (base64 url-safe de um JSON compacto) para paginação por chave."""
+    bruto = json.dumps(dados, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(bruto).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Dict[str, Any]:
+    """Inverso de encode_cursor; ValueError se o token não for um cursor válido."""
+    try:
+        bruto = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        dados = json.loads(bruto)
+    except (ValueError, TypeError) as e:
+        raise ValueError("cursor inválido") from e
+    if not isinstance(dados, dict):
+        raise ValueError("cursor inválido")
+    # JSON bem formado não basta: os campos chegam direto ao filtro da consulta
+    ref = dados.get("id")
+    if ref is not None and (isinstance(ref, bool) or not isinstance(ref, int)):
+        raise ValueError("cursor inválido")
+    if dados.get("d", "n") not in ("n", "p"):
+        raise ValueError("cursor inválido")
+    if not isinstance(dados.get("s", ""), str):
+        raise ValueError("cursor inválido")
+    return dados
@@ -0,0 +1,77 @@
+import json
+import logging
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class JsonArrayStream:
+    """
+    Parser incremental de um array JSON de objetos que chega em pedaços.
+
+    `feed()` devolve os objetos de primeiro nível que ficaram completos com o
+    pedaço recebido. Ignora o que vem antes do '[' (ex.: "```json") e depois
+    do ']' final; objeto malformado é descartado sem interromper o resto.
+    """
+
+    def __init__(self):
+        self._buf: List[str] = []
+        self._iniciado = False
+        self._terminado = False
+        self._profundidade = 0
+        self._em_string = False
+        self._escape = False
+        self.texto = ""  # resposta bruta acumulada, para fallback no fim
+
+    def feed(self, pedaco: str) -> List[Dict[str, Any]]:
+        self.texto += pedaco
+        objetos: List[Dict[str, Any]] = []
+        if self._terminado:
+            return objetos
+
+        for c in pedaco:
+            if not self._iniciado:
+                if c == '[':
+                    self._iniciado = True
+                continue
+
+            if self._profundidade == 0:
+                if c == '{':
+                    self._profundidade = 1
+                    self._buf = [c]
+                elif c == ']':
+                    self._terminado = True
+                    break
+                continue
+
+            self._buf.append(c)
+            if self._em_string:
+                if self._escape:
+                    self._escape = False
+                elif c == '\\':
+                    self._escape = True
+                elif c == '"':
+                    self._em_string = False
+                continue
+
+            if c == '"':
+                self._em_string = True
+            elif c in '{[':
+                self._profundidade += 1
+            elif c in '}]':
+                self._profundidade -= 1
+                if self._profundidade == 0:
+                    bruto = "".join(self._buf)
+                    self._buf = []
+                    try:
+                        obj = json.loads(bruto)
+                    except json.JSONDecodeError:
+                        logger.debug(f"Objeto JSON malformado no stream descartado: {bruto[:200]}")
+                        continue
+                    if isinstance(obj, dict):
+                        objetos.append(obj)
+        return objetos
+
+    @property
+    def iniciado(self) -> bool:
+        return self._iniciado
@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import re
+from typing import Any, Dict, List, Sequence, Tuple
+
+from src.dtecflex_extract_api.utils.pubsub import r_sync
+
+logger = logging.getLogger(__name__)
+
+METRICS_PREFIX = "metrics:"
+COUNTERS_KEY = f"{METRICS_PREFIX}counters"
+# séries rotuladas no formato do Prometheus (campo = "nome{rotulos}")
+SERIES_KEY = f"{METRICS_PREFIX}series"
+
+
+def incr(nome: str, valor: int = 1):
+    """Contador compartilhado entre processos (API e workers). Falha de Redis não interrompe o fluxo."""
+    try:
+        r_sync.hincrby(COUNTERS_KEY, nome, valor)
+    except Exception as e:
+        logger.debug(f"Falha ao incrementar métrica {nome}: {e}")
+
+
+async def aincr(nome: str, valor: int = 1):
+    await asyncio.to_thread(incr, nome, valor)
+
+
+def get_counters(prefixo: str = "") -> Dict[str, int]:
+    raw = r_sync.hgetall(COUNTERS_KEY) or {}
+    return {k: int(v) for k, v in raw.items() if k.startswith(prefixo)}
+
+
+def reset_counters(prefixo: str) -> int:
+    campos = [k for k in (r_sync.hkeys(COUNTERS_KEY) or []) if k.startswith(prefixo)]
+    if campos:
+        r_sync.hdel(COUNTERS_KEY, *campos)
+    return len(campos)
+
+
+def _escapar(valor: Any) -> str:
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _serie(nome: str, rotulos: Dict[str, Any]) -> str:
+    if not rotulos:
+        return nome
+    corpo = ",".join(f'{k}="{_escapar(v)}"' for k, v in sorted(rotulos.items()))
+    return f"{nome}{{{corpo}}}"
+
+
+def _fmt_le(limite: float) -> str:
+    return f"{limite:g}"
+
+
+def incr_serie(nome: str, valor: float = 1, **rotulos: Any):
+    """Contador rotulado (ex.: incr_serie("llm_json_strategy_total", estrategia="fence"))."""
+    try:
+        r_sync.hincrbyfloat(SERIES_KEY, _serie(nome, rotulos), valor)
+    except Exception as e:
+        logger.debug(f"Falha ao incrementar série {nome}: {e}")
+
+
+def observe(nome: str, valor: float, buckets: Sequence[float], **rotulos: Any):
+    """Histograma cumulativo (buckets `le`, _sum e _count), compartilhado entre processos."""
+    try:
+        pipe = r_sync.pipeline(transaction=False)
+        for limite in buckets:
+            if valor <= limite:
+                pipe.hincrby(SERIES_KEY, _serie(f"{nome}_bucket", {**rotulos, "le": _fmt_le(limite)}), 1)
+        pipe.hincrby(SERIES_KEY, _serie(f"{nome}_bucket", {**rotulos, "le": "+Inf"}), 1)
+        pipe.hincrbyfloat(SERIES_KEY, _serie(f"{nome}_sum", rotulos), valor)
+        pipe.hincrby(SERIES_KEY, _serie(f"{nome}_count", rotulos), 1)
+        pipe.execute()
+    except Exception as e:
+        logger.debug(f"Falha ao registrar observação {nome}: {e}")
+
+
+_LE_RE = re.compile(r'le="([^"]*)"')
+_SUFIXOS = {"_bucket": 0, "_sum": 1, "_count": 2}
+
+
+def _ordem(serie: str, base: str) -> Tuple[str, int, float]:
+    nome, _, rotulos = serie.partition("{")
+    le = _LE_RE.search(rotulos)
+    sufixo = nome[len(base):]
+    limite = float("inf") if not le or le.group(1) == "+Inf" else float(le.group(1))
+    outros = ",".join(p for p in rotulos.rstrip("}").split(",") if p and not p.startswith("le="))
+    return outros, _SUFIXOS.get(sufixo, 0), limite
+
+
+def _num(valor: Any) -> str:
+    f = float(valor)
+    return str(int(f)) if f.is_integer() else repr(f)
+
+
+def render_prometheus() -> str:
+    """Contadores e histogramas no formato de texto do Prometheus (para GET /api/metrics)."""
+    linhas: List[str] = []
+
+    contadores = get_counters()
+    if contadores:
+        linhas += ["# HELP dtecflex_counter Contadores internos por nome", "# TYPE dtecflex_counter counter"]
+        linhas += [f"{_serie('dtecflex_counter', {'name': k})} {v}" for k, v in sorted(contadores.items())]
+
+    series = r_sync.hgetall(SERIES_KEY) or {}
+    nomes = {s.partition("{")[0] for s in series}
+    grupos: Dict[str, List[Tuple[str, Any]]] = {}
+    for serie, valor in series.items():
+        nome = serie.partition("{")[0]
+        base = re.sub(r"_(bucket|sum|count)$", "", nome)
+        if f"{base}_bucket" not in nomes:
+            base = nome
+        grupos.setdefault(base, []).append((serie, valor))
+
+    for base in sorted(grupos):
+        tipo = "histogram" if f"{base}_bucket" in nomes else "counter"
+        linhas.append(f"# TYPE {base} {tipo}")
+        for serie, valor in sorted(grupos[base], key=lambda sv: _ordem(sv[0], base)):
+            linhas.append(f"{serie} {_num(valor)}")
+
+    return "\n".join(linhas) + "\n"
@@ -1,4 +1,4 @@
-import json, time
+import hashlib, json, time
 import redis
 import redis.asyncio as aioredis
 from src.dtecflex_extract_api.config.celery import settings
@@ -10,11 +10,25 @@ r_async = aioredis.from_url(REDIS_URL, decode_responses=True)
 CHANNEL_PREFIX = "publish:ch:" 
 LOCK_PREFIX    = "publish:lock:"
 META_PREFIX    = "publish:meta:"
+CAPTURE_PREFIX = "capture:"
+EXTRACTION_PREFIX = "extraction:"
 
 def job_key(date_dir: str, category: str | None, cat_prefix: str | None) -> str:
     base = f"{cat_prefix}{date_dir}" if cat_prefix else f"ALL:{date_dir}"
     return base
 
+def _batch_job_key(prefix: str, date_dir: str | None, cat_prefix: str | None, ids: list[int] | None) -> str:
+    if ids:
+        digest = hashlib.sha1(",".join(str(i) for i in sorted(set(ids))).encode()).hexdigest()[:12]
+        return f"{prefix}ids:{digest}"
+    return f"{prefix}{job_key(date_dir, None, cat_prefix)}"
+
+def capture_job_key(date_dir: str | None = None, cat_prefix: str | None = None, ids: list[int] | None = None) -> str:
+    return _batch_job_key(CAPTURE_PREFIX, date_dir, cat_prefix, ids)
+
+def extraction_job_key(date_dir: str | None = None, cat_prefix: str | None = None, ids: list[int] | None = None) -> str:
+    return _batch_job_key(EXTRACTION_PREFIX, date_dir, cat_prefix, ids)
+
 def channel_name(key: str) -> str: return f"{CHANNEL_PREFIX}{key}"
 def lock_key(key: str) -> str:    return f"{LOCK_PREFIX}{key}"
 def meta_key(job_key: str) -> str:
@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, APIRouter
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordBearer
@@ -5,12 +7,27 @@ from fastapi.security import OAuth2PasswordBearer
 from src.dtecflex_extract_api.resources.noticias.noticias_router import router as noticias_router
 from src.dtecflex_extract_api.resources.auth.auth_router import router as auth_router
 from src.dtecflex_extract_api.resources.ws.ws_router import router as ws_router
+from src.dtecflex_extract_api.resources.metrics.metrics_router import router as metrics_router
+from src.dtecflex_extract_api.services.extraction_pool import shutdown_extraction_pool
+from src.dtecflex_extract_api.services.http_fetcher import close_http_fetcher
+from src.dtecflex_extract_api.services.llm_client import close_async_openai
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # fecha as conexões keep-alive do fetcher de notícias
+    await close_http_fetcher()
+    await close_async_openai()
+    shutdown_extraction_pool()
+
 
 app = FastAPI(
     title="Relações PEP API",
     version="1.0",
     docs_url="/api/docs",
     openapi_url="/api/openapi.json",
+    lifespan=lifespan,
 )
 
 app.add_middleware(CORSMiddleware,
@@ -25,4 +42,5 @@ api = APIRouter(prefix="/api")
 api.include_router(noticias_router, prefix="/noticias", tags=["Notícias"])
 api.include_router(auth_router,     prefix="/auth",     tags=["Auth"])
 api.include_router(ws_router,       tags=["WebSocket"])
+api.include_router(metrics_router,  tags=["Métricas"])
 app.include_router(api)
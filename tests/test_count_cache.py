@@ -0,0 +1,31 @@
+from datetime import date
+
+from src.dtecflex_extract_api.services.count_cache import assinatura
+
+
+def test_assinatura_nao_depende_da_ordem_das_chaves_nem_do_status():
+    a = assinatura({"STATUS": ["10-URL-OK", "201-APROVADA"], "FONTE": "g1"})
+    b = assinatura({"FONTE": "g1", "STATUS": ["201-APROVADA", "10-URL-OK"]})
+
+    assert a == b
+
+
+def test_assinatura_ignora_filtros_vazios():
+    assert assinatura({"FONTE": "g1", "CATEGORIA": None, "TITULO": "", "STATUS": []}) == assinatura({"FONTE": "g1"})
+    assert assinatura(None) == assinatura({})
+
+
+def test_assinatura_respeita_a_ordem_das_tuplas_de_intervalo():
+    inicio, fim = date(2024, 1, 1), date(2024, 1, 31)
+
+    assert assinatura({"PERIODO": (inicio, fim)}) != assinatura({"PERIODO": (fim, inicio)})
+
+
+def test_assinatura_com_datas():
+    assert assinatura({"DATA": date(2024, 5, 1)}) == assinatura({"DATA": "2024-05-01"})
+    assert assinatura({"DATA": date(2024, 5, 1)}) != assinatura({"DATA": date(2024, 5, 2)})
+
+
+def test_assinatura_distingue_filtros_diferentes():
+    assert assinatura({"FONTE": "g1"}) != assinatura({"FONTE": "uol"})
+    assert assinatura({"FONTE": "g1"}) != assinatura({"CATEGORIA": "g1"})
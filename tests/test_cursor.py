@@ -0,0 +1,39 @@
+import base64
+
+import pytest
+
+from src.dtecflex_extract_api.utils.cursor import decode_cursor, encode_cursor
+
+
+def test_ida_e_volta_preserva_o_cursor():
+    cursor = {"id": 123456, "d": "p", "s": "12.345678"}
+    assert decode_cursor(encode_cursor(cursor)) == cursor
+
+
+def test_token_e_url_safe_e_sem_padding():
+    token = encode_cursor({"id": 1, "d": "n", "s": "~~~???>>>"})
+    assert "=" not in token
+    assert not set(token) & set("+/")
+
+
+def test_padding_removido_e_reposto_na_leitura():
+    assert decode_cursor("e30") == {}  # "{}"
+
+
+@pytest.mark.parametrize("token", ["", "não-é-base64!", base64.urlsafe_b64encode(b"[1, 2]").decode()])
+def test_token_invalido_levanta_value_error(token):
+    with pytest.raises(ValueError):
+        decode_cursor(token)
+
+
+@pytest.mark.parametrize("dados", [
+    {"id": [1]},
+    {"id": {}},
+    {"id": "10"},
+    {"id": True},
+    {"id": 10, "d": "x"},
+    {"id": 10, "d": "n", "s": 1.5},
+])
+def test_campos_com_tipo_errado_levantam_value_error(dados):
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor(dados))
@@ -0,0 +1,81 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.dtecflex_extract_api.services.http_fetcher import AsyncFetcher, FetchRejected
+
+URL = "https://portal.exemplo.com.br/noticia"
+
+
+def _buscar(handler, max_bytes=1024 * 1024):
+    async def rodar():
+        fetcher = AsyncFetcher(http2=False, max_bytes=max_bytes)
+        await fetcher._client.aclose()
+        fetcher._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await fetcher.get(URL), fetcher
+        finally:
+            await fetcher.aclose()
+
+    return asyncio.run(rodar())
+
+
+def _html(corpo: bytes, content_type="text/html; charset=utf-8", **headers):
+    return lambda request: httpx.Response(200, content=corpo, headers={"content-type": content_type, **headers})
+
+
+def test_html_utf8():
+    res, _ = _buscar(_html("<html><p>Operação</p></html>".encode("utf-8")))
+
+    assert res.status_code == 200
+    assert "Operação" in res.text
+
+
+def test_charset_do_meta_quando_o_header_nao_informa():
+    corpo = '<html><head><meta charset="iso-8859-1"></head><p>Operação</p></html>'.encode("latin-1")
+
+    res, _ = _buscar(_html(corpo, content_type="text/html"))
+
+    assert "Operação" in res.text
+
+
+def test_rejeita_content_type_nao_html():
+    with pytest.raises(FetchRejected, match="content-type"):
+        _buscar(_html(b"{}", content_type="application/json"))
+
+
+def test_rejeita_assinatura_de_pdf_servido_como_html():
+    with pytest.raises(FetchRejected, match="binário"):
+        _buscar(_html(b"%PDF-1.7\n" + b"x" * 100))
+
+
+def test_rejeita_content_length_acima_do_limite():
+    with pytest.raises(FetchRejected, match="acima do limite"):
+        _buscar(_html(b"<html></html>", **{"content-length": "5000"}), max_bytes=1000)
+
+
+def test_rejeita_corpo_acima_do_limite_sem_content_length():
+    async def pedacos():
+        for _ in range(10):
+            yield b"<p>" + b"x" * 500 + b"</p>"
+
+    def handler(request):
+        return httpx.Response(200, content=pedacos(), headers={"content-type": "text/html"})
+
+    with pytest.raises(FetchRejected, match="acima de 1000 bytes"):
+        _buscar(handler, max_bytes=1000)
+
+
+def test_status_diferente_de_200_nao_le_o_corpo():
+    res, _ = _buscar(lambda request: httpx.Response(404, content=b"%PDF", headers={"content-type": "application/pdf"}))
+
+    assert res.status_code == 404
+    assert res.text == ""
+
+
+def test_semaforo_do_host_sai_apos_a_requisicao():
+    _, fetcher = _buscar(_html(b"<html></html>"))
+
+    assert fetcher._per_host == {}
+    assert fetcher._per_host_users == {}
@@ -0,0 +1,37 @@
+from src.dtecflex_extract_api.utils.json_stream import JsonArrayStream
+
+
+def _alimentar(parser: JsonArrayStream, texto: str, passo: int) -> list:
+    objetos = []
+    for i in range(0, len(texto), passo):
+        objetos.extend(parser.feed(texto[i:i + passo]))
+    return objetos
+
+
+def test_emite_cada_objeto_assim_que_fecha_mesmo_em_pedacos_de_um_caractere():
+    resposta = '```json\n[{"NOME": "Ana {Maria}", "OBS": "aspas \\" e ]"}, {"NOME": "Rui", "X": [1, {"y": 2}]}]\n```'
+    parser = JsonArrayStream()
+
+    objetos = _alimentar(parser, resposta, 1)
+
+    assert objetos == [{"NOME": "Ana {Maria}", "OBS": 'aspas " e ]'}, {"NOME": "Rui", "X": [1, {"y": 2}]}]
+    assert parser.iniciado
+    assert parser.texto == resposta
+
+
+def test_objeto_malformado_e_descartado_sem_parar_o_resto():
+    parser = JsonArrayStream()
+    objetos = _alimentar(parser, '[{"NOME": "Ana",}, {"NOME": "Rui"}]', 5)
+    assert objetos == [{"NOME": "Rui"}]
+
+
+def test_ignora_o_que_vem_depois_do_array():
+    parser = JsonArrayStream()
+    assert parser.feed('[{"NOME": "Ana"}] e depois [{"NOME": "Outro"}]') == [{"NOME": "Ana"}]
+    assert parser.feed('{"NOME": "Mais"}') == []
+
+
+def test_resposta_sem_array_nao_inicia():
+    parser = JsonArrayStream()
+    assert parser.feed('Nenhuma pessoa física citada.') == []
+    assert not parser.iniciado
@@ -0,0 +1,70 @@
+import pytest
+
+from src.dtecflex_extract_api.services import model_router
+from src.dtecflex_extract_api.services.model_router import custo_usd, escolher, motivo_escalada
+
+
+@pytest.fixture
+def roteamento(monkeypatch):
+    monkeypatch.setattr(model_router.settings, "LLM_ROUTING_ENABLED", True)
+    monkeypatch.setattr(model_router.settings, "LLM_MODEL_ECONOMICO", "gpt-4o-mini")
+    monkeypatch.setattr(model_router.settings, "LLM_ROUTING_MAX_TOKENS", 1500)
+    return model_router.settings
+
+
+def test_escolher_texto_curto_vai_ao_economico(roteamento):
+    assert escolher("gpt-4o", 1500) == "gpt-4o-mini"
+    assert escolher("gpt-4o", 1501) == "gpt-4o"
+
+
+def test_escolher_sem_roteamento_usa_o_principal(roteamento, monkeypatch):
+    monkeypatch.setattr(roteamento, "LLM_MODEL_ECONOMICO", "")
+    assert escolher("gpt-4o", 10) == "gpt-4o"
+
+    monkeypatch.setattr(roteamento, "LLM_MODEL_ECONOMICO", "gpt-4o-mini")
+    monkeypatch.setattr(roteamento, "LLM_ROUTING_ENABLED", False)
+    assert escolher("gpt-4o", 10) == "gpt-4o"
+
+
+def test_motivo_escalada_json_ilegivel_e_truncada():
+    assert motivo_escalada(None, False, "") == "parse"
+    assert motivo_escalada([{"NOME": "João Silva"}], True, "") == "truncada"
+
+
+def test_motivo_escalada_lista_vazia_contra_o_prefiltro():
+    texto = "O empresário João Carlos da Silva, de 45 anos, foi preso."
+
+    assert motivo_escalada([], False, texto) == "prescreen"
+    assert motivo_escalada([], False, "A reunião foi adiada para a próxima semana.") is None
+
+
+def test_motivo_escalada_resposta_aceita():
+    assert motivo_escalada([{"NOME": "João Carlos da Silva"}], False, "João Carlos da Silva") is None
+
+
+def test_custo_usd(roteamento, monkeypatch):
+    monkeypatch.setattr(roteamento, "LLM_MODEL_PRICES", {"m": {"input": 2.0, "output": 8.0}})
+
+    assert custo_usd("m", 1_000_000, 500_000) == pytest.approx(6.0)
+    assert custo_usd("desconhecido", 1000, 1000) == 0
+
+
+def test_stats_agrupa_modelos_com_dois_pontos_no_nome(roteamento, monkeypatch):
+    ft = "ft:gpt-4o-mini:org::abc123"
+    contadores = {
+        f"route:{ft}:chamadas": 4,
+        f"route:{ft}:latencia_ms": 800,
+        f"route:{ft}:escaladas": 2,
+        f"route:{ft}:escaladas:parse": 1,
+        f"route:{ft}:escaladas:prescreen": 1,
+        "route:gpt-4o:chamadas": 2,
+    }
+    monkeypatch.setattr(model_router.metrics, "get_counters", lambda prefixo: contadores)
+
+    rotas = {r["modelo"]: r for r in model_router.stats()["rotas"]}
+
+    assert set(rotas) == {ft, "gpt-4o"}
+    assert rotas[ft]["chamadas"] == 4
+    assert rotas[ft]["latencia_media_ms"] == 200
+    assert rotas[ft]["taxa_escalada"] == 0.5
+    assert rotas[ft]["motivos"] == {"parse": 1, "prescreen": 1}
@@ -0,0 +1,54 @@
+from src.dtecflex_extract_api.services.name_prescreen import (
+    INDICADORES_ORGANIZACAO, prescreen, score_bucket, tem_nome,
+)
+
+
+def test_prescreen_nome_com_prenome_conhecido_e_contexto():
+    res = prescreen("O empresário João Carlos da Silva, de 45 anos, foi preso nesta terça.")
+
+    assert res.fortes == 1
+    assert res.contexto >= 1
+    assert res.score > 0.2
+    assert res.candidatos == ["João Carlos da Silva"]
+
+
+def test_prescreen_ignora_orgaos_e_lugares():
+    res = prescreen(
+        "O Ministério Público Federal e a Polícia Federal deflagraram a operação "
+        "em São Paulo e no Rio de Janeiro."
+    )
+
+    assert res.candidatos == []
+    assert res.fortes == 0 and res.fracos == 0
+    assert res.score < 0.2
+
+
+def test_prescreen_sequencia_sem_prenome_conhecido_conta_como_fraca():
+    res = prescreen("Segundo a denúncia, Kauã Thalisson Brandt desviou recursos.")
+
+    assert res.fortes == 0
+    assert res.fracos == 1
+    assert res.candidatos == ["Kauã Thalisson Brandt"]
+
+
+def test_prescreen_texto_vazio():
+    res = prescreen("")
+
+    assert res.score == 0
+    assert res.candidatos == []
+
+
+def test_tem_nome_aceita_prenome_isolado():
+    assert tem_nome("Segundo Marcelo, o valor foi pago em espécie.")
+    assert not tem_nome("A reunião foi adiada para a próxima semana.")
+
+
+def test_score_bucket():
+    assert score_bucket(0.0) == "0.0-0.1"
+    assert score_bucket(0.25) == "0.2-0.3"
+    assert score_bucket(1.0) == "0.9-1.0"
+
+
+def test_indicadores_de_organizacao_nao_viram_candidatos():
+    for indicador in INDICADORES_ORGANIZACAO:
+        assert prescreen(f"{indicador.title()} Carlos Eduardo Pereira").candidatos == ["Carlos Eduardo Pereira"]
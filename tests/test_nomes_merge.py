@@ -0,0 +1,51 @@
+from src.dtecflex_extract_api.services.nomes_merge import merge_nomes, normalizar_nome
+
+
+def test_normalizar_nome_ignora_acento_pontuacao_e_caixa():
+    assert normalizar_nome("  JOSÉ  da Silva-Júnior. ") == "jose da silva junior"
+
+
+def test_merge_junta_a_mesma_pessoa_entre_blocos_na_ordem_de_aparicao():
+    bloco1 = [{"NOME": "João Souza"}, {"NOME": "Maria Lima"}]
+    bloco2 = [{"NOME": "JOAO SOUZA"}, {"NOME": "Pedro Alves"}]
+
+    nomes = merge_nomes([bloco1, bloco2])
+
+    assert [n["NOME"] for n in nomes] == ["João Souza", "Maria Lima", "Pedro Alves"]
+
+
+def test_merge_une_por_cpf_e_fica_com_o_nome_mais_completo():
+    nomes = merge_nomes([
+        [{"NOME": "Carlos Pereira", "CPF": "123.456.789-00"}],
+        [{"NOME": "Carlos Eduardo Pereira", "CPF": "12345678900"}],
+    ])
+
+    assert len(nomes) == 1
+    assert nomes[0]["NOME"] == "Carlos Eduardo Pereira"
+
+
+def test_merge_nao_une_por_cpf_zerado():
+    nomes = merge_nomes([
+        [{"NOME": "Ana Costa", "CPF": "000.000.000-00"}],
+        [{"NOME": "Bruno Dias", "CPF": "00000000000"}],
+    ])
+
+    assert [n["NOME"] for n in nomes] == ["Ana Costa", "Bruno Dias"]
+
+
+def test_merge_reconcilia_campos_em_conflito():
+    nomes = merge_nomes([
+        [{"NOME": "Rui Melo", "SEXO": "m", "IDADE": "40", "ENVOLVIMENTO": "investigado", "INDICADOR_PPE": False}],
+        [{"NOME": "Rui Melo", "SEXO": "M", "IDADE": 40, "ENVOLVIMENTO": "preso em flagrante", "INDICADOR_PPE": "S"}],
+        [{"NOME": "Rui Melo", "SEXO": "F", "IDADE": 41, "ENVOLVIMENTO": "", "INDICADOR_PPE": None}],
+    ])
+
+    rui = nomes[0]
+    assert rui["SEXO"] == "M"
+    assert rui["IDADE"] == 40
+    assert rui["ENVOLVIMENTO"] == "preso em flagrante"
+    assert rui["INDICADOR_PPE"] is True
+
+
+def test_merge_descarta_itens_sem_nome_e_listas_vazias():
+    assert merge_nomes([[{"NOME": ""}, {"CPF": "123"}], [], None]) == []
@@ -0,0 +1,24 @@
+import pytest
+from sqlalchemy.orm import Session
+
+# registra UsuarioModel, alvo de relationship em NoticiaRaspadaModel
+import src.dtecflex_extract_api.resources.usuario.entities.usuario  # noqa: F401
+from src.dtecflex_extract_api.resources.noticias.noticias_service import NoticiaService
+
+
+@pytest.fixture
+def service():
+    # sessão sem engine: os casos abaixo falham antes de ir ao banco
+    svc = NoticiaService.__new__(NoticiaService)
+    svc.session = Session()
+    return svc
+
+
+def test_busca_com_cursor_sem_relevancia_e_invalido(service):
+    with pytest.raises(ValueError, match="cursor inválido"):
+        service.list_keyset(filters={"BUSCA": "lava jato"}, cursor={"id": 10, "d": "n"})
+
+
+def test_busca_com_relevancia_ilegivel_e_invalido(service):
+    with pytest.raises(ValueError, match="cursor inválido"):
+        service.list_keyset(filters={"BUSCA": "lava jato"}, cursor={"id": 10, "d": "n", "s": "abc"})
@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+from src.dtecflex_extract_api.resources.noticias.noticias_service import NoticiaService
+
+
+@pytest.fixture
+def service():
+    # só os parsers: não precisam de sessão nem de cliente do modelo
+    return NoticiaService.__new__(NoticiaService)
+
+
+def test_parse_pacote_objeto(service):
+    resposta = 'Segue:\n{"12": [{"NOME": "João Silva"}], " 15 ": []}'
+
+    por_id, estrategia = service._parse_pacote(resposta)
+
+    assert estrategia == "objeto"
+    assert por_id == {"12": [{"NOME": "João Silva"}], "15": []}
+
+
+def test_parse_pacote_recupera_arrays_completos_de_objeto_truncado(service):
+    resposta = '{"12": [{"NOME": "João Silva"}], "15": [], "18": [{"NOME": "Maria'
+
+    por_id, estrategia = service._parse_pacote(resposta)
+
+    assert estrategia == "recuperada"
+    assert por_id == {"12": [{"NOME": "João Silva"}], "15": []}
+
+
+def test_parse_pacote_falha(service):
+    assert service._parse_pacote("não consegui processar") == ({}, "falha")
+
+
+def test_extrair_json_resposta_truncada(service):
+    resposta = '[{"NOME": "João Silva"}, {"NOME": "Maria Souza"}, {"NOME": "Pedro'
+
+    json_str, usada = service._extrair_json_com_estrategia(resposta)
+
+    assert usada == "truncada"
+    assert json.loads(json_str) == [{"NOME": "João Silva"}, {"NOME": "Maria Souza"}]
+
+
+def test_recuperar_array_truncado_sem_objeto_completo(service):
+    assert service._recuperar_array_truncado('[{"NOME": "Jo') is None
+    assert service._recuperar_array_truncado("sem array") is None
+
+
+@pytest.mark.parametrize("resposta, estrategia", [
+    ('```json\n[{"NOME": "A"}]\n```', "bloco_json"),
+    ('```\n[{"NOME": "A"}]\n```', "bloco"),
+    ('Resultado: [{"NOME": "A"}] fim', "array"),
+    ("[]", "inteira"),
+])
+def test_extrair_json_com_estrategia(service, resposta, estrategia):
+    json_str, usada = service._extrair_json_com_estrategia(resposta)
+
+    assert usada == estrategia
+    assert json.loads(json_str) in ([{"NOME": "A"}], [])
+
+
+def test_extrair_json_vazia_e_falha(service):
+    assert service._extrair_json_com_estrategia("") == (None, "vazia")
+    assert service._extrair_json_com_estrategia("sem nomes") == (None, "falha")
@@ -0,0 +1,47 @@
+from src.dtecflex_extract_api.services.text_chunker import chunk_text, count_tokens
+
+MODEL = "gpt-4o"
+
+
+def _paragrafos(n: int) -> list:
+    # parágrafos do mesmo tamanho, para o limite caber um número exato deles
+    return [f"Parágrafo {i:02d}: " + " ".join(f"palavra{j:02d}" for j in range(30)) for i in range(n)]
+
+
+def test_texto_curto_fica_num_bloco_so():
+    texto = "Um parágrafo curto.\n\nOutro parágrafo."
+    assert chunk_text(texto, 1000, 100, MODEL) == [texto]
+
+
+def test_blocos_respeitam_o_limite_e_cobrem_todos_os_paragrafos():
+    pars = _paragrafos(20)
+    limite = count_tokens("\n\n".join(pars[:4]), MODEL)
+
+    blocos = chunk_text("\n\n".join(pars), limite, 0, MODEL)
+
+    assert len(blocos) > 1
+    assert all(count_tokens(b, MODEL) <= limite for b in blocos)
+    vistos = [p for b in blocos for p in b.split("\n\n")]
+    assert vistos == pars  # sem sobreposição, cada parágrafo aparece uma vez, em ordem
+
+
+def test_sobreposicao_repete_o_fim_do_bloco_anterior():
+    pars = _paragrafos(12)
+    limite = count_tokens("\n\n".join(pars[:4]), MODEL)
+    sobreposicao = count_tokens(pars[0], MODEL) + 1
+
+    blocos = chunk_text("\n\n".join(pars), limite, sobreposicao, MODEL)
+
+    for anterior, proximo in zip(blocos, blocos[1:]):
+        assert proximo.split("\n\n")[0] == anterior.split("\n\n")[-1]
+
+
+def test_paragrafo_gigante_e_quebrado_em_frases():
+    frases = [f"Frase número {i} com algum conteúdo." for i in range(200)]
+    texto = " ".join(frases)
+
+    blocos = chunk_text(texto, 200, 0, MODEL)
+
+    assert len(blocos) > 1
+    assert all(count_tokens(b, MODEL) <= 200 for b in blocos)
+    assert " ".join(b.replace("\n\n", " ") for b in blocos) == texto
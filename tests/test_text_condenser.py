@@ -0,0 +1,82 @@
+from src.dtecflex_extract_api.services.text_condenser import condense
+
+
+def test_remove_paragrafos_duplicados_ignorando_acento_e_pontuacao():
+    texto = "A operação cumpriu mandados.\n\nA operacao cumpriu mandados!\n\nO caso segue em sigilo."
+
+    res = condense(texto)
+
+    assert res.texto == "A operação cumpriu mandados.\n\nO caso segue em sigilo."
+    assert res.removidos["duplicados"] == 1
+
+
+def test_remove_boilerplate_geral():
+    texto = "\n".join([
+        "A investigação começou em 2021.",
+        "Leia também: outras operações do mês",
+        "Publicidade",
+        "Usamos cookies para melhorar sua experiência.",
+    ])
+
+    res = condense(texto)
+
+    assert res.texto == "A investigação começou em 2021."
+    assert res.removidos["boilerplate"] == 3
+
+
+def test_boilerplate_com_nome_e_mantido():
+    texto = "A investigação começou em 2021.\nFoto: João Carlos da Silva chega à delegacia"
+
+    res = condense(texto)
+
+    assert "João Carlos da Silva" in res.texto
+    assert res.removidos["boilerplate"] == 0
+
+
+def test_padrao_especifico_da_fonte():
+    texto = "A investigação começou em 2021.\nVeja os vídeos mais assistidos do g1"
+
+    assert "vídeos" in condense(texto).texto
+    assert condense(texto, fonte="G1 - Globo").texto == "A investigação começou em 2021."
+
+
+def test_foco_nomes_nunca_descarta_frase_com_nome():
+    texto = (
+        "A operação começou cedo. O tempo estava nublado. Os agentes chegaram de carro. "
+        "O clima era tenso. A vizinhança acompanhou.\n"
+        "Segundo a denúncia, Marcelo Augusto Ferreira recebia os valores. O esquema durou anos.\n"
+        "A sessão foi encerrada. Nada mais foi dito. Ana Paula Rocha foi ouvida como testemunha."
+    )
+
+    res = condense(texto, foco_nomes=True, contexto=0)
+
+    assert "Segundo a denúncia, Marcelo Augusto Ferreira recebia os valores." in res.texto
+    assert "Ana Paula Rocha foi ouvida como testemunha." in res.texto
+    assert "O tempo estava nublado." not in res.texto
+    assert res.removidos["sem_nome"] > 0
+
+
+def test_foco_nomes_mantem_frases_vizinhas():
+    texto = "Nada aconteceu. O juiz ouviu Carlos Eduardo Pereira. A audiência terminou. Outra frase."
+
+    res = condense(texto, foco_nomes=True, contexto=1)
+
+    assert res.texto == "Nada aconteceu. O juiz ouviu Carlos Eduardo Pereira. A audiência terminou."
+
+
+def test_foco_nomes_sem_nenhum_nome_preserva_o_texto():
+    texto = "A reunião foi adiada. Não houve novidades."
+
+    res = condense(texto, foco_nomes=True)
+
+    assert res.texto == texto
+    assert res.removidos["sem_nome"] == 0
+
+
+def test_conta_tokens_antes_e_depois():
+    texto = "Conteúdo do artigo.\n\nConteúdo do artigo.\n\nPublicidade"
+
+    res = condense(texto)
+
+    assert res.tokens_antes > res.tokens_depois > 0
+    assert res.tokens_economizados == res.tokens_antes - res.tokens_depois